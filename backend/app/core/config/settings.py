@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from typing import Optional
+from typing import List, Optional
 
 class Settings(BaseSettings):
     # Database
@@ -8,12 +8,21 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     POSTGRES_HOST: str
     POSTGRES_PORT: int
-    SQLALCHEMY_DATABASE_URI: Optional[str] = None
+    SQLALCHEMY_DATABASE_URI: Optional[str] = None  # sync driver, used by Alembic
+    SQLALCHEMY_ASYNC_DATABASE_URI: Optional[str] = None  # asyncpg, used by the app
+    DB_ECHO: bool = True
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
     
     # Redis (optional)
     REDIS_HOST: str = "localhost"
     REDIS_PORT: int = 6379
     REDIS_DB: int = 0
+    REDIS_MAX_CONNECTIONS: int = 50
+    REDIS_SOCKET_TIMEOUT_SECONDS: float = 5.0
+    REDIS_HEALTH_CHECK_INTERVAL_SECONDS: int = 30
     
     # JWT
     SECRET_KEY: str
@@ -25,11 +34,60 @@ class Settings(BaseSettings):
     GOOGLE_CLIENT_ID: str
     GOOGLE_CLIENT_SECRET: str
     GOOGLE_REDIRECT_URI: str
+    # Override the Calendar API base URL (e.g. a local fake API); None means Google
+    GOOGLE_CALENDAR_API_ENDPOINT: Optional[str] = None
     
     # Frontend
     FRONTEND_URL: str
 
     TIMEZONE: str = "Asia/Tehran" 
+
+    # Longest meeting that can be booked; also bounds the booked-meetings overlap scan
+    MEETING_MAX_LENGTH_MINUTES: int = 1440
+
+    # Slot search
+    SLOT_ENGINE: str = "interval"  # "interval" or "bitmap"
+    # Range searches skip these weekdays (Mon=0 ... Sun=6) and span at most SLOT_SEARCH_MAX_DAYS
+    WEEKEND_DAYS: List[int] = [4]
+    SLOT_SEARCH_MAX_DAYS: int = 31
+    # Slots returned by a ranked search (rank_by) when max_slots is not given
+    SLOT_TOP_K: int = 10
+    # Query participants' calendars with the organizer's token in batched FreeBusy requests
+    FREEBUSY_BATCH_ENABLED: bool = True
+    # Per-user FreeBusy fetches: parallel calls and overall deadline per search
+    FREEBUSY_MAX_CONCURRENCY: int = 8
+    FREEBUSY_DEADLINE_SECONDS: float = 20.0
+    # Redis cache of FreeBusy results per (user, day)
+    FREEBUSY_CACHE_ENABLED: bool = True
+    FREEBUSY_CACHE_TTL_SECONDS: int = 300
+    FREEBUSY_CACHE_LOCK_SECONDS: int = 10
+    FREEBUSY_CACHE_LOCK_WAIT_SECONDS: float = 3.0
+    # Redis cache of whole slot searches, shared by identical concurrent requests
+    SLOT_SEARCH_CACHE_ENABLED: bool = True
+    SLOT_SEARCH_CACHE_TTL_SECONDS: int = 60
+    SLOT_SEARCH_CACHE_LOCK_SECONDS: int = 25
+    # Slot-search drafts kept in Redis until the organizer picks a slot
+    MEETING_DRAFT_TTL_SECONDS: int = 1800
+    MEETING_DRAFT_MAX_PER_USER: int = 10
+    # Pending meetings not approved within this time (or before they start) are cancelled
+    MEETING_APPROVAL_TIMEOUT_SECONDS: int = 172800
+    APPROVAL_EXPIRY_ENABLED: bool = True
+    APPROVAL_EXPIRY_INTERVAL_SECONDS: int = 60
+    APPROVAL_EXPIRY_BATCH_SIZE: int = 500
+    # Local busy-time mirror kept current with Calendar incremental sync
+    BUSY_MIRROR_ENABLED: bool = False
+    BUSY_MIRROR_SYNC_INTERVAL_SECONDS: int = 120
+    BUSY_MIRROR_MAX_STALENESS_SECONDS: int = 600
+
+    # Background refresh of Google tokens that are about to expire
+    TOKEN_REFRESHER_ENABLED: bool = True
+    TOKEN_REFRESH_INTERVAL_SECONDS: int = 60
+    TOKEN_REFRESH_AHEAD_SECONDS: int = 900
+    TOKEN_REFRESH_BATCH_SIZE: int = 50
+    TOKEN_REFRESH_CONCURRENCY: int = 8
+    # Single-flight refresh: cross-worker lock and how long a fresh token is shared via Redis
+    TOKEN_REFRESH_LOCK_SECONDS: int = 10
+    TOKEN_SHARED_CACHE_SECONDS: int = 300
     
     class Config:
         env_file = ".env"
@@ -42,5 +100,10 @@ class Settings(BaseSettings):
             f"{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:"
             f"{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
         )
+        self.SQLALCHEMY_ASYNC_DATABASE_URI = (
+            f"postgresql+asyncpg://{self.POSTGRES_USER}:"
+            f"{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:"
+            f"{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+        )
 
 settings = Settings()
\ No newline at end of file
@@ -0,0 +1,42 @@
+import threading
+from collections import Counter
+from typing import Dict, Tuple
+
+
+class SimpleMetrics:
+    """In-process counters plus named ratios derived from them (per worker process)."""
+
+    def __init__(self):
+        self._counts: Counter = Counter()
+        self._ratios: Dict[str, Tuple[str, str]] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, amount: int = 1):
+        with self._lock:
+            self._counts[name] += amount
+
+    def get(self, name: str) -> int:
+        with self._lock:
+            return self._counts[name]
+
+    def register_ratio(self, name: str, numerator: str, other: str):
+        """Expose ``numerator / (numerator + other)`` as ``name`` in ``snapshot()``."""
+        self._ratios[name] = (numerator, other)
+
+    def ratio(self, name: str) -> float | None:
+        numerator, other = self._ratios[name]
+        with self._lock:
+            hits, rest = self._counts[numerator], self._counts[other]
+        total = hits + rest
+        return hits / total if total else None
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counts)
+        return {
+            "counters": counters,
+            "ratios": {name: self.ratio(name) for name in self._ratios},
+        }
+
+
+metrics = SimpleMetrics()
@@ -1,6 +1,7 @@
 import redis
+import redis.asyncio as aioredis
 import json
-from typing import Any
+from typing import Any, Dict, List, Optional
 from app.core.config.settings import settings
 
 class SimpleRedis:
@@ -23,6 +24,10 @@ class SimpleRedis:
             print(f"Redis connection failed: {e}")
             self.client = None
     
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
     def disconnect(self):
         if self.client:
             self.client.close()
@@ -71,6 +76,36 @@ class SimpleRedis:
         except Exception:
             return None
     
+    def get_many(self, keys: List[str]) -> List[Any]:
+        if not self.client or not keys:
+            return [None] * len(keys)
+        try:
+            values = self.client.mget(keys)
+        except Exception:
+            return [None] * len(keys)
+
+        result = []
+        for value in values:
+            if not value:
+                result.append(None)
+                continue
+            try:
+                result.append(json.loads(value))
+            except json.JSONDecodeError:
+                result.append(value)
+        return result
+
+    def set_if_absent(self, key: str, value: Any, ttl: int):
+        """SET NX with expiry; True only if this call created the key."""
+        if not self.client:
+            return False
+        if not isinstance(value, str):
+            value = json.dumps(value)
+        try:
+            return bool(self.client.set(key, value, nx=True, ex=ttl))
+        except Exception:
+            return False
+
     def delete(self, key: str):
         if not self.client:
             return False
@@ -79,6 +114,15 @@ class SimpleRedis:
             return True
         except Exception:
             return False
+
+    def delete_many(self, keys: List[str]):
+        if not self.client or not keys:
+            return False
+        try:
+            self.client.delete(*keys)
+            return True
+        except Exception:
+            return False
     
     def exists(self, key: str):
         if not self.client:
@@ -88,4 +132,183 @@ class SimpleRedis:
         except Exception:
             return False
 
+def _dumps(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def _loads(value: Optional[str]):
+    if not value:
+        return None
+    try:
+        return json.loads(value)
+    except json.JSONDecodeError:
+        return value
+
+
+class AsyncRedis:
+    """
+    ``redis.asyncio`` counterpart of ``SimpleRedis`` for code running on the event
+    loop. Connections come from one explicit pool sized by REDIS_MAX_CONNECTIONS;
+    multi-key helpers are pipelined and ``update`` is a WATCH/MULTI transaction.
+    Like ``SimpleRedis`` it degrades to no-ops when Redis is unreachable.
+    """
+
+    def __init__(self):
+        self.pool: aioredis.ConnectionPool | None = None
+        self.client: aioredis.Redis | None = None
+
+    async def connect(self):
+        if self.client:
+            return  # Already connected
+        self.pool = aioredis.ConnectionPool(
+            host=settings.REDIS_HOST,
+            port=settings.REDIS_PORT,
+            db=settings.REDIS_DB,
+            max_connections=settings.REDIS_MAX_CONNECTIONS,
+            socket_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            socket_connect_timeout=settings.REDIS_SOCKET_TIMEOUT_SECONDS,
+            health_check_interval=settings.REDIS_HEALTH_CHECK_INTERVAL_SECONDS,
+            decode_responses=True
+        )
+        self.client = aioredis.Redis(connection_pool=self.pool)
+        try:
+            await self.client.ping()
+            print("Async Redis connected")
+        except Exception as e:
+            print(f"Async Redis connection failed: {e}")
+            await self.disconnect()
+
+    @property
+    def available(self) -> bool:
+        return self.client is not None
+
+    async def disconnect(self):
+        if self.client:
+            await self.client.aclose()
+            self.client = None
+        if self.pool:
+            await self.pool.disconnect()
+            self.pool = None
+
+    def pipeline(self, transaction: bool = True):
+        """Raw pipeline (MULTI/EXEC when ``transaction``) for multi-key work; None without Redis."""
+        if not self.client:
+            return None
+        return self.client.pipeline(transaction=transaction)
+
+    async def get(self, key: str):
+        if not self.client:
+            return None
+        try:
+            return _loads(await self.client.get(key))
+        except Exception:
+            return None
+
+    async def get_raw(self, key: str) -> Optional[str]:
+        """The stored value as-is, for callers that do their own encoding."""
+        if not self.client:
+            return None
+        try:
+            return await self.client.get(key)
+        except Exception:
+            return None
+
+    async def get_many_raw(self, keys: List[str]) -> List[Optional[str]]:
+        if not self.client or not keys:
+            return [None] * len(keys)
+        try:
+            return await self.client.mget(keys)
+        except Exception:
+            return [None] * len(keys)
+
+    async def set_raw(self, key: str, value: bytes | str, ttl: int = None):
+        if not self.client:
+            return False
+        try:
+            await self.client.set(key, value, ex=ttl or None)
+            return True
+        except Exception:
+            return False
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        if not self.client or not keys:
+            return [None] * len(keys)
+        try:
+            values = await self.client.mget(keys)
+        except Exception:
+            return [None] * len(keys)
+        return [_loads(value) for value in values]
+
+    async def set(self, key: str, value: Any, ttl: int = None):
+        if not self.client:
+            return False
+        try:
+            await self.client.set(key, _dumps(value), ex=ttl or None)
+            return True
+        except Exception:
+            return False
+
+    async def set_many(self, items: Dict[str, Any], ttl: int = None):
+        """Write several keys in one round trip."""
+        if not self.client or not items:
+            return False
+        try:
+            async with self.client.pipeline(transaction=False) as pipe:
+                for key, value in items.items():
+                    pipe.set(key, _dumps(value), ex=ttl or None)
+                await pipe.execute()
+            return True
+        except Exception:
+            return False
+
+    async def update(self, key: str, fields: dict, ttl: int = None):
+        """Merge ``fields`` into the JSON object at ``key`` atomically (retried on concurrent writes)."""
+        if not self.client:
+            return False
+
+        async def merge(pipe):
+            current = _loads(await pipe.get(key))
+            if not isinstance(current, dict):
+                return False
+            current.update(fields)
+            keep_ttl = ttl is None
+            pipe.multi()
+            pipe.set(key, _dumps(current), ex=ttl or None, keepttl=keep_ttl)
+            return True
+
+        try:
+            return await self.client.transaction(merge, key, value_from_callable=True)
+        except Exception:
+            return False
+
+    async def set_if_absent(self, key: str, value: Any, ttl: int):
+        """SET NX with expiry; True only if this call created the key."""
+        if not self.client:
+            return False
+        try:
+            return bool(await self.client.set(key, _dumps(value), nx=True, ex=ttl))
+        except Exception:
+            return False
+
+    async def delete(self, *keys: str):
+        if not self.client or not keys:
+            return False
+        try:
+            await self.client.delete(*keys)
+            return True
+        except Exception:
+            return False
+
+    async def exists(self, key: str):
+        if not self.client:
+            return False
+        try:
+            return bool(await self.client.exists(key))
+        except Exception:
+            return False
+
+
+# Sync client for code running in worker threads (Google client calls)
 redis_client = SimpleRedis()
+# Async client for request handlers, services and background tasks on the event loop
+async_redis = AsyncRedis()
@@ -13,7 +13,9 @@ from app.db.session.session import Base
 
 # Import کردن تمام models
 from app.modules.users.models import User
-from app.modules.meetings.models import Meeting
+from app.modules.meetings.models import Meeting, MeetingParticipant
+from app.modules.calendar_sync.models import BusyInterval, CalendarSyncState
+from app.modules.rooms.models import Room, RoomBooking
 
 
 # this is the Alembic Config object
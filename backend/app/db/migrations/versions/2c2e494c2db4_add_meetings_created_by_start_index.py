@@ -0,0 +1,28 @@
+"""add meetings created_by start index
+
+Revision ID: 2c2e494c2db4
+Revises: b3de596759aa
+Create Date: 2026-10-17 12:26:08.904417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2c2e494c2db4'
+down_revision: Union[str, Sequence[str], None] = 'b3de596759aa'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_meetings_created_by_start', 'meetings', ['created_by', 'start_time', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_meetings_created_by_start', table_name='meetings')
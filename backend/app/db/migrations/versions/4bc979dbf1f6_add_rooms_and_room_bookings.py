@@ -0,0 +1,60 @@
+"""add rooms and room bookings
+
+Revision ID: 4bc979dbf1f6
+Revises: 2c2e494c2db4
+Create Date: 2026-10-17 13:47:19.552803
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4bc979dbf1f6'
+down_revision: Union[str, Sequence[str], None] = '2c2e494c2db4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # GiST operator class for the "room_id WITH =" part of the exclusion constraint
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+
+    op.create_table('rooms',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('capacity', sa.Integer(), nullable=False),
+    sa.Column('features', sa.JSON(), nullable=False),
+    sa.Column('is_active', sa.Boolean(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('name')
+    )
+    op.create_index(op.f('ix_rooms_id'), 'rooms', ['id'], unique=False)
+    op.create_table('room_bookings',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('room_id', sa.Integer(), nullable=False),
+    sa.Column('meeting_id', sa.Integer(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.Column('during', postgresql.TSRANGE(), sa.Computed("tsrange(start_time, end_time, '[)')", persisted=True), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['room_id'], ['rooms.id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('meeting_id'),
+    postgresql.ExcludeConstraint(('room_id', '='), ('during', '&&'), using='gist', name='ex_room_bookings_no_overlap')
+    )
+    op.create_index(op.f('ix_room_bookings_id'), 'room_bookings', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_room_bookings_id'), table_name='room_bookings')
+    op.drop_table('room_bookings')
+    op.drop_index(op.f('ix_rooms_id'), table_name='rooms')
+    op.drop_table('rooms')
@@ -0,0 +1,50 @@
+"""add calendar busy mirror
+
+Revision ID: 73cbc0c6f7cf
+Revises: f07cc9d28e1a
+Create Date: 2026-10-17 09:12:41.318204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '73cbc0c6f7cf'
+down_revision: Union[str, Sequence[str], None] = 'f07cc9d28e1a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('busy_intervals',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('event_id', sa.String(), nullable=False),
+    sa.Column('start_time', sa.DateTime(), nullable=False),
+    sa.Column('end_time', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('user_id', 'event_id', name='uq_busy_intervals_user_event')
+    )
+    op.create_index(op.f('ix_busy_intervals_id'), 'busy_intervals', ['id'], unique=False)
+    op.create_index('ix_busy_intervals_user_start_end', 'busy_intervals', ['user_id', 'start_time', 'end_time'], unique=False)
+    op.create_table('calendar_sync_states',
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('sync_token', sa.Text(), nullable=True),
+    sa.Column('last_synced_at', sa.DateTime(), nullable=True),
+    sa.Column('last_full_sync_at', sa.DateTime(), nullable=True),
+    sa.Column('last_error', sa.Text(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.PrimaryKeyConstraint('user_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('calendar_sync_states')
+    op.drop_index('ix_busy_intervals_user_start_end', table_name='busy_intervals')
+    op.drop_index(op.f('ix_busy_intervals_id'), table_name='busy_intervals')
+    op.drop_table('busy_intervals')
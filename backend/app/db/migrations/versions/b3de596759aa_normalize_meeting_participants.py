@@ -0,0 +1,112 @@
+"""normalize meeting participants
+
+Revision ID: b3de596759aa
+Revises: 73cbc0c6f7cf
+Create Date: 2026-10-17 11:04:52.671930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b3de596759aa'
+down_revision: Union[str, Sequence[str], None] = '73cbc0c6f7cf'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+BACKFILL_BATCH_SIZE = 1000
+
+meeting_participants = sa.table(
+    'meeting_participants',
+    sa.column('meeting_id', sa.Integer()),
+    sa.column('user_id', sa.Integer()),
+    sa.column('email', sa.String()),
+    sa.column('start_time', sa.DateTime()),
+)
+
+
+def _backfill_participants(conn) -> None:
+    """Copy meetings.participants (JSON list of emails) into rows, BACKFILL_BATCH_SIZE meetings at a time."""
+    last_id = 0
+    while True:
+        meetings = conn.execute(
+            sa.text(
+                "SELECT id, participants, start_time FROM meetings "
+                "WHERE id > :last_id ORDER BY id LIMIT :limit"
+            ).columns(participants=sa.JSON(), start_time=sa.DateTime()),
+            {"last_id": last_id, "limit": BACKFILL_BATCH_SIZE},
+        ).fetchall()
+        if not meetings:
+            break
+        last_id = meetings[-1].id
+
+        emails = {email for meeting in meetings for email in (meeting.participants or [])}
+        user_ids = {}
+        if emails:
+            users = conn.execute(
+                sa.text("SELECT id, email FROM users WHERE email IN :emails").bindparams(
+                    sa.bindparam("emails", expanding=True)
+                ),
+                {"emails": list(emails)},
+            )
+            user_ids = {row.email: row.id for row in users}
+
+        rows = []
+        for meeting in meetings:
+            seen = set()
+            for email in meeting.participants or []:
+                user_id = user_ids.get(email)
+                if user_id is None or user_id in seen:
+                    continue  # deleted user or duplicate email; nothing to link
+                seen.add(user_id)
+                rows.append({
+                    "meeting_id": meeting.id,
+                    "user_id": user_id,
+                    "email": email,
+                    "start_time": meeting.start_time,
+                })
+        if rows:
+            conn.execute(meeting_participants.insert(), rows)
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('meeting_participants',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('meeting_id', sa.Integer(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('email', sa.String(), nullable=False),
+    sa.Column('response_status', sa.String(), nullable=True),
+    sa.Column('start_time', sa.DateTime(), nullable=True),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['meeting_id'], ['meetings.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('meeting_id', 'user_id', name='uq_meeting_participants_meeting_user')
+    )
+    op.create_index(op.f('ix_meeting_participants_id'), 'meeting_participants', ['id'], unique=False)
+    op.create_index(op.f('ix_meeting_participants_meeting_id'), 'meeting_participants', ['meeting_id'], unique=False)
+
+    _backfill_participants(op.get_bind())
+
+    # built after the backfill so the bulk inserts don't maintain it row by row
+    op.create_index('ix_meeting_participants_user_start', 'meeting_participants', ['user_id', 'start_time', 'meeting_id'], unique=False)
+    op.drop_column('meetings', 'participants')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.add_column('meetings', sa.Column('participants', sa.JSON(), nullable=False, server_default=sa.text("'[]'::json")))
+    op.execute(
+        "UPDATE meetings SET participants = p.emails "
+        "FROM (SELECT meeting_id, json_agg(email ORDER BY id) AS emails "
+        "FROM meeting_participants GROUP BY meeting_id) AS p "
+        "WHERE p.meeting_id = meetings.id"
+    )
+    op.alter_column('meetings', 'participants', existing_type=sa.JSON(), server_default=None)
+    op.drop_index('ix_meeting_participants_user_start', table_name='meeting_participants')
+    op.drop_index(op.f('ix_meeting_participants_meeting_id'), table_name='meeting_participants')
+    op.drop_index(op.f('ix_meeting_participants_id'), table_name='meeting_participants')
+    op.drop_table('meeting_participants')
@@ -0,0 +1,19 @@
+from datetime import timezone
+from sqlalchemy import DateTime
+from sqlalchemy.types import TypeDecorator
+
+
+class UTCDateTime(TypeDecorator):
+    """
+    ``timestamp without time zone`` holding UTC wall time.
+
+    Aware datetimes are converted to UTC and made naive before binding (asyncpg
+    refuses aware values for naive columns); naive values are stored as given.
+    """
+    impl = DateTime
+    cache_ok = True
+
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
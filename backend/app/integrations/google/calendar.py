@@ -1,20 +1,49 @@
 from google.oauth2.credentials import Credentials
-from googleapiclient.discovery import build
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient.discovery import build_from_document
+from googleapiclient.discovery_cache import get_static_doc
 from datetime import datetime
-from typing import List, Dict, Optional
+from functools import lru_cache
+import httplib2
+from typing import List, Dict, Optional, Tuple
 import logging
 import pytz
 from dateutil import parser
+from googleapiclient.errors import HttpError
+from app.core.config.settings import settings
+from app.integrations.google import freebusy_cache
 
 logger = logging.getLogger(__name__)
 
 TEHRAN_TZ = pytz.timezone('Asia/Tehran')
 
 
-def build_calendar_service(access_token: str):
-    credentials = Credentials(token=access_token)
-    service = build('calendar', 'v3', credentials=credentials)
-    return service
+@lru_cache(maxsize=1)
+def get_calendar_api():
+    """
+    Calendar v3 API surface, built once per process from the discovery document
+    bundled with google-api-python-client (no network fetch). It carries no
+    credentials; requests are executed with ``authorized_http(access_token)``.
+    """
+    document = get_static_doc('calendar', 'v3')
+    if document is None:
+        raise RuntimeError("Bundled Calendar v3 discovery document not found")
+
+    client_options = None
+    if settings.GOOGLE_CALENDAR_API_ENDPOINT:
+        # e.g. a local fake Calendar API: "http://localhost:8085/calendar/v3/"
+        client_options = {"api_endpoint": settings.GOOGLE_CALENDAR_API_ENDPOINT}
+    return build_from_document(document, http=httplib2.Http(), client_options=client_options)
+
+
+@lru_cache(maxsize=None)
+def calendar_collection(name: str):
+    """Shared, stateless collection (``freebusy``, ``events``, ...) of the Calendar API."""
+    return getattr(get_calendar_api(), name)()
+
+
+def authorized_http(access_token: str) -> AuthorizedHttp:
+    return AuthorizedHttp(Credentials(token=access_token), http=httplib2.Http())
 
 
 def _normalize_iso_z(dt_str: str) -> str:
@@ -30,23 +59,56 @@ def parse_datetime_string(dt_str: str) -> datetime:
     return dt.astimezone(TEHRAN_TZ)
 
 
-def get_user_freebusy(access_token: str, email: str, time_min: datetime, time_max: datetime) -> List[Dict[str, str]]:
-    service = build_calendar_service(access_token)
+class SyncTokenExpired(Exception):
+    """Google invalidated a sync token (HTTP 410); the caller must do a full sync."""
+
+
+# Google rejects FreeBusy queries for more calendars than this in one request
+FREEBUSY_MAX_CALENDARS = 50
 
+
+def _freebusy_window(time_min: datetime, time_max: datetime) -> Dict[str, str]:
     if time_min.tzinfo is None:
         time_min = TEHRAN_TZ.localize(time_min)
     if time_max.tzinfo is None:
         time_max = TEHRAN_TZ.localize(time_max)
 
-    body = {
+    return {
         "timeMin": time_min.astimezone(pytz.UTC).isoformat(),
         "timeMax": time_max.astimezone(pytz.UTC).isoformat(),
-        "items": [{"id": email}],
         "timeZone": "Asia/Tehran"
     }
 
+
+def _epoch_seconds(dt_str: str) -> int:
+    dt = datetime.fromisoformat(_normalize_iso_z(dt_str))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=pytz.UTC)
+    return int(dt.timestamp())
+
+
+def _normalize_busy(busy: List[Dict[str, str]]) -> List[Tuple[int, int]]:
+    """Google's busy periods as ``(start, end)`` epoch seconds; parsed once, never re-serialized."""
+    normalized = []
+    for ev in busy:
+        s = ev.get('start')
+        e = ev.get('end')
+        if not s or not e:
+            continue
+
+        normalized.append((_epoch_seconds(s), _epoch_seconds(e)))
+
+    return normalized
+
+
+def _query_user_freebusy(access_token: str, email: str, time_min: datetime, time_max: datetime) -> List[Tuple[int, int]]:
+    body = {
+        **_freebusy_window(time_min, time_max),
+        "items": [{"id": email}],
+    }
+
     try:
-        freebusy_result = service.freebusy().query(body=body).execute()
+        freebusy_result = calendar_collection('freebusy').query(body=body).execute(http=authorized_http(access_token))
     except Exception as e:
         logger.exception("Google FreeBusy query failed")
         raise
@@ -59,22 +121,118 @@ def get_user_freebusy(access_token: str, email: str, time_min: datetime, time_ma
         logger.warning("freebusy returned unexpected calendar entry shape for %s: %r", email, calendar_entry)
         busy = []
 
-    normalized = []
-    for ev in busy:
-        s = ev.get('start')
-        e = ev.get('end')
-        if not s or not e:
-            continue
-
-        s_dt = parse_datetime_string(_normalize_iso_z(s))
-        e_dt = parse_datetime_string(_normalize_iso_z(e))
-
-        normalized.append({
-            "start": s_dt.isoformat(),
-            "end": e_dt.isoformat()
-        })
+    return _normalize_busy(busy)
+
+
+def get_user_freebusy(access_token: str, email: str, time_min: datetime, time_max: datetime) -> List[Tuple[int, int]]:
+    """The user's busy periods in ``[time_min, time_max]`` as ``(start, end)`` epoch seconds."""
+    days = freebusy_cache.cacheable_days(time_min, time_max)
+    if days is None:
+        return _query_user_freebusy(access_token, email, time_min, time_max)
+
+    return freebusy_cache.read_through(
+        email, days, lambda start, end: _query_user_freebusy(access_token, email, start, end)
+    )
+
+
+def get_users_freebusy(access_token: str, emails: List[str], time_min: datetime,
+                       time_max: datetime) -> Tuple[Dict[str, List[Tuple[int, int]]], Dict[str, str]]:
+    """
+    Fetch free/busy for many calendars with one token, FREEBUSY_MAX_CALENDARS per request.
+
+    Returns ``(busy_by_email, errors_by_email)``, busy periods as in
+    ``get_user_freebusy``. Calendars the token cannot read
+    (other domain, not shared, ...) are reported in ``errors_by_email`` with
+    Google's error reason instead of being treated as free.
+    """
+    http = authorized_http(access_token)
+    unique_emails = list(dict.fromkeys(emails))
+    errors_by_email: Dict[str, str] = {}
+
+    days = freebusy_cache.cacheable_days(time_min, time_max)
+    if days is None:
+        busy_by_email = _query_calendars(http, unique_emails, time_min, time_max, errors_by_email)
+        return busy_by_email, errors_by_email
+
+    # Only the days missing from the cache are fetched, one window per run of consecutive days
+    by_day = freebusy_cache.get_cached(unique_emails, days)
+    missing = {email: [day for day in days if day not in by_day.get(email, {})] for email in unique_emails}
+    for run in freebusy_cache.day_runs(day for email_days in missing.values() for day in email_days):
+        run_emails = [email for email in unique_emails if email not in errors_by_email and set(run) & set(missing[email])]
+        start, _ = freebusy_cache.day_bounds(run[0])
+        _, end = freebusy_cache.day_bounds(run[-1])
+        for email, busy in _query_calendars(http, run_emails, start, end, errors_by_email).items():
+            run_missing = [day for day in run if day in missing[email]]
+            by_day.setdefault(email, {}).update(freebusy_cache.store_days(email, run_missing, busy))
+
+    busy_by_email = {
+        email: freebusy_cache.join_days(by_day.get(email, {}), days)
+        for email in unique_emails if email not in errors_by_email
+    }
+    return busy_by_email, errors_by_email
+
+
+def _query_calendars(http, emails: List[str], time_min: datetime, time_max: datetime,
+                     errors_by_email: Dict[str, str]) -> Dict[str, List[Tuple[int, int]]]:
+    """FreeBusy of ``emails`` over one window, FREEBUSY_MAX_CALENDARS per request; unreadable ones go to ``errors_by_email``."""
+    window = _freebusy_window(time_min, time_max)
+    busy_by_email: Dict[str, List[Tuple[int, int]]] = {}
+
+    for i in range(0, len(emails), FREEBUSY_MAX_CALENDARS):
+        chunk = emails[i:i + FREEBUSY_MAX_CALENDARS]
+        body = {**window, "items": [{"id": email} for email in chunk]}
+
+        try:
+            freebusy_result = calendar_collection('freebusy').query(body=body).execute(http=http)
+        except Exception:
+            logger.exception("Google FreeBusy batch query failed for %d calendars", len(chunk))
+            raise
+
+        calendars = freebusy_result.get('calendars', {}) or {}
+        for email in chunk:
+            calendar_entry = calendars.get(email)
+            if not isinstance(calendar_entry, dict):
+                errors_by_email[email] = "missing"
+                continue
+
+            errors = calendar_entry.get('errors') or []
+            if errors:
+                errors_by_email[email] = ", ".join(err.get('reason', 'unknown') for err in errors)
+                continue
+
+            busy_by_email[email] = _normalize_busy(calendar_entry.get('busy', []) or [])
+
+    return busy_by_email
+
+
+def list_calendar_events_page(access_token: str, sync_token: Optional[str] = None,
+                              page_token: Optional[str] = None, page_size: int = 2500,
+                              time_min: Optional[datetime] = None) -> Dict:
+    """
+    One page of ``events.list`` on the user's primary calendar, with recurring
+    events expanded. Without ``sync_token`` this is a full sync, limited to
+    events ending after ``time_min`` when given; the last page carries
+    ``nextSyncToken`` for the following incremental syncs.
+    """
+    params = {
+        "calendarId": "primary",
+        "singleEvents": True,
+        "maxResults": page_size,
+    }
+    if sync_token:
+        params["syncToken"] = sync_token
+    elif time_min:
+        # Google rejects timeMin together with a sync token
+        params["timeMin"] = time_min.astimezone(pytz.UTC).isoformat()
+    if page_token:
+        params["pageToken"] = page_token
 
-    return normalized
+    try:
+        return calendar_collection('events').list(**params).execute(http=authorized_http(access_token))
+    except HttpError as e:
+        if sync_token and e.resp is not None and e.resp.status == 410:
+            raise SyncTokenExpired("Calendar sync token is no longer valid") from e
+        raise
 
 
 # ------------------------------
@@ -82,8 +240,7 @@ def get_user_freebusy(access_token: str, email: str, time_min: datetime, time_ma
 def create_calendar_event(access_token: str, summary: str, description: str,
                           start_time: datetime, end_time: datetime,
                           attendees: List[str], location: Optional[str] = None,
-                          conference_data: bool = False):
-    service = build_calendar_service(access_token)
+                          conference_data: bool = False, organizer_email: Optional[str] = None):
 
     if start_time.tzinfo is None:
         start_time = TEHRAN_TZ.localize(start_time)
@@ -128,39 +285,77 @@ def create_calendar_event(access_token: str, summary: str, description: str,
             }
         }
 
-    created_event = service.events().insert(
+    created_event = calendar_collection('events').insert(
         calendarId='primary',
         body=event,
         conferenceDataVersion=1 if conference_data else 0,
         sendUpdates='all'
-    ).execute()
+    ).execute(http=authorized_http(access_token))
+
+    freebusy_cache.invalidate([*attendees, organizer_email], start_time, end_time)
 
     return created_event
 
 
-def update_calendar_event(access_token: str, event_id: str, updates: Dict):
-    service = build_calendar_service(access_token)
+def _event_busy_window(event: Dict) -> Tuple[List[str], Optional[datetime], Optional[datetime]]:
+    """Attendee emails and the start/end of an event resource, for cache invalidation."""
+    emails = [a.get('email') for a in event.get('attendees', []) or [] if a.get('email')]
+    organizer = (event.get('organizer') or {}).get('email')
+    if organizer:
+        emails.append(organizer)
+
+    bounds = []
+    for field in ('start', 'end'):
+        value = event.get(field) or {}
+        raw = value.get('dateTime') or value.get('date')
+        try:
+            bounds.append(parse_datetime_string(_normalize_iso_z(raw)) if raw else None)
+        except (ValueError, OverflowError):
+            bounds.append(None)
+    return emails, bounds[0], bounds[1]
+
+
+def _invalidate_event(event: Dict, organizer_email: Optional[str] = None):
+    emails, start, end = _event_busy_window(event)
+    if start and end:
+        freebusy_cache.invalidate([*emails, organizer_email], start, end)
 
-    event = service.events().get(calendarId='primary', eventId=event_id).execute()
+
+def update_calendar_event(access_token: str, event_id: str, updates: Dict, organizer_email: Optional[str] = None):
+    http = authorized_http(access_token)
+    events = calendar_collection('events')
+
+    event = events.get(calendarId='primary', eventId=event_id).execute(http=http)
     if not isinstance(event, dict):
         raise ValueError("Fetched event is malformed")
 
+    _invalidate_event(event, organizer_email)
     event.update(updates)
 
-    updated_event = service.events().update(
+    updated_event = events.update(
         calendarId='primary',
         eventId=event_id,
         body=event,
         sendUpdates='all'
-    ).execute()
+    ).execute(http=http)
+
+    _invalidate_event(updated_event if isinstance(updated_event, dict) else event, organizer_email)
 
     return updated_event
 
 
-def delete_calendar_event(access_token: str, event_id: str):
-    service = build_calendar_service(access_token)
-    service.events().delete(
+def delete_calendar_event(access_token: str, event_id: str, organizer_email: Optional[str] = None):
+    http = authorized_http(access_token)
+    events = calendar_collection('events')
+
+    # Fetched first only to know whose cached free/busy this delete affects
+    event = events.get(calendarId='primary', eventId=event_id).execute(http=http)
+
+    events.delete(
         calendarId='primary',
         eventId=event_id,
         sendUpdates='all'
-    ).execute()
+    ).execute(http=http)
+
+    if isinstance(event, dict):
+        _invalidate_event(event, organizer_email)
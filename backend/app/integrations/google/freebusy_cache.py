@@ -0,0 +1,195 @@
+"""
+Read-through Redis cache for FreeBusy results, one entry per (email, UTC calendar day).
+An entry is the user's busy periods as ``[start, end]`` epoch-second pairs (the
+``(start, end)`` tuples ``get_user_freebusy`` returns, as JSON lists).
+
+Entries expire after ``FREEBUSY_CACHE_TTL_SECONDS`` and are dropped as soon as
+this service creates, updates or deletes an event touching that user and day.
+A window of several whole days is read with one MGET of its per-day entries;
+only the days missing are fetched, and the result is stored back day by day.
+Concurrent misses for the same key are coalesced: one caller fetches while the
+others wait briefly for its result instead of all hitting Google.
+"""
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from app.core.config.settings import settings
+from app.core.metrics import metrics
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# (start, end) epoch seconds; tuples when fetched, lists when read back from the cache
+BusyPeriod = Sequence[int]
+
+KEY_PREFIX = "freebusy"
+LOCK_PREFIX = "freebusy_lock"
+WAIT_POLL_SECONDS = 0.05
+
+metrics.register_ratio("freebusy_cache.hit_ratio", "freebusy_cache.hit", "freebusy_cache.miss")
+
+
+def cache_key(email: str, day: date) -> str:
+    return f"{KEY_PREFIX}:{email.lower()}:{day.isoformat()}"
+
+
+def _lock_key(email: str, day: date) -> str:
+    return f"{LOCK_PREFIX}:{email.lower()}:{day.isoformat()}"
+
+
+def cacheable_days(time_min: datetime, time_max: datetime) -> Optional[List[date]]:
+    """
+    Return the UTC days covered by ``[time_min, time_max]`` if the window is made
+    of whole days (the shape slot search queries), otherwise ``None``.
+    """
+    if not settings.FREEBUSY_CACHE_ENABLED or time_min.tzinfo is None or time_max.tzinfo is None:
+        return None
+
+    start = time_min.astimezone(timezone.utc)
+    end = time_max.astimezone(timezone.utc)
+    first_start, _ = day_bounds(start.date())
+    if start != first_start or end <= start:
+        return None
+
+    # either the next midnight or the last moment before it (datetime.max.time())
+    last = (end - timedelta(seconds=1)).date()
+    if end < day_bounds(last)[1] - timedelta(seconds=1):
+        return None
+    return [start.date() + timedelta(days=i) for i in range((last - start.date()).days + 1)]
+
+
+def day_bounds(day: date) -> Tuple[datetime, datetime]:
+    """``[start, end)`` of a UTC day."""
+    start = datetime.combine(day, datetime.min.time(), tzinfo=timezone.utc)
+    return start, start + timedelta(days=1)
+
+
+def day_runs(days: Iterable[date]) -> List[List[date]]:
+    """``days`` grouped into runs of consecutive days, so each run is one FreeBusy window."""
+    runs: List[List[date]] = []
+    for day in sorted(set(days)):
+        if runs and runs[-1][-1] + timedelta(days=1) == day:
+            runs[-1].append(day)
+        else:
+            runs.append([day])
+    return runs
+
+
+def get_cached(emails: List[str], days: List[date]) -> Dict[str, Dict[date, List[BusyPeriod]]]:
+    """The cached busy lists among ``emails`` x ``days``, by email then day (one MGET)."""
+    pairs = [(email, day) for email in emails for day in days]
+    values = redis_client.get_many([cache_key(email, day) for email, day in pairs])
+    cached: Dict[str, Dict[date, List[BusyPeriod]]] = {}
+    hits = 0
+    for (email, day), value in zip(pairs, values):
+        if isinstance(value, list):
+            cached.setdefault(email, {})[day] = value
+            hits += 1
+    metrics.increment("freebusy_cache.hit", hits)
+    metrics.increment("freebusy_cache.miss", len(pairs) - hits)
+    return cached
+
+
+def store(email: str, day: date, busy: List[BusyPeriod]):
+    redis_client.set(cache_key(email, day), busy, ttl=settings.FREEBUSY_CACHE_TTL_SECONDS)
+
+
+def split_by_day(busy: List[BusyPeriod], days: List[date]) -> Dict[date, List[BusyPeriod]]:
+    """``busy`` (fetched over a window covering ``days``) clipped to each of the days."""
+    by_day = {}
+    for day in days:
+        start, end = (int(bound.timestamp()) for bound in day_bounds(day))
+        by_day[day] = [
+            (max(busy_start, start), min(busy_end, end))
+            for busy_start, busy_end in busy if busy_start < end and busy_end > start
+        ]
+    return by_day
+
+
+def store_days(email: str, days: List[date], busy: List[BusyPeriod]) -> Dict[date, List[BusyPeriod]]:
+    """Cache ``busy`` one day at a time; returns the per-day slices."""
+    by_day = split_by_day(busy, days)
+    for day, sliced in by_day.items():
+        store(email, day, sliced)
+    return by_day
+
+
+def join_days(by_day: Dict[date, List[BusyPeriod]], days: List[date]) -> List[BusyPeriod]:
+    """Per-day slices back into one list, re-joining periods that were cut at midnight."""
+    busy: List[BusyPeriod] = []
+    for day in days:
+        for start, end in by_day.get(day, []):
+            if busy and busy[-1][1] == start:
+                busy[-1] = (busy[-1][0], end)
+            else:
+                busy.append((start, end))
+    return busy
+
+
+def _fetch_days(email: str, days: List[date], fetch: Callable[[datetime, datetime], List[BusyPeriod]],
+                cache: bool = True) -> Dict[date, List[BusyPeriod]]:
+    by_day: Dict[date, List[BusyPeriod]] = {}
+    for run in day_runs(days):
+        busy = fetch(day_bounds(run[0])[0], day_bounds(run[-1])[1])
+        by_day.update(store_days(email, run, busy) if cache else split_by_day(busy, run))
+    return by_day
+
+
+def read_through(email: str, days: List[date],
+                 fetch: Callable[[datetime, datetime], List[BusyPeriod]]) -> List[BusyPeriod]:
+    """
+    ``email``'s busy periods over ``days``. Cached days are read with one MGET and
+    only the missing ones are fetched, one ``fetch(start, end)`` per run of
+    consecutive days.
+    """
+    by_day = get_cached([email], days).get(email, {})
+    missing = [day for day in days if day not in by_day]
+    if not missing:
+        return join_days(by_day, days)
+
+    owned = [
+        day for day in missing
+        if redis_client.set_if_absent(_lock_key(email, day), "1", ttl=settings.FREEBUSY_CACHE_LOCK_SECONDS)
+    ]
+    try:
+        if owned:
+            by_day.update(_fetch_days(email, owned, fetch))
+
+        # Someone else is fetching these days right now - wait for their result
+        waiting = [day for day in missing if day not in by_day]
+        deadline = time.monotonic() + settings.FREEBUSY_CACHE_LOCK_WAIT_SECONDS
+        while waiting and time.monotonic() < deadline and any(redis_client.exists(_lock_key(email, day)) for day in waiting):
+            time.sleep(WAIT_POLL_SECONDS)
+            values = redis_client.get_many([cache_key(email, day) for day in waiting])
+            for day, value in zip(waiting, values):
+                if isinstance(value, list):
+                    by_day[day] = value
+                    metrics.increment("freebusy_cache.coalesced")
+            waiting = [day for day in waiting if day not in by_day]
+        if waiting:
+            by_day.update(_fetch_days(email, waiting, fetch, cache=False))
+    finally:
+        if owned:
+            redis_client.delete_many([_lock_key(email, day) for day in owned])
+    return join_days(by_day, days)
+
+
+def _days_between(start: datetime, end: datetime) -> List[date]:
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    first = start.astimezone(timezone.utc).date()
+    last = max(end.astimezone(timezone.utc), start.astimezone(timezone.utc)).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def invalidate(emails: Iterable[str], start: datetime, end: datetime):
+    """Drop cached entries of ``emails`` for every UTC day touched by ``[start, end]``."""
+    days = _days_between(start, end)
+    keys = [cache_key(email, day) for email in set(e for e in emails if e) for day in days]
+    if keys:
+        redis_client.delete_many(keys)
+        logger.debug("Invalidated %d freebusy cache entries", len(keys))
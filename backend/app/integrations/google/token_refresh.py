@@ -0,0 +1,129 @@
+"""
+De-duplicated Google access token refresh.
+
+Inside a process, concurrent callers for the same user wait on a single
+in-flight refresh. Across processes, a short Redis lock elects one refresher;
+it publishes the new token under ``google_token:<email>`` so other workers
+reuse it instead of refreshing (and writing the user row) again.
+"""
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from app.core.config.settings import settings
+from app.core.metrics import metrics
+from app.core.redis_client import async_redis
+from app.integrations.google.oauth import is_google_token_expired, refresh_google_access_token
+
+logger = logging.getLogger(__name__)
+
+TOKEN_KEY_PREFIX = "google_token"
+LOCK_KEY_PREFIX = "google_token_lock"
+WAIT_POLL_SECONDS = 0.05
+
+# Only touched from the event loop, so no lock is needed around it
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _token_key(email: str) -> str:
+    return f"{TOKEN_KEY_PREFIX}:{email.lower()}"
+
+
+def _lock_key(email: str) -> str:
+    return f"{LOCK_KEY_PREFIX}:{email.lower()}"
+
+
+async def _read_shared_token(email: str) -> Optional[Dict]:
+    data = await async_redis.get(_token_key(email))
+    if not isinstance(data, dict) or not data.get("access_token") or not data.get("expiry"):
+        return None
+    expiry = datetime.fromisoformat(data["expiry"])
+    if is_google_token_expired(expiry):
+        return None
+    return {"access_token": data["access_token"], "expiry": expiry}
+
+
+async def _publish_token(email: str, result: Dict):
+    expiry = result.get("expiry")
+    if not expiry:
+        return
+    await async_redis.set(
+        _token_key(email),
+        {"access_token": result["access_token"], "expiry": expiry.isoformat()},
+        ttl=settings.TOKEN_SHARED_CACHE_SECONDS,
+    )
+
+
+async def _refresh(refresh_token: str) -> Dict:
+    # google-auth's refresh is blocking HTTP
+    return await asyncio.to_thread(refresh_google_access_token, refresh_token)
+
+
+async def _refresh_across_workers(email: str, refresh_token: str) -> Tuple[Dict, bool]:
+    if not async_redis.available:
+        return await _refresh(refresh_token), True
+
+    shared = await _read_shared_token(email)
+    if shared:
+        return shared, False
+
+    lock_key = _lock_key(email)
+    if await async_redis.set_if_absent(lock_key, "1", ttl=settings.TOKEN_REFRESH_LOCK_SECONDS):
+        try:
+            shared = await _read_shared_token(email)  # refreshed between our read and the lock
+            if shared:
+                return shared, False
+            result = await _refresh(refresh_token)
+            await _publish_token(email, result)
+            return result, True
+        finally:
+            await async_redis.delete(lock_key)
+
+    # Another worker is refreshing this user's token - wait for it to publish
+    deadline = time.monotonic() + settings.TOKEN_REFRESH_LOCK_SECONDS
+    while time.monotonic() < deadline:
+        await asyncio.sleep(WAIT_POLL_SECONDS)
+        shared = await _read_shared_token(email)
+        if shared:
+            metrics.increment("google_token.refresh.shared")
+            return shared, False
+        if not await async_redis.exists(lock_key):
+            break
+
+    logger.warning(f"Gave up waiting for another worker to refresh the token of {email}")
+    return await _refresh(refresh_token), True
+
+
+async def refresh_access_token_once(email: str, refresh_token: str) -> Tuple[Dict, bool]:
+    """
+    Refresh ``email``'s access token unless a refresh is already under way.
+
+    Returns ``(result, refreshed_here)`` where ``result`` has ``access_token`` and
+    ``expiry``. ``refreshed_here`` is False when the token came from another
+    caller's refresh, in which case it has already been persisted by them.
+    """
+    key = email.lower()
+    future = _inflight.get(key)
+    if future is not None:
+        metrics.increment("google_token.refresh.shared")
+        result, _ = await asyncio.wait_for(
+            asyncio.shield(future), timeout=settings.TOKEN_REFRESH_LOCK_SECONDS * 2
+        )
+        return result, False
+
+    future = _inflight[key] = asyncio.get_running_loop().create_future()
+    try:
+        outcome = await _refresh_across_workers(email, refresh_token)
+        future.set_result(outcome)
+        return outcome
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(e)
+            future.exception()  # mark retrieved; waiters (if any) re-raise it
+        raise
+    finally:
+        _inflight.pop(key, None)
@@ -1,14 +1,36 @@
 from fastapi import FastAPI
 from contextlib import asynccontextmanager
+import asyncio
 from app.modules.auth.router import router as auth_router, callback_router
 from app.modules.meetings.router import router as meetings_router
-from app.core.redis_client import redis_client
+from app.modules.rooms.router import router as rooms_router
+from app.core.redis_client import redis_client, async_redis
+from app.core.metrics import metrics
+from app.core.config.settings import settings
+from app.modules.calendar_sync.services import run_calendar_sync_worker
+from app.modules.users.services import run_token_refresher
+from app.modules.meetings.services import run_approval_expiry_worker
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     redis_client.connect()
+    await async_redis.connect()
+
+    background_tasks = []
+    if settings.BUSY_MIRROR_ENABLED:
+        background_tasks.append(asyncio.create_task(run_calendar_sync_worker()))
+    if settings.TOKEN_REFRESHER_ENABLED:
+        background_tasks.append(asyncio.create_task(run_token_refresher()))
+    if settings.APPROVAL_EXPIRY_ENABLED:
+        background_tasks.append(asyncio.create_task(run_approval_expiry_worker()))
+
     yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+    await async_redis.disconnect()
     redis_client.disconnect()
 
 
@@ -22,4 +44,11 @@ app = FastAPI(
 # Include routers
 app.include_router(auth_router, prefix="/api/v1")
 app.include_router(callback_router)
-app.include_router(meetings_router, prefix="/api/v1")
\ No newline at end of file
+app.include_router(meetings_router, prefix="/api/v1")
+app.include_router(rooms_router, prefix="/api/v1")
+
+
+@app.get("/metrics", tags=["Monitoring"])
+async def get_metrics():
+    """Counters and ratios of this worker process (cache hit ratio, token refreshes, ...)"""
+    return metrics.snapshot()
\ No newline at end of file
@@ -1,6 +1,6 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
 from fastapi.responses import RedirectResponse
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.db.session.session import get_db
 from app.modules.auth.services import authenticate_with_google
 from app.integrations.google.oauth import get_google_authorization_url
@@ -28,7 +28,7 @@ async def google_login():
 
 
 @callback_router.get("/oauth2callback")
-async def oauth2callback(request: Request, response: Response, db: Session = Depends(get_db)):
+async def oauth2callback(request: Request, response: Response, db: AsyncSession = Depends(get_db)):
     """
     Handle Google OAuth callback
     This endpoint matches the redirect_uri registered in Google Console
@@ -38,7 +38,7 @@ async def oauth2callback(request: Request, response: Response, db: Session = Dep
         authorization_response = str(request.url)
         
         # Authenticate user with the full authorization response
-        result = authenticate_with_google(db, authorization_response)
+        result = await authenticate_with_google(db, authorization_response)
         
 
         jwt_token = create_access_token(data={"sub": str(result.user.id)})
@@ -81,7 +81,7 @@ async def oauth2callback(request: Request, response: Response, db: Session = Dep
 
 
 @router.get("/google/callback")
-async def google_callback(request: Request, db: Session = Depends(get_db)):
+async def google_callback(request: Request, db: AsyncSession = Depends(get_db)):
     """
     Handle Google OAuth callback
     Google redirects here with the authorization code and other parameters
@@ -91,7 +91,7 @@ async def google_callback(request: Request, db: Session = Depends(get_db)):
         authorization_response = str(request.url)
         
         # Authenticate user with the full authorization response
-        result = authenticate_with_google(db, authorization_response)
+        result = await authenticate_with_google(db, authorization_response)
         
         # Return JSON response
         return {
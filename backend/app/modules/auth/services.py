@@ -1,4 +1,5 @@
-from sqlalchemy.orm import Session
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timezone
 from app.integrations.google.oauth import fetch_google_credentials_from_callback, get_google_authorization_url
 from app.modules.users.repositories import get_user_by_google_id, get_user_by_email, create_user, update_user, update_user_google_tokens
@@ -6,10 +7,10 @@ from app.core.security import create_access_token
 from app.modules.auth.schemas import GoogleOAuthResponse, UserResponse
 
 
-def authenticate_with_google(db: Session, authorization_response: str) -> GoogleOAuthResponse:
+async def authenticate_with_google(db: AsyncSession, authorization_response: str) -> GoogleOAuthResponse:
 
-    # Fetch credentials and user info from Google
-    result = fetch_google_credentials_from_callback(authorization_response)
+    # Fetch credentials and user info from Google (blocking HTTP, off the event loop)
+    result = await asyncio.to_thread(fetch_google_credentials_from_callback, authorization_response)
     
     credentials = result['credentials']
     user_info = result['user_info']
@@ -20,11 +21,11 @@ def authenticate_with_google(db: Session, authorization_response: str) -> Google
     expires_at = credentials.get('expiry')
     
     # Check if user exists by google_id
-    user = get_user_by_google_id(db, user_info['google_id'])
+    user = await get_user_by_google_id(db, user_info['google_id'])
     
     if not user:
         # Check if user exists by email (for linking existing account)
-        user = get_user_by_email(db, user_info['email'])
+        user = await get_user_by_email(db, user_info['email'])
     
     # Prepare user data
     user_data = {
@@ -40,9 +41,9 @@ def authenticate_with_google(db: Session, authorization_response: str) -> Google
     
     if user:
         # Update existing user
-        user = update_user(db, user, user_data)
+        user = await update_user(db, user, user_data)
         # Update Google tokens
-        update_user_google_tokens(db, user, access_token, refresh_token, expires_at)
+        await update_user_google_tokens(db, user, access_token, refresh_token, expires_at)
     else:
         # Create new user
         user_data.update({
@@ -52,7 +53,7 @@ def authenticate_with_google(db: Session, authorization_response: str) -> Google
             'google_calendar_connected': True,
             'is_active': True
         })
-        user = create_user(db, user_data)
+        user = await create_user(db, user_data)
     
     # Create JWT access token
     jwt_token = create_access_token(data={"sub": str(user.id), "email": user.email})
@@ -0,0 +1,34 @@
+from sqlalchemy import Column, Integer, String, Text, Index, UniqueConstraint
+from datetime import datetime, timezone
+from app.db.session.session import Base
+from app.db.types import UTCDateTime
+
+
+class BusyInterval(Base):
+    """A busy block copied from a user's Google Calendar. Times are naive UTC."""
+    __tablename__ = "busy_intervals"
+
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, nullable=False)
+    event_id = Column(String, nullable=False)
+
+    start_time = Column(UTCDateTime, nullable=False)
+    end_time = Column(UTCDateTime, nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint("user_id", "event_id", name="uq_busy_intervals_user_event"),
+        Index("ix_busy_intervals_user_start_end", "user_id", "start_time", "end_time"),
+    )
+
+
+class CalendarSyncState(Base):
+    __tablename__ = "calendar_sync_states"
+
+    user_id = Column(Integer, primary_key=True)
+    sync_token = Column(Text, nullable=True)
+
+    last_synced_at = Column(UTCDateTime, nullable=True)
+    last_full_sync_at = Column(UTCDateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
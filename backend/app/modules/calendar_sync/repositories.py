@@ -0,0 +1,83 @@
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from app.modules.calendar_sync.models import BusyInterval, CalendarSyncState
+
+
+async def get_sync_state(db: AsyncSession, user_id: int) -> Optional[CalendarSyncState]:
+    result = await db.execute(select(CalendarSyncState).where(CalendarSyncState.user_id == user_id))
+    return result.scalars().first()
+
+
+async def get_or_create_sync_state(db: AsyncSession, user_id: int) -> CalendarSyncState:
+    state = await get_sync_state(db, user_id)
+    if not state:
+        state = CalendarSyncState(user_id=user_id)
+        db.add(state)
+        await db.flush()
+    return state
+
+
+async def get_mirrored_user_ids(db: AsyncSession, user_ids: List[int], synced_after: datetime) -> List[int]:
+    """Users among ``user_ids`` whose mirror finished a sync after ``synced_after``."""
+    if not user_ids:
+        return []
+    result = await db.execute(
+        select(CalendarSyncState.user_id).where(
+            CalendarSyncState.user_id.in_(user_ids),
+            CalendarSyncState.sync_token.isnot(None),
+            CalendarSyncState.last_synced_at >= synced_after,
+        )
+    )
+    return list(result.scalars().all())
+
+
+async def get_busy_intervals_for_users(db: AsyncSession, user_ids: List[int], start: datetime,
+                                 end: datetime) -> Dict[int, List[Tuple[datetime, datetime]]]:
+    """Busy intervals overlapping ``[start, end)`` for all ``user_ids`` in one indexed range query."""
+    result: Dict[int, List[Tuple[datetime, datetime]]] = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return result
+
+    rows = await db.execute(
+        select(BusyInterval.user_id, BusyInterval.start_time, BusyInterval.end_time)
+        .where(
+            BusyInterval.user_id.in_(user_ids),
+            BusyInterval.start_time < end,
+            BusyInterval.end_time > start,
+        )
+        .order_by(BusyInterval.user_id, BusyInterval.start_time)
+    )
+    for row in rows:
+        result[row.user_id].append((row.start_time, row.end_time))
+    return result
+
+
+async def delete_all_busy_intervals(db: AsyncSession, user_id: int):
+    await db.execute(delete(BusyInterval).where(BusyInterval.user_id == user_id))
+
+
+async def delete_busy_intervals_ended_before(db: AsyncSession, user_id: int, before: datetime):
+    await db.execute(delete(BusyInterval).where(BusyInterval.user_id == user_id, BusyInterval.end_time < before))
+
+
+async def replace_busy_intervals(db: AsyncSession, user_id: int, removed_event_ids: Iterable[str],
+                           intervals: Dict[str, Tuple[datetime, datetime]]):
+    """
+    Drop rows of ``removed_event_ids`` and upsert ``intervals`` (event_id -> (start, end)).
+    Does not commit; the sync commits once per run together with its new token.
+    """
+    event_ids = set(removed_event_ids) | set(intervals)
+    if event_ids:
+        await db.execute(
+            delete(BusyInterval).where(
+                BusyInterval.user_id == user_id,
+                BusyInterval.event_id.in_(event_ids),
+            )
+        )
+    if intervals:
+        db.add_all([
+            BusyInterval(user_id=user_id, event_id=event_id, start_time=start, end_time=end)
+            for event_id, (start, end) in intervals.items()
+        ])
@@ -0,0 +1,202 @@
+"""
+Local mirror of users' busy time, kept current with Calendar incremental sync.
+
+A full sync lists the events of the user's primary calendar that end after
+``MIRROR_LOOKBACK`` ago and stores the busy ones in ``busy_intervals``; the
+``nextSyncToken`` from the last page is saved and later runs only fetch what
+changed since. When Google invalidates the token (HTTP 410) the mirror is
+wiped and rebuilt with a full sync. Every run also drops the intervals that
+ended before ``MIRROR_LOOKBACK``, so the mirror stays the size of the window.
+
+The worker syncs users one by one, each in its own session and transaction,
+so one user's failure is recorded on their sync state without touching the
+others.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Set, Tuple
+
+import pytz
+from dateutil import parser
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config.settings import settings
+from app.db.session.session import AsyncSessionLocal
+from app.integrations.google.calendar import SyncTokenExpired, list_calendar_events_page
+# not to be confused with the BusyInterval model rows these are built from
+from app.modules.meetings.intervals import BusyInterval as BusySpan, busy_intervals_from_naive_utc
+from app.modules.calendar_sync.repositories import (
+    delete_all_busy_intervals,
+    delete_busy_intervals_ended_before,
+    get_busy_intervals_for_users,
+    get_mirrored_user_ids,
+    get_or_create_sync_state,
+    replace_busy_intervals,
+)
+from app.modules.users.models import User
+from app.modules.users.repositories import check_and_refresh_google_token, get_user_by_id
+
+logger = logging.getLogger(__name__)
+
+TEHRAN_TZ = pytz.timezone('Asia/Tehran')
+
+FetchPage = Callable[..., Dict]
+
+# How far back a full sync reaches: enough for a search of today in any timezone.
+# Windows starting earlier skip the mirror.
+MIRROR_LOOKBACK = timedelta(days=1)
+
+
+def _to_naive_utc(value: Dict) -> Optional[datetime]:
+    raw = value.get('dateTime') or value.get('date')
+    if not raw:
+        return None
+    dt = parser.isoparse(raw)
+    if dt.tzinfo is None:
+        # all-day events ("date") are anchored in the configured local timezone
+        dt = TEHRAN_TZ.localize(dt)
+    return dt.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def event_busy_interval(event: Dict) -> Optional[Tuple[datetime, datetime]]:
+    """The (start, end) an event blocks on its owner's calendar, or None if it doesn't block."""
+    if event.get('status') == 'cancelled' or event.get('transparency') == 'transparent':
+        return None
+
+    for attendee in event.get('attendees', []) or []:
+        if attendee.get('self') and attendee.get('responseStatus') == 'declined':
+            return None
+
+    start = _to_naive_utc(event.get('start') or {})
+    end = _to_naive_utc(event.get('end') or {})
+    if not start or not end or end <= start:
+        return None
+    return start, end
+
+
+async def _collect_changes(access_token: str, sync_token: Optional[str],
+                           fetch_page: FetchPage) -> Tuple[Set[str], Dict[str, Tuple[datetime, datetime]], str]:
+    removed: Set[str] = set()
+    intervals: Dict[str, Tuple[datetime, datetime]] = {}
+    page_token = None
+    time_min = None if sync_token else datetime.now(timezone.utc) - MIRROR_LOOKBACK
+
+    while True:
+        page = await asyncio.to_thread(
+            fetch_page, access_token=access_token, sync_token=sync_token, page_token=page_token, time_min=time_min
+        )
+        for event in page.get('items', []) or []:
+            event_id = event.get('id')
+            if not event_id:
+                continue
+            interval = event_busy_interval(event)
+            if interval:
+                intervals[event_id] = interval
+                removed.discard(event_id)
+            else:
+                intervals.pop(event_id, None)
+                removed.add(event_id)
+
+        page_token = page.get('nextPageToken')
+        if not page_token:
+            next_sync_token = page.get('nextSyncToken')
+            if not next_sync_token:
+                raise ValueError("Calendar events listing ended without a sync token")
+            return removed, intervals, next_sync_token
+
+
+async def sync_user_calendar(db: AsyncSession, user: User, fetch_page: FetchPage = list_calendar_events_page) -> int:
+    """
+    Bring one user's mirror up to date; returns the number of changed events.
+    ``fetch_page`` defaults to the Google client and can be swapped for a fake.
+    """
+    state = await get_or_create_sync_state(db, user.id)
+    user = await check_and_refresh_google_token(db, user)
+    access_token = user.google_access_token
+
+    full_sync = not state.sync_token
+    try:
+        removed, intervals, next_sync_token = await _collect_changes(access_token, state.sync_token, fetch_page)
+    except SyncTokenExpired:
+        logger.info(f"Sync token for user {user.id} expired, running full resync")
+        full_sync = True
+        removed, intervals, next_sync_token = await _collect_changes(access_token, None, fetch_page)
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    if full_sync:
+        await delete_all_busy_intervals(db, user.id)
+        await replace_busy_intervals(db, user.id, [], intervals)
+        state.last_full_sync_at = now
+    else:
+        await delete_busy_intervals_ended_before(db, user.id, now - MIRROR_LOOKBACK)
+        await replace_busy_intervals(db, user.id, removed, intervals)
+
+    state.sync_token = next_sync_token
+    state.last_synced_at = now
+    state.last_error = None
+    await db.commit()
+
+    return len(removed) + len(intervals)
+
+
+async def _record_sync_error(user_id: int, error: str):
+    async with AsyncSessionLocal() as db:
+        state = await get_or_create_sync_state(db, user_id)
+        state.last_error = error
+        await db.commit()
+
+
+async def sync_all_calendars(fetch_page: FetchPage = list_calendar_events_page):
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(select(User.id).where(User.google_calendar_connected.is_(True)))
+        user_ids = list(result.scalars().all())
+
+    # One session per user, so a failed sync leaves nothing behind for the next one
+    for user_id in user_ids:
+        try:
+            async with AsyncSessionLocal() as db:
+                user = await get_user_by_id(db, user_id)
+                changed = await sync_user_calendar(db, user, fetch_page)
+            logger.debug(f"Synced calendar of user {user_id}: {changed} changed events")
+        except Exception as e:
+            logger.error(f"Calendar sync failed for user {user_id}: {str(e)}")
+            await _record_sync_error(user_id, str(e))
+
+
+async def run_calendar_sync_worker():
+    """Background loop started from the app lifespan when BUSY_MIRROR_ENABLED is set."""
+    while True:
+        try:
+            await sync_all_calendars()
+        except Exception:
+            logger.exception("Calendar sync run failed")
+        await asyncio.sleep(settings.BUSY_MIRROR_SYNC_INTERVAL_SECONDS)
+
+
+async def get_mirrored_busy_events(db: AsyncSession, users: List[User], time_min: datetime,
+                                   time_max: datetime) -> Dict[str, List[BusySpan]]:
+    """
+    Busy intervals (epoch seconds, like ``get_user_freebusy`` output) for the users whose
+    mirror is fresh enough to stand in for a FreeBusy call. Others are omitted, as is
+    everyone when the window starts before the mirror reaches back.
+    """
+    if not settings.BUSY_MIRROR_ENABLED or not users:
+        return {}
+
+    now = datetime.now(timezone.utc)
+    if time_min < now - MIRROR_LOOKBACK:
+        return {}
+
+    fresh_after = now.replace(tzinfo=None) - timedelta(seconds=settings.BUSY_MIRROR_MAX_STALENESS_SECONDS)
+    mirrored_ids = await get_mirrored_user_ids(db, [user.id for user in users], fresh_after)
+    if not mirrored_ids:
+        return {}
+
+    start = time_min.astimezone(timezone.utc).replace(tzinfo=None)
+    end = time_max.astimezone(timezone.utc).replace(tzinfo=None)
+    intervals = await get_busy_intervals_for_users(db, mirrored_ids, start, end)
+
+    by_id = {user.id: user for user in users}
+    return {by_id[user_id].email: busy_intervals_from_naive_utc(busy) for user_id, busy in intervals.items()}
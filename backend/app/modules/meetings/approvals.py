@@ -0,0 +1,164 @@
+"""
+Approval state of pending meetings, kept in Redis.
+
+For each meeting ``meeting_approval:<id>:required`` holds the approvers' emails
+and ``meeting_approval:<id>:approved`` the ones who approved so far. Approvals
+go through one Lua script, so concurrent approvals are never lost, and the
+approval completing the set is the only one that claims
+``meeting_approval:<id>:quorum`` - that caller (and no other) schedules the
+meeting.
+
+Every open approval also sits in the sorted set ``meeting_approval_expiry``
+scored by its deadline, so the expiry worker pops just the overdue meetings
+instead of scanning every pending one.
+"""
+import enum
+import time
+from typing import Iterable, List, Optional, Tuple
+
+from app.core.config.settings import settings
+from app.core.redis_client import async_redis
+
+KEY_PREFIX = "meeting_approval"
+EXPIRY_KEY = "meeting_approval_expiry"
+# State outlives its deadline so late approvals get "expired" rather than "unknown"
+STATE_GRACE_SECONDS = 86400
+
+# KEYS: required, approved, quorum, expiry index   ARGV: approver email, ttl, meeting id, now
+# Returns {outcome, approved count, required count}
+_APPROVE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {'unknown', 0, 0}
+end
+local deadline = redis.call('ZSCORE', KEYS[4], ARGV[3])
+if not deadline or tonumber(deadline) <= tonumber(ARGV[4]) then
+    return {'expired', 0, 0}
+end
+local required = redis.call('SCARD', KEYS[1])
+if redis.call('SISMEMBER', KEYS[1], ARGV[1]) == 0 then
+    return {'not_approver', redis.call('SCARD', KEYS[2]), required}
+end
+redis.call('SADD', KEYS[2], ARGV[1])
+redis.call('EXPIRE', KEYS[2], ARGV[2])
+local approved = redis.call('SCARD', KEYS[2])
+if approved < required then
+    return {'recorded', approved, required}
+end
+if redis.call('SET', KEYS[3], '1', 'NX', 'EX', ARGV[2]) then
+    return {'quorum', approved, required}
+end
+return {'complete', approved, required}
+"""
+
+# KEYS: expiry index   ARGV: now, batch size
+# Removes and returns up to ARGV[2] meeting ids whose deadline has passed
+_POP_EXPIRED_SCRIPT = """
+local ids = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', ARGV[1], 'LIMIT', 0, ARGV[2])
+if #ids > 0 then
+    redis.call('ZREM', KEYS[1], unpack(ids))
+end
+return ids
+"""
+
+
+class ApprovalOutcome(str, enum.Enum):
+    UNKNOWN = "unknown"            # no approval open for the meeting (never opened or finished)
+    EXPIRED = "expired"            # the approval deadline has passed
+    NOT_APPROVER = "not_approver"
+    RECORDED = "recorded"          # counted; more approvals needed
+    QUORUM = "quorum"              # this approval completed the set - the caller schedules the meeting
+    COMPLETE = "complete"          # the set was already complete; someone else schedules it
+
+
+def _keys(meeting_id: int) -> Tuple[str, str, str]:
+    prefix = f"{KEY_PREFIX}:{meeting_id}"
+    return f"{prefix}:required", f"{prefix}:approved", f"{prefix}:quorum"
+
+
+def _state_ttl(deadline: float) -> int:
+    return max(int(deadline - time.time()), 0) + STATE_GRACE_SECONDS
+
+
+async def open_approval(meeting_id: int, approvers: Iterable[str], deadline: float) -> bool:
+    """
+    Start collecting approvals of ``approvers`` for ``meeting_id`` until
+    ``deadline`` (epoch seconds), replacing any earlier state.
+    """
+    approvers = list(dict.fromkeys(approvers))
+    pipe = async_redis.pipeline()
+    if pipe is None or not approvers:
+        return False
+    required_key = _keys(meeting_id)[0]
+    async with pipe:
+        pipe.delete(*_keys(meeting_id))
+        pipe.sadd(required_key, *approvers)
+        pipe.expire(required_key, _state_ttl(deadline))
+        pipe.zadd(EXPIRY_KEY, {str(meeting_id): deadline})
+        await pipe.execute()
+    return True
+
+
+async def record_approval(meeting_id: int, approver_email: str) -> Tuple[ApprovalOutcome, int, int]:
+    """Atomically add ``approver_email``'s approval; returns ``(outcome, approved, required)``."""
+    if not async_redis.available:
+        raise ValueError("Approval state is unavailable")
+    outcome, approved, required = await async_redis.client.eval(
+        _APPROVE_SCRIPT, 4, *_keys(meeting_id), EXPIRY_KEY,
+        approver_email, STATE_GRACE_SECONDS + settings.MEETING_APPROVAL_TIMEOUT_SECONDS, meeting_id, time.time()
+    )
+    return ApprovalOutcome(outcome), int(approved), int(required)
+
+
+async def reopen_quorum(meeting_id: int):
+    """Release the quorum claim after scheduling failed, so the next approval retries it."""
+    await async_redis.delete(_keys(meeting_id)[2])
+
+
+async def get_approval_state(meeting_id: int) -> Optional[Tuple[List[str], List[str]]]:
+    """``(required, approved)`` approver emails, or None when no approval is open."""
+    pipe = async_redis.pipeline(transaction=False)
+    if pipe is None:
+        return None
+    required_key, approved_key, _ = _keys(meeting_id)
+    async with pipe:
+        pipe.smembers(required_key)
+        pipe.smembers(approved_key)
+        required, approved = await pipe.execute()
+    if not required:
+        return None
+    return sorted(required), sorted(approved)
+
+
+async def close_approval(meeting_id: int):
+    pipe = async_redis.pipeline()
+    if pipe is None:
+        return
+    async with pipe:
+        pipe.delete(*_keys(meeting_id))
+        pipe.zrem(EXPIRY_KEY, str(meeting_id))
+        await pipe.execute()
+
+
+async def pop_expired(limit: int) -> List[int]:
+    """
+    Atomically take up to ``limit`` meetings whose approval deadline has passed
+    off the expiry index. Their approval state stays (approvals keep getting
+    "expired") until ``discard_expired`` once the meetings are cancelled.
+    """
+    if not async_redis.available:
+        return []
+    return [int(meeting_id) for meeting_id in await async_redis.client.eval(
+        _POP_EXPIRED_SCRIPT, 1, EXPIRY_KEY, time.time(), limit
+    )]
+
+
+async def discard_expired(meeting_ids: List[int]):
+    """Drop the approval state of popped meetings after their cancellation committed."""
+    if meeting_ids:
+        await async_redis.delete(*(key for meeting_id in meeting_ids for key in _keys(meeting_id)))
+
+
+async def requeue_expired(meeting_ids: List[int]):
+    """Put popped meetings back (due now) after failing to cancel them; their state is still in place."""
+    if meeting_ids:
+        await async_redis.client.zadd(EXPIRY_KEY, {str(meeting_id): time.time() for meeting_id in meeting_ids})
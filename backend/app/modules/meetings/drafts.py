@@ -0,0 +1,172 @@
+"""
+Slot-search drafts kept in Redis between ``/available-times`` and ``/create``.
+
+A draft is one orjson-encoded positional record (no field names on the wire)
+with its slots as UTC epoch minutes, written with a TTL so abandoned drafts
+expire on their own. ``encode_draft``/``decode_draft`` are the only place the
+layout is known.
+
+Each user can hold several drafts at once. A draft lives under
+``meeting_draft:<user>:<draft_id>`` and is indexed in the sorted set
+``meeting_drafts:<user>`` scored by its expiry, which is trimmed to
+MEETING_DRAFT_MAX_PER_USER (oldest first) on every save.
+"""
+import secrets
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import List, Optional, Tuple
+
+import orjson
+
+from app.core.config.settings import settings
+from app.core.redis_client import async_redis
+from app.modules.meetings.intervals import Slot
+
+DRAFT_KEY_PREFIX = "meeting_draft"
+DRAFT_INDEX_PREFIX = "meeting_drafts"
+# Bump when the record layout changes; records of another version are ignored
+DRAFT_FORMAT_VERSION = 2
+
+
+@dataclass(slots=True)
+class MeetingDraft:
+    meeting_type: str
+    meeting_location: str
+    title: str
+    description: Optional[str]
+    participants: List[str]
+    meeting_length: int
+    meeting_date: date
+    meeting_room: Optional[str]
+    created_by: int
+    slots: List[Slot] = field(default_factory=list)
+
+
+def encode_draft(draft: MeetingDraft) -> bytes:
+    return orjson.dumps([
+        DRAFT_FORMAT_VERSION,
+        draft.meeting_type,
+        draft.meeting_location,
+        draft.title,
+        draft.description,
+        draft.participants,
+        draft.meeting_length,
+        draft.meeting_date.toordinal(),
+        draft.meeting_room,
+        draft.created_by,
+        [[slot.start_minute, slot.end_minute, slot.rooms, slot.missing] for slot in draft.slots],
+    ])
+
+
+def decode_draft(raw: bytes | str) -> Optional[MeetingDraft]:
+    """The draft in ``raw``, or None when it is not a record this version can read."""
+    try:
+        record = orjson.loads(raw)
+    except orjson.JSONDecodeError:
+        return None
+    if not isinstance(record, list) or not record or record[0] != DRAFT_FORMAT_VERSION:
+        return None
+
+    (_, meeting_type, meeting_location, title, description, participants,
+     meeting_length, meeting_day, meeting_room, created_by, slots) = record
+    return MeetingDraft(
+        meeting_type=meeting_type,
+        meeting_location=meeting_location,
+        title=title,
+        description=description,
+        participants=participants,
+        meeting_length=meeting_length,
+        meeting_date=date.fromordinal(meeting_day),
+        meeting_room=meeting_room,
+        created_by=created_by,
+        slots=[Slot(start, end, rooms, missing) for start, end, rooms, missing in slots],
+    )
+
+
+def _draft_key(user_id: int, draft_id: str) -> str:
+    return f"{DRAFT_KEY_PREFIX}:{user_id}:{draft_id}"
+
+
+def _index_key(user_id: int) -> str:
+    return f"{DRAFT_INDEX_PREFIX}:{user_id}"
+
+
+async def save_draft(user_id: int, draft: MeetingDraft) -> Optional[str]:
+    """
+    Store ``draft`` under a new id and return the id (None without Redis).
+    Expired index entries are dropped and, past MEETING_DRAFT_MAX_PER_USER, the
+    oldest drafts are evicted in the same MULTI.
+    """
+    pipe = async_redis.pipeline()
+    if pipe is None:
+        return None
+
+    draft_id = secrets.token_urlsafe(8)
+    ttl = settings.MEETING_DRAFT_TTL_SECONDS
+    now = time.time()
+    index_key = _index_key(user_id)
+    keep = settings.MEETING_DRAFT_MAX_PER_USER
+
+    try:
+        async with pipe:
+            pipe.zremrangebyscore(index_key, "-inf", now)
+            pipe.set(_draft_key(user_id, draft_id), encode_draft(draft), ex=ttl)
+            pipe.zadd(index_key, {draft_id: now + ttl})
+            pipe.zrange(index_key, 0, -(keep + 1))
+            pipe.zremrangebyrank(index_key, 0, -(keep + 1))
+            pipe.expire(index_key, ttl)
+            results = await pipe.execute()
+    except Exception:
+        return None
+
+    evicted = results[3]
+    if evicted:
+        await async_redis.delete(*(_draft_key(user_id, old_id) for old_id in evicted))
+    return draft_id
+
+
+async def load_draft(user_id: int, draft_id: str) -> Optional[MeetingDraft]:
+    raw = await async_redis.get_raw(_draft_key(user_id, draft_id))
+    if not raw:
+        return None
+    return decode_draft(raw)
+
+
+async def list_drafts(user_id: int) -> List[Tuple[str, datetime, MeetingDraft]]:
+    """``(draft_id, expires_at, draft)`` of the user's live drafts, newest first."""
+    pipe = async_redis.pipeline(transaction=False)
+    if pipe is None:
+        return []
+    index_key = _index_key(user_id)
+    try:
+        async with pipe:
+            pipe.zremrangebyscore(index_key, "-inf", time.time())
+            pipe.zrevrange(index_key, 0, -1, withscores=True)
+            _, entries = await pipe.execute()
+    except Exception:
+        return []
+    if not entries:
+        return []
+
+    raws = await async_redis.get_many_raw([_draft_key(user_id, draft_id) for draft_id, _ in entries])
+    drafts = []
+    for (draft_id, expires_at), raw in zip(entries, raws):
+        draft = decode_draft(raw) if raw else None
+        if draft is not None:
+            drafts.append((draft_id, datetime.fromtimestamp(expires_at, tz=timezone.utc), draft))
+    return drafts
+
+
+async def delete_draft(user_id: int, draft_id: str) -> bool:
+    pipe = async_redis.pipeline()
+    if pipe is None:
+        return False
+    try:
+        async with pipe:
+            pipe.delete(_draft_key(user_id, draft_id))
+            pipe.zrem(_index_key(user_id), draft_id)
+            await pipe.execute()
+        return True
+    except Exception:
+        return False
@@ -0,0 +1,51 @@
+"""
+Compact time representations shared by the slot search pipeline.
+
+Busy time travels as ``(start, end)`` pairs of epoch seconds (UTC), from the
+Google client, the busy mirror and local bookings through to the slot engines.
+Found slots are ``Slot`` records of epoch minutes, which the search cache and
+drafts store as they are. Datetimes and ISO strings are only made at the API
+boundary.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+
+# (start, end) in seconds since the Unix epoch, UTC
+BusyInterval = Tuple[int, int]
+
+
+def to_epoch_second(value: datetime) -> int:
+    """Whole seconds since the epoch; naive datetimes are taken as UTC."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return int(value.timestamp())
+
+
+def to_epoch_minute(value: datetime) -> int:
+    return to_epoch_second(value) // 60
+
+
+def from_epoch_minute(minute: int) -> datetime:
+    return datetime.fromtimestamp(minute * 60, tz=timezone.utc)
+
+
+def busy_intervals_from_naive_utc(intervals: List[Tuple[datetime, datetime]]) -> List[BusyInterval]:
+    """Naive-UTC ``(start, end)`` rows from the database as busy intervals."""
+    return [(to_epoch_second(start), to_epoch_second(end)) for start, end in intervals]
+
+
+@dataclass(slots=True)
+class Slot:
+    start_minute: int  # minutes since the Unix epoch, UTC
+    end_minute: int
+    rooms: Optional[List[str]] = None  # free suitable rooms, for in-person internal meetings
+    missing: Optional[List[str]] = None  # quorum search: invitees busy during the slot
+
+    @property
+    def start(self) -> datetime:
+        return from_epoch_minute(self.start_minute)
+
+    @property
+    def end(self) -> datetime:
+        return from_epoch_minute(self.end_minute)
@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text, Enum as SQLEnum, Date, JSON
+from sqlalchemy import Column, Integer, String, Boolean, Text, Enum as SQLEnum, Date, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 import enum
 from app.db.session.session import Base
+from app.db.types import UTCDateTime
 
 
 class MeetingType(str, enum.Enum):
@@ -32,7 +33,12 @@ class Meeting(Base):
     title = Column(String, nullable=False)
     description = Column(Text, nullable=True)
 
-    participants = Column(JSON, nullable=False, default=list)
+    participant_links = relationship(
+        "MeetingParticipant",
+        order_by="MeetingParticipant.id",
+        cascade="all, delete-orphan",
+        lazy="selectin",
+    )
 
     meeting_length = Column(Integer, nullable=False)
 
@@ -43,13 +49,43 @@ class Meeting(Base):
     status = Column(SQLEnum(MeetingStatus), default=MeetingStatus.PENDING)
     has_permission = Column(Boolean, default=False)
 
-    start_time = Column(DateTime, nullable=True)
-    end_time = Column(DateTime, nullable=True)
+    start_time = Column(UTCDateTime, nullable=True)
+    end_time = Column(UTCDateTime, nullable=True)
     
 
     google_event_id = Column(String, nullable=True)
     
     created_by = Column(Integer, nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    scheduled_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    scheduled_at = Column(UTCDateTime, nullable=True)
 
+    __table_args__ = (
+        Index("ix_meetings_created_by_start", "created_by", "start_time", "id"),
+    )
+
+    @property
+    def participants(self):
+        """Participant emails, in the order they were added."""
+        return [link.email for link in self.participant_links]
+
+
+class MeetingParticipant(Base):
+    """
+    One row per (meeting, participant). ``start_time`` is copied from the meeting
+    so "meetings of user X in a time range" is a range scan on one index.
+    """
+    __tablename__ = "meeting_participants"
+
+    id = Column(Integer, primary_key=True, index=True)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(Integer, nullable=False)
+    email = Column(String, nullable=False)
+    response_status = Column(String, nullable=True)
+
+    start_time = Column(UTCDateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        UniqueConstraint("meeting_id", "user_id", name="uq_meeting_participants_meeting_user"),
+        Index("ix_meeting_participants_user_start", "user_id", "start_time", "meeting_id"),
+    )
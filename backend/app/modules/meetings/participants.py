@@ -0,0 +1,66 @@
+from typing import Collection, Dict, Iterable, List, Optional, Union
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.modules.users.models import User
+from app.modules.users.repositories import get_user_by_id, get_users_by_emails
+
+
+class ParticipantResolver:
+    """
+    Request-scoped user lookup for the meeting pipeline.
+
+    Participants are loaded with one ``IN`` query and the same ``User`` objects
+    are handed to validation, approver selection, token lookup and FreeBusy, so
+    no step queries a participant again.
+    """
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+        self._by_email: Dict[str, User] = {}
+        self._by_id: Dict[int, User] = {}
+
+    def _remember(self, user: User):
+        self._by_email[user.email] = user
+        self._by_id[user.id] = user
+
+    async def resolve(self, emails: Iterable[str],
+                      require_connected: Union[bool, Collection[str]] = False) -> Dict[str, User]:
+        """
+        Users for ``emails`` keyed by email, in input order without duplicates.
+        Raises one ``ValueError`` listing every unknown email and every user
+        without Google Calendar among ``require_connected`` (all of ``emails``
+        when it is True).
+        """
+        wanted = list(dict.fromkeys(emails))
+
+        to_load = [email for email in wanted if email not in self._by_email]
+        if to_load:
+            for user in await get_users_by_emails(self.db, to_load):
+                self._remember(user)
+
+        errors: List[str] = []
+        missing = [email for email in wanted if email not in self._by_email]
+        if missing:
+            errors.append(f"Users not found: {', '.join(missing)}")
+
+        if require_connected:
+            unconnected = [
+                email for email in wanted
+                if (require_connected is True or email in require_connected)
+                and email in self._by_email and not self._by_email[email].google_calendar_connected
+            ]
+            if unconnected:
+                errors.append(f"Users have not connected Google Calendar: {', '.join(unconnected)}")
+
+        if errors:
+            raise ValueError("; ".join(errors))
+
+        return {email: self._by_email[email] for email in wanted}
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """A user by id, served from the participants already loaded when possible."""
+        user = self._by_id.get(user_id)
+        if user is None:
+            user = await get_user_by_id(self.db, user_id)
+            if user:
+                self._remember(user)
+        return user
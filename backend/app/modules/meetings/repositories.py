@@ -1,41 +1,218 @@
-from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, timezone
-from app.modules.meetings.models import Meeting, MeetingStatus
+from sqlalchemy import select, tuple_, union, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, List, Optional, Tuple
+from datetime import datetime, timedelta
+from app.core.config.settings import settings
+from app.modules.meetings.models import Meeting, MeetingParticipant, MeetingStatus
+from app.modules.users.models import User
+from app.modules.rooms.repositories import add_room_booking, release_room_bookings
 
 
-def get_meeting_by_id(db: Session, meeting_id: int):
-    return db.query(Meeting).filter(Meeting.id == meeting_id).first()
+async def get_meeting_by_id(db: AsyncSession, meeting_id: int):
+    result = await db.execute(select(Meeting).where(Meeting.id == meeting_id))
+    return result.scalars().first()
 
 
-def create_meeting(db: Session, meeting_data: dict):
+async def create_meeting(db: AsyncSession, meeting_data: dict, participants: List[User], room_id: Optional[int] = None):
+    """
+    Create a meeting together with one participant row per (distinct) user and,
+    with ``room_id``, its room booking - all in one transaction
+    """
     meeting = Meeting(**meeting_data)
+    seen = set()
+    for user in participants:
+        if user.id in seen:
+            continue
+        seen.add(user.id)
+        meeting.participant_links.append(
+            MeetingParticipant(user_id=user.id, email=user.email, start_time=meeting.start_time)
+        )
     db.add(meeting)
-    db.commit()
-    db.refresh(meeting)
+    if room_id is not None:
+        await db.flush()
+        add_room_booking(db, room_id, meeting.id, meeting.start_time, meeting.end_time)
+    await db.commit()
+    await db.refresh(meeting)
     return meeting
 
 
-def update_meeting(db: Session, meeting: Meeting, update_data: dict):
+async def update_meeting(db: AsyncSession, meeting: Meeting, update_data: dict):
     for key, value in update_data.items():
         setattr(meeting, key, value)
-    db.commit()
-    db.refresh(meeting)
+    if "start_time" in update_data:
+        # keep the copy used by ix_meeting_participants_user_start in step
+        for link in meeting.participant_links:
+            link.start_time = meeting.start_time
+    await db.commit()
+    await db.refresh(meeting)
     return meeting
 
 
-def update_meeting_status(db: Session, meeting: Meeting, status: MeetingStatus):
+async def update_meeting_status(db: AsyncSession, meeting: Meeting, status: MeetingStatus):
     meeting.status = status
-    db.commit()
-    db.refresh(meeting)
+    await db.commit()
+    await db.refresh(meeting)
     return meeting
 
 
-def delete_meeting(db: Session, meeting_id: int):
-    meeting = get_meeting_by_id(db, meeting_id)
+async def transition_meeting_status(db: AsyncSession, meeting_id: int, from_status: MeetingStatus,
+                                    to_status: MeetingStatus, has_permission: bool) -> bool:
+    """
+    Move the meeting from ``from_status`` to ``to_status`` in one conditional UPDATE.
+    False when it was no longer in ``from_status`` (someone else moved it first).
+    """
+    result = await db.execute(
+        update(Meeting)
+        .where(Meeting.id == meeting_id, Meeting.status == from_status)
+        .values(status=to_status, has_permission=has_permission)
+        .execution_options(synchronize_session="fetch")
+    )
+    await db.commit()
+    return result.rowcount == 1
+
+
+async def cancel_pending_meetings(db: AsyncSession, meeting_ids: List[int]) -> List[int]:
+    """
+    Cancel those of ``meeting_ids`` still pending, in one UPDATE, and free their
+    rooms. Returns the ids actually cancelled.
+    """
+    if not meeting_ids:
+        return []
+    result = await db.execute(
+        update(Meeting)
+        .where(Meeting.id.in_(meeting_ids), Meeting.status == MeetingStatus.PENDING)
+        .values(status=MeetingStatus.CANCELLED)
+        .returning(Meeting.id)
+        .execution_options(synchronize_session=False)
+    )
+    cancelled = list(result.scalars().all())
+    await release_room_bookings(db, cancelled)
+    await db.commit()
+    return cancelled
+
+
+async def delete_meeting(db: AsyncSession, meeting_id: int):
+    meeting = await get_meeting_by_id(db, meeting_id)
     if not meeting:
         return False
 
-    db.delete(meeting)
-    db.commit()
+    await db.delete(meeting)
+    await db.commit()
     return True
+
+
+async def get_user_meetings_between(db: AsyncSession, user_id: int, start: datetime, end: datetime,
+                                    statuses: Optional[List[MeetingStatus]] = None) -> List[Meeting]:
+    """Meetings ``user_id`` participates in starting within ``[start, end)``, earliest first"""
+    query = (
+        select(Meeting)
+        .join(MeetingParticipant, MeetingParticipant.meeting_id == Meeting.id)
+        .where(
+            MeetingParticipant.user_id == user_id,
+            MeetingParticipant.start_time >= start,
+            MeetingParticipant.start_time < end,
+        )
+        .order_by(MeetingParticipant.start_time, MeetingParticipant.meeting_id)
+    )
+    if statuses:
+        query = query.where(Meeting.status.in_(statuses))
+    result = await db.execute(query)
+    return list(result.scalars().all())
+
+
+# Columns of MeetingListItem; the list query never loads full Meeting objects
+MEETING_LIST_COLUMNS = (
+    Meeting.id,
+    Meeting.title,
+    Meeting.meeting_type,
+    Meeting.meeting_location,
+    Meeting.meeting_room,
+    Meeting.status,
+    Meeting.start_time,
+    Meeting.end_time,
+    Meeting.created_by,
+)
+
+
+async def get_user_meetings_page(
+    db: AsyncSession,
+    user_id: int,
+    limit: int,
+    statuses: Optional[List[MeetingStatus]] = None,
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    after: Optional[Tuple[datetime, int]] = None
+):
+    """
+    One page of meetings ``user_id`` created or participates in, ordered by
+    ``(start_time, id)`` and starting after the ``after`` key (keyset pagination).
+
+    Each side of the union is a range scan on its own index
+    (ix_meetings_created_by_start / ix_meeting_participants_user_start) that stops
+    after ``limit`` rows. Meetings without a start time are not listed.
+    """
+    def bounded(query, start_col, id_col):
+        query = query.where(start_col.isnot(None))
+        if start_from:
+            query = query.where(start_col >= start_from)
+        if start_to:
+            query = query.where(start_col < start_to)
+        if after:
+            query = query.where(tuple_(start_col, id_col) > tuple_(*after))
+        if statuses:
+            query = query.where(Meeting.status.in_(statuses))
+        page = query.order_by(start_col, id_col).limit(limit).subquery()
+        return select(page.c.id, page.c.start_time)
+
+    created = bounded(
+        select(Meeting.id.label("id"), Meeting.start_time.label("start_time"))
+        .where(Meeting.created_by == user_id),
+        Meeting.start_time, Meeting.id,
+    )
+    joined = bounded(
+        select(MeetingParticipant.meeting_id.label("id"), MeetingParticipant.start_time.label("start_time"))
+        .join(Meeting, Meeting.id == MeetingParticipant.meeting_id)
+        .where(MeetingParticipant.user_id == user_id),
+        MeetingParticipant.start_time, MeetingParticipant.meeting_id,
+    )
+    keys = union(created, joined).subquery()
+
+    result = await db.execute(
+        select(*MEETING_LIST_COLUMNS)
+        .join(keys, keys.c.id == Meeting.id)
+        .order_by(Meeting.start_time, Meeting.id)
+        .limit(limit)
+    )
+    return result.all()
+
+
+# Bounds how far before a window the booked-meetings scan starts: no meeting can be
+# booked longer than MEETING_MAX_LENGTH_MINUTES (enforced by the request schemas)
+BOOKED_MEETING_LOOKBACK = timedelta(minutes=settings.MEETING_MAX_LENGTH_MINUTES)
+
+
+async def get_booked_intervals_for_users(db: AsyncSession, user_ids: List[int], start: datetime, end: datetime,
+                                         statuses: List[MeetingStatus]) -> Dict[int, List[Tuple[datetime, datetime]]]:
+    """
+    (start, end) of meetings in ``statuses`` overlapping ``[start, end)`` for all
+    ``user_ids``, in one range query on ix_meeting_participants_user_start.
+    """
+    result: Dict[int, List[Tuple[datetime, datetime]]] = {user_id: [] for user_id in user_ids}
+    if not user_ids:
+        return result
+
+    rows = await db.execute(
+        select(MeetingParticipant.user_id, Meeting.start_time, Meeting.end_time)
+        .join(Meeting, Meeting.id == MeetingParticipant.meeting_id)
+        .where(
+            MeetingParticipant.user_id.in_(user_ids),
+            MeetingParticipant.start_time >= start - BOOKED_MEETING_LOOKBACK,
+            MeetingParticipant.start_time < end,
+            Meeting.end_time > start,
+            Meeting.status.in_(statuses),
+        )
+        .order_by(MeetingParticipant.user_id, MeetingParticipant.start_time)
+    )
+    for row in rows:
+        result[row.user_id].append((row.start_time, row.end_time))
+    return result
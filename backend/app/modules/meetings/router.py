@@ -1,29 +1,38 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Request, Response
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, status, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.core.security.jwt import verify_token
-from typing import List
-from app.core.redis_client import redis_client
+from typing import List, Optional
+from datetime import datetime
 from app.core.config.settings import settings
 from app.db.session.session import get_db
+from app.modules.meetings.models import MeetingStatus
 from app.modules.meetings.schemas import (
     MeetingCreateRequestRedis,
     MeetingCreateRequest,
     AvailableTimeSlotsResponse,
     MeetingScheduleResponse,
-    MeetingResponse
+    MeetingResponse,
+    MeetingListResponse,
+    MeetingDraftListResponse,
+    MeetingApprovalResponse
 )
+from app.modules.meetings.drafts import load_draft, delete_draft
+from app.modules.meetings.utils import _resolve_tz
 from app.modules.meetings.services import (
     create_new_meeting_redis,
     create_new_meeting,
     schedule_meeting,
-    get_meeting_details
+    get_meeting_details,
+    list_user_meetings,
+    get_user_drafts,
+    get_user_draft_slots,
+    approve_meeting
 )
-import json
 
 router = APIRouter(prefix="/meetings", tags=["Meetings"])
 
 @router.post("/available-times", response_model=AvailableTimeSlotsResponse, status_code=status.HTTP_201_CREATED)
-async def available_meeting_times(request:Request, meeting_request: MeetingCreateRequestRedis, db: Session = Depends(get_db)):
+async def available_meeting_times(request:Request, meeting_request: MeetingCreateRequestRedis, db: AsyncSession = Depends(get_db)):
 
     try:
 
@@ -39,8 +48,9 @@ async def available_meeting_times(request:Request, meeting_request: MeetingCreat
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Invalid token payload")
+        user_id = int(user_id)  # "sub" is a string; asyncpg won't coerce it for integer columns
 
-        result = create_new_meeting_redis(db=db, meeting_request=meeting_request, current_user_id=user_id)
+        result = await create_new_meeting_redis(db=db, meeting_request=meeting_request, current_user_id=user_id)
 
         return result
 
@@ -51,8 +61,8 @@ async def available_meeting_times(request:Request, meeting_request: MeetingCreat
 
 
 
-@router.get("/create/{selected_slot_index}", response_model=MeetingScheduleResponse, status_code=status.HTTP_201_CREATED)
-async def create_meeting_endpoint(selected_slot_index: int, request:Request, db: Session = Depends(get_db)):
+@router.get("/create/{draft_id}/{selected_slot_index}", response_model=MeetingScheduleResponse, status_code=status.HTTP_201_CREATED)
+async def create_meeting_endpoint(draft_id: str, selected_slot_index: int, request:Request, room: Optional[str] = None, db: AsyncSession = Depends(get_db)):
 
     try:
 
@@ -68,40 +78,43 @@ async def create_meeting_endpoint(selected_slot_index: int, request:Request, db:
         user_id = payload.get("sub")
         if user_id is None:
             raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Invalid token payload")
+        user_id = int(user_id)  # "sub" is a string; asyncpg won't coerce it for integer columns
 
-        redis_raw = redis_client.get(f"user_id:{user_id}")
-        if not redis_raw:
-            raise ValueError("No draft meeting found in Redis")
-
-        if isinstance(redis_raw, str):
-            redis_data = json.loads(redis_raw)
-        else:
-            redis_data = redis_raw
+        draft = await load_draft(user_id, draft_id)
+        if not draft:
+            raise ValueError("Draft not found or expired")
 
         # Validate selected_slot_index
-        available_times = redis_data.get("meeting_available_times", [])
-        if selected_slot_index < 0 or selected_slot_index >= len(available_times):
-            raise ValueError(f"Invalid slot index {selected_slot_index}. Available slots: {len(available_times)}")
+        if selected_slot_index < 0 or selected_slot_index >= len(draft.slots):
+            raise ValueError(f"Invalid slot index {selected_slot_index}. Available slots: {len(draft.slots)}")
+        slot = draft.slots[selected_slot_index]
+
+        # Slots of in-person internal meetings list their free rooms; take the requested one or the first
+        meeting_room = draft.meeting_room
+        if slot.rooms is not None:
+            if room and room not in slot.rooms:
+                raise ValueError(f"Room {room} is not free in the selected slot. Free rooms: {', '.join(slot.rooms)}")
+            meeting_room = room or slot.rooms[0]
 
         
-        result = create_new_meeting(
+        result = await create_new_meeting(
             db=db,
             meeting_request=MeetingCreateRequest(
-                    meeting_type = redis_data["meeting_type"],
-                    meeting_location=redis_data["meeting_location"],
-                    title=redis_data["title"],
-                    description=redis_data.get("description"),
-                    participants=redis_data["participants"],
-                    meeting_length=redis_data["meeting_length"],
-                    meeting_date=redis_data["meeting_date"],
-                    start_time=available_times[selected_slot_index]["start"],
-                    end_time=available_times[selected_slot_index]["end"],
-                    meeting_room=redis_data["meeting_room"]
+                    meeting_type = draft.meeting_type,
+                    meeting_location=draft.meeting_location,
+                    title=draft.title,
+                    description=draft.description,
+                    participants=draft.participants,
+                    meeting_length=draft.meeting_length,
+                    meeting_date=slot.start.astimezone(_resolve_tz(settings.TIMEZONE)).date(),
+                    start_time=slot.start,
+                    end_time=slot.end,
+                    meeting_room=meeting_room
                     ),
                     current_user_id=user_id
         )
         
-        redis_client.delete(f"user_id:{user_id}")
+        await delete_draft(user_id, draft_id)
         return result
         
     except ValueError as e:
@@ -119,11 +132,202 @@ async def create_meeting_endpoint(selected_slot_index: int, request:Request, db:
 
 
 
+@router.get("", response_model=MeetingListResponse)
+async def list_my_meetings_endpoint(
+    request: Request,
+    status_filter: Optional[MeetingStatus] = Query(None, alias="status"),
+    start_from: Optional[datetime] = None,
+    start_to: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    db: AsyncSession = Depends(get_db)
+):
+
+    try:
+
+        token = request.cookies.get("access_token")
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+        payload = verify_token(token)
+
+        if payload is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Invalid token payload")
+        user_id = int(user_id)
+
+        return await list_user_meetings(
+            db=db,
+            user_id=user_id,
+            limit=limit,
+            status=status_filter,
+            start_from=start_from,
+            start_to=start_to,
+            cursor=cursor
+        )
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list meetings: {str(e)}"
+        )
+
+
+
+
+
+@router.get("/drafts", response_model=MeetingDraftListResponse)
+async def list_my_drafts_endpoint(request: Request):
+
+    try:
+
+        token = request.cookies.get("access_token")
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+        payload = verify_token(token)
+
+        if payload is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Invalid token payload")
+        user_id = int(user_id)
+
+        return await get_user_drafts(current_user_id=user_id)
+
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list drafts: {str(e)}"
+        )
+
+
+
+
+
+@router.get("/drafts/{draft_id}", response_model=AvailableTimeSlotsResponse)
+async def get_draft_endpoint(draft_id: str, request: Request):
+
+    try:
+
+        token = request.cookies.get("access_token")
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+        payload = verify_token(token)
+
+        if payload is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Invalid token payload")
+        user_id = int(user_id)
+
+        return await get_user_draft_slots(current_user_id=user_id, draft_id=draft_id)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to get draft: {str(e)}"
+        )
+
+
+
+
+
+@router.delete("/drafts/{draft_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_draft_endpoint(draft_id: str, request: Request):
+
+    token = request.cookies.get("access_token")
+    if not token:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+    payload = verify_token(token)
+
+    if payload is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+    user_id = payload.get("sub")
+    if user_id is None:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Invalid token payload")
+
+    await delete_draft(int(user_id), draft_id)
+    return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+
+
+
+
+@router.post("/{meeting_id}/approve", response_model=MeetingApprovalResponse)
+async def approve_meeting_endpoint(meeting_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+
+    try:
+
+        token = request.cookies.get("access_token")
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+        payload = verify_token(token)
+
+        if payload is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+        user_id = payload.get("sub")
+        if user_id is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,detail="Invalid token payload")
+        user_id = int(user_id)
+
+        return await approve_meeting(db=db, meeting_id=meeting_id, approver_id=user_id)
+
+    except HTTPException:
+        raise
+    except PermissionError as e:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail=str(e)
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to approve meeting: {str(e)}"
+        )
+
+
+
+
+
 @router.get("/{meeting_id}", response_model=MeetingResponse)
-async def get_meeting_endpoint(meeting_id: int, db: Session = Depends(get_db)):
+async def get_meeting_endpoint(meeting_id: int, db: AsyncSession = Depends(get_db)):
 
     try:
-        meeting = get_meeting_details(db=db, meeting_id=meeting_id)
+        meeting = await get_meeting_details(db=db, meeting_id=meeting_id)
         return meeting
         
     except ValueError as e:
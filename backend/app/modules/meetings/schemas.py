@@ -1,6 +1,8 @@
+import enum
 from pydantic import BaseModel, Field, model_validator
 from typing import List, Optional
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from app.core.config.settings import settings
 from app.modules.meetings.models import (
     MeetingType,
     MeetingLocation,
@@ -8,35 +10,73 @@ from app.modules.meetings.models import (
 )
 
 
+class SlotRank(str, enum.Enum):
+    EARLIEST = "earliest"
+    MIDDAY = "midday"
+    FEWEST_ADJACENT = "fewest_adjacent"
+
+
 class MeetingCreateRequestRedis(BaseModel):
     meeting_type: MeetingType
     meeting_location: MeetingLocation
     title: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
     participants: List[str] = Field(..., min_length=2)
-    meeting_length: int = Field(..., gt=0)
+    meeting_length: int = Field(..., gt=0, le=settings.MEETING_MAX_LENGTH_MINUTES)
     meeting_date: date
+    # Range search: also try the working days up to date_to, stopping after max_slots slots
+    date_to: Optional[date] = None
+    max_slots: Optional[int] = Field(None, gt=0)
+    # Return only the best slots by this score: "earliest", "midday" or "fewest_adjacent"
+    rank_by: Optional[SlotRank] = None
+    # Quorum search: participants are required, these may be missing, and a slot
+    # needs min_attendees people free in total (default: all required ones)
+    optional_participants: List[str] = Field(default_factory=list)
+    min_attendees: Optional[int] = Field(None, gt=0)
+    # In-person internal meetings get a room from the search; these narrow it down
     meeting_room: Optional[str] = None
+    room_features: List[str] = Field(default_factory=list)
 
     @model_validator(mode="after")
     def validate_meeting_room(self):
 
-        if (
+        if not (
             self.meeting_type == MeetingType.IN_PERSON
             and self.meeting_location == MeetingLocation.INTERNAL
         ):
-            if not self.meeting_room:
+            if self.meeting_room or self.room_features:
                 raise ValueError(
-                    "meeting_room is required for in-person internal meetings"
-                )
-        else:
-            if self.meeting_room:
-                raise ValueError(
-                    "meeting_room should be null for online or external meetings"
+                    "meeting_room and room_features should be null for online or external meetings"
                 )
 
         return self
 
+    @model_validator(mode="after")
+    def validate_date_range(self):
+
+        if self.date_to is not None:
+            if self.date_to < self.meeting_date:
+                raise ValueError("date_to must not be before meeting_date")
+            if (self.date_to - self.meeting_date).days >= settings.SLOT_SEARCH_MAX_DAYS:
+                raise ValueError(f"A search can span at most {settings.SLOT_SEARCH_MAX_DAYS} days")
+
+        return self
+
+    @model_validator(mode="after")
+    def validate_quorum(self):
+
+        attendees = len(set(self.participants) | set(self.optional_participants))
+        if self.min_attendees is not None and self.min_attendees > attendees:
+            raise ValueError(f"min_attendees cannot exceed the {attendees} invited participants")
+        if self.rank_by is not None and (self.optional_participants or self.min_attendees is not None):
+            raise ValueError("rank_by cannot be combined with optional_participants or min_attendees")
+
+        return self
+
+    @property
+    def needs_room(self) -> bool:
+        return self.meeting_type == MeetingType.IN_PERSON and self.meeting_location == MeetingLocation.INTERNAL
+
     model_config = {
         "use_enum_values": True
     }
@@ -48,7 +88,7 @@ class MeetingCreateRequest(BaseModel):
     title: str = Field(..., min_length=1, max_length=255)
     description: Optional[str] = None
     participants: List[str] = Field(..., min_length=2)
-    meeting_length: int = Field(..., gt=0)
+    meeting_length: int = Field(..., gt=0, le=settings.MEETING_MAX_LENGTH_MINUTES)
     meeting_date: date
     start_time: Optional[datetime]
     end_time: Optional[datetime]
@@ -73,6 +113,15 @@ class MeetingCreateRequest(BaseModel):
 
         return self
 
+    @model_validator(mode="after")
+    def validate_time_range(self):
+
+        if self.start_time and self.end_time:
+            if self.end_time - self.start_time > timedelta(minutes=settings.MEETING_MAX_LENGTH_MINUTES):
+                raise ValueError(f"A meeting can last at most {settings.MEETING_MAX_LENGTH_MINUTES} minutes")
+
+        return self
+
     model_config = {
         "use_enum_values": True
     }
@@ -117,16 +166,74 @@ class MeetingScheduleResponse(BaseModel):
 class TimeSlotSchema(BaseModel):
     start: datetime
     end: datetime
+    rooms: Optional[List[str]] = None  # free suitable rooms, for in-person internal meetings
+    missing: Optional[List[str]] = None  # quorum search: invitees who are busy during the slot
 
     model_config = {
         "from_attributes": True
     }
 
 
+class DaySlotsSchema(BaseModel):
+    date: date
+    first_index: int  # index of this day's first slot in available_slots
+    slots: List[TimeSlotSchema]
+
+
 class AvailableTimeSlotsResponse(BaseModel):
     available_slots: List[TimeSlotSchema]
+    days: List[DaySlotsSchema] = Field(default_factory=list)
+    draft_id: Optional[str] = None  # pass to /meetings/create/{draft_id}/{index}
     # selected_slot_index: int = 0
 
     model_config = {
         "from_attributes": True
     }
+
+
+class MeetingApprovalResponse(BaseModel):
+    meeting_id: int
+    status: MeetingStatus
+    approved_count: int
+    required_count: int
+    scheduled: Optional[MeetingScheduleResponse] = None  # set on the approval that completed the set
+
+    model_config = {
+        "use_enum_values": True
+    }
+
+
+class MeetingDraftSummary(BaseModel):
+    draft_id: str
+    title: str
+    meeting_date: date
+    participants: List[str]
+    slot_count: int
+    expires_at: datetime
+
+
+class MeetingDraftListResponse(BaseModel):
+    items: List[MeetingDraftSummary]
+
+
+class MeetingListItem(BaseModel):
+    """Lean row for meeting lists; fetch ``/meetings/{id}`` for the full meeting."""
+    id: int
+    title: str
+    meeting_type: MeetingType
+    meeting_location: MeetingLocation
+    meeting_room: Optional[str]
+    status: MeetingStatus
+    start_time: datetime
+    end_time: Optional[datetime]
+    created_by: int
+
+    model_config = {
+        "from_attributes": True,
+        "use_enum_values": True
+    }
+
+
+class MeetingListResponse(BaseModel):
+    items: List[MeetingListItem]
+    next_cursor: Optional[str] = None
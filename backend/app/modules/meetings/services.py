@@ -1,17 +1,23 @@
 from typing import Any, Dict, List, Optional
 from datetime import date, datetime, timezone
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+import asyncio
 import logging
-from app.core.redis_client import redis_client
+import time
+from app.core.config.settings import settings
 from app.core.security import create_access_token
-import json
+from app.db.session.session import AsyncSessionLocal
+import base64
 from app.modules.meetings.models import MeetingStatus, MeetingType
 from app.modules.meetings.repositories import (
     get_meeting_by_id,
     create_meeting,
     update_meeting,
     update_meeting_status,
-    delete_meeting
+    transition_meeting_status,
+    cancel_pending_meetings,
+    delete_meeting,
+    get_user_meetings_page
 )
 from app.modules.meetings.schemas import (
     MeetingCreateRequestRedis,
@@ -19,83 +25,159 @@ from app.modules.meetings.schemas import (
     MeetingResponse,
     MeetingScheduleResponse,
     TimeSlotSchema,
-    AvailableTimeSlotsResponse
+    DaySlotsSchema,
+    AvailableTimeSlotsResponse,
+    MeetingListItem,
+    MeetingListResponse,
+    MeetingDraftSummary,
+    MeetingDraftListResponse,
+    MeetingApprovalResponse
 )
 from app.modules.meetings.utils import (
     find_available_meeting_slots,
     get_valid_access_token,
+    _resolve_tz,
     create_google_meet_description
 )
-from app.modules.users.repositories import get_user_by_email, get_user_by_id
+from app.modules.users.repositories import get_user_by_id
+from app.modules.meetings.participants import ParticipantResolver
+from app.modules.meetings import slot_cache
+from app.modules.meetings.approvals import (
+    ApprovalOutcome,
+    close_approval,
+    discard_expired,
+    open_approval,
+    pop_expired,
+    record_approval,
+    reopen_quorum,
+    requeue_expired
+)
+from app.modules.meetings.drafts import MeetingDraft, list_drafts, load_draft, save_draft
+from app.modules.meetings.intervals import Slot
+from app.modules.rooms.repositories import find_suitable_rooms, get_room_by_name
+from sqlalchemy.exc import IntegrityError
 from app.integrations.google.calendar import create_calendar_event
-from datetime import time as dt_time
 from app.modules.meetings.algorithm import select_meeting_approvers
 
+logger = logging.getLogger(__name__)
+
 
 
-def create_new_meeting_redis(db: Session, meeting_request: MeetingCreateRequestRedis, current_user_id: int):
+async def create_new_meeting_redis(db: AsyncSession, meeting_request: MeetingCreateRequestRedis, current_user_id: int):
 
-    participants_emails: List[str] = []
-    for email in meeting_request.participants:
-        user = get_user_by_email(db, email)
-        if not user:
-            raise ValueError(f"User with email {email} not found")
-        participants_emails.append(email)
+    resolver = ParticipantResolver(db)
+    participants_emails: List[str] = list(meeting_request.participants)
+    # everyone is invited; optional participants just may be missing from the chosen slot
+    invited_emails: List[str] = list(dict.fromkeys(participants_emails + meeting_request.optional_participants))
+    # unknown invitees and required ones without Google Calendar, all in one error
+    users = await resolver.resolve(invited_emails, require_connected=participants_emails)
 
+    rooms = None
+    if meeting_request.needs_room:
+        rooms = await find_suitable_rooms(
+            db, min_capacity=len(users), features=meeting_request.room_features, name=meeting_request.meeting_room
+        )
+        if not rooms:
+            raise ValueError("No room fits this meeting's size and features")
 
-    meeting_date_dt = datetime.combine(
-        meeting_request.meeting_date,
-        dt_time(8, 0, 0)
-    ).replace(tzinfo=timezone.utc)
 
-    available_slots = find_available_meeting_slots(
+    available_slots = await find_available_meeting_slots(
         db=db,
         participants=participants_emails,
-        meeting_date=meeting_date_dt,
-        meeting_length=meeting_request.meeting_length
+        meeting_date=meeting_request.meeting_date,
+        meeting_length=meeting_request.meeting_length,
+        organizer_id=current_user_id,
+        resolver=resolver,
+        rooms=rooms,
+        date_to=meeting_request.date_to,
+        max_slots=meeting_request.max_slots,
+        rank_by=meeting_request.rank_by,
+        optional_participants=meeting_request.optional_participants,
+        min_attendees=meeting_request.min_attendees
     )
 
     if not available_slots:
         raise ValueError("No available time slots found for this meeting")
 
 
-    time_slots = [
-        TimeSlotSchema(start=slot["start"], end=slot["end"])
-        for slot in available_slots
-    ]
+    time_slots = _time_slot_schemas(available_slots)
 
-    serializable_slots = [
-        {"start": slot["start"].isoformat(), "end": slot["end"].isoformat()}
-        for slot in available_slots
-    ]
+    draft_id = await save_draft(current_user_id, MeetingDraft(
+        meeting_type=meeting_request.meeting_type.value if hasattr(meeting_request.meeting_type, "value") else meeting_request.meeting_type,
+        meeting_location=meeting_request.meeting_location.value if hasattr(meeting_request.meeting_location, "value") else meeting_request.meeting_location,
+        title=meeting_request.title,
+        description=meeting_request.description,
+        participants=invited_emails,
+        meeting_length=meeting_request.meeting_length,
+        meeting_date=meeting_request.meeting_date,
+        meeting_room=meeting_request.meeting_room,
+        created_by=current_user_id,
+        slots=available_slots
+    ))
 
-    redis_client.set(
-        f"user_id:{current_user_id}",
-        json.dumps({
-                "meeting_type": meeting_request.meeting_type.value if hasattr(meeting_request.meeting_type, "value") else meeting_request.meeting_type,
-                "meeting_location": meeting_request.meeting_location.value if hasattr(meeting_request.meeting_location, "value") else meeting_request.meeting_location,
-                "title": meeting_request.title,
-                "description": meeting_request.description,
-                "participants": participants_emails,
-                "meeting_length": meeting_request.meeting_length,
-                "meeting_date": str(meeting_request.meeting_date),
-                "meeting_room": meeting_request.meeting_room,
-                "meeting_available_times": serializable_slots,
-                "status": MeetingStatus.PENDING.value,
-                "has_permission": True,
-                "created_by": current_user_id
-            })
+    return AvailableTimeSlotsResponse(
+        available_slots=time_slots,
+        days=_group_slots_by_day(time_slots),
+        draft_id=draft_id
     )
 
+
+def _time_slot_schemas(slots: List[Slot]) -> List[TimeSlotSchema]:
+    """Slot records as response items, in the local timezone (the only place they become datetimes)."""
+    tz = _resolve_tz(settings.TIMEZONE)
+    return [
+        TimeSlotSchema(
+            start=slot.start.astimezone(tz), end=slot.end.astimezone(tz), rooms=slot.rooms, missing=slot.missing
+        )
+        for slot in slots
+    ]
+
+
+def _group_slots_by_day(time_slots: List[TimeSlotSchema]) -> List[DaySlotsSchema]:
+    """Consecutive slots grouped by their local date; ``first_index`` keeps the flat slot index usable."""
+    tz = _resolve_tz(settings.TIMEZONE)
+    days: List[DaySlotsSchema] = []
+    for index, slot in enumerate(time_slots):
+        day = slot.start.astimezone(tz).date()
+        if not days or days[-1].date != day:
+            days.append(DaySlotsSchema(date=day, first_index=index, slots=[]))
+        days[-1].slots.append(slot)
+    return days
+
+
+async def get_user_drafts(current_user_id: int) -> MeetingDraftListResponse:
+    drafts = await list_drafts(current_user_id)
+    return MeetingDraftListResponse(items=[
+        MeetingDraftSummary(
+            draft_id=draft_id,
+            title=draft.title,
+            meeting_date=draft.meeting_date,
+            participants=draft.participants,
+            slot_count=len(draft.slots),
+            expires_at=expires_at
+        )
+        for draft_id, expires_at, draft in drafts
+    ])
+
+
+async def get_user_draft_slots(current_user_id: int, draft_id: str) -> AvailableTimeSlotsResponse:
+    """The slots computed for a draft, straight from Redis (no calendar is queried again)."""
+    draft = await load_draft(current_user_id, draft_id)
+    if not draft:
+        raise ValueError("Draft not found or expired")
+
+    time_slots = _time_slot_schemas(draft.slots)
     return AvailableTimeSlotsResponse(
-        available_slots=time_slots
+        available_slots=time_slots,
+        days=_group_slots_by_day(time_slots),
+        draft_id=draft_id
     )
 
 
 
-def schedule_meeting(db: Session, meeting_id: int):
+async def schedule_meeting(db: AsyncSession, meeting_id: int, resolver: Optional[ParticipantResolver] = None):
     
-    meeting = get_meeting_by_id(db, meeting_id)
+    meeting = await get_meeting_by_id(db, meeting_id)
     if not meeting:
         raise ValueError("Meeting not found")
 
@@ -120,7 +202,7 @@ def schedule_meeting(db: Session, meeting_id: int):
     needs_conference = (meeting.meeting_type == MeetingType.ONLINE)
 
 
-    organizer = get_user_by_id(db, meeting.created_by)
+    organizer = await (resolver or ParticipantResolver(db)).get_by_id(meeting.created_by)
     if not organizer:
         raise ValueError("Organizer not found")
 
@@ -131,9 +213,10 @@ def schedule_meeting(db: Session, meeting_id: int):
         raise ValueError("Organizer has no valid token")
 
     try:
-        access_token = get_valid_access_token(db, organizer)
+        access_token = await get_valid_access_token(db, organizer)
 
-        created_event = create_calendar_event(
+        created_event = await asyncio.to_thread(
+            create_calendar_event,
             access_token=access_token,
             summary=meeting.title,
             description=description,
@@ -141,7 +224,8 @@ def schedule_meeting(db: Session, meeting_id: int):
             end_time=meeting.end_time,
             attendees=participants,
             location=meeting.meeting_room if meeting.meeting_room else None,
-            conference_data=needs_conference
+            conference_data=needs_conference,
+            organizer_email=organizer.email
         )
 
         if not created_event or not isinstance(created_event, dict):
@@ -161,7 +245,7 @@ def schedule_meeting(db: Session, meeting_id: int):
         "scheduled_at": datetime.now(timezone.utc)
     }
 
-    meeting = update_meeting(db, meeting, update_data)
+    meeting = await update_meeting(db, meeting, update_data)
 
     meeting_response = MeetingResponse(
         id=meeting.id,
@@ -193,31 +277,93 @@ def schedule_meeting(db: Session, meeting_id: int):
 
 
 ###### helper ##########
-def check_qualified_participants(db:Session, meeting_id:int):
-    pass # --> بعدا باید درست شه
-    
-    data = redis_client.get(f"user_id:{meeting_id}")
-    if not data:
-        return False
-    
-    approved = data.get("approved_count")
-    qualified_participants = data.get("qualified_participants")
-
-    if (approved + 1) == len(qualified_participants):
-    
-        redis_client.delete(f"user_id:{meeting_id}")
-        return schedule_meeting(db=db, meeting_id=meeting_id)
-
-    else:  
-        redis_client.update_fields(
-            f"user_id:{meeting_id}",
-            {"approved_count": approved + 1}
-        )
+async def approve_meeting(db: AsyncSession, meeting_id: int, approver_id: int) -> MeetingApprovalResponse:
+    """
+    Record ``approver_id``'s approval of a pending meeting. The approval that
+    completes the set of required approvers - and only that one - approves and
+    schedules the meeting.
+    """
+    meeting = await get_meeting_by_id(db, meeting_id)
+    if not meeting:
+        raise ValueError("Meeting not found")
+    if meeting.status != MeetingStatus.PENDING:
+        raise ValueError(f"Meeting is {meeting.status.value}, not pending approval")
+
+    resolver = ParticipantResolver(db)
+    approver = await resolver.get_by_id(approver_id)
+    if not approver:
+        raise ValueError("User not found")
+
+    outcome, approved, required = await record_approval(meeting_id, approver.email)
+    if outcome == ApprovalOutcome.UNKNOWN:
+        raise ValueError("Meeting has no open approval")
+    if outcome == ApprovalOutcome.EXPIRED:
+        raise ValueError("The approval period of this meeting has ended")
+    if outcome == ApprovalOutcome.NOT_APPROVER:
+        raise PermissionError("You are not an approver of this meeting")
+
+    scheduled = None
+    if outcome == ApprovalOutcome.QUORUM:
+        if not await transition_meeting_status(db, meeting_id, MeetingStatus.PENDING, MeetingStatus.APPROVED, True):
+            await close_approval(meeting_id)
+            raise ValueError("Meeting is no longer pending approval")
+        try:
+            scheduled = await schedule_meeting(db=db, meeting_id=meeting_id, resolver=resolver)
+        except Exception:
+            # put it back so the next approval call retries scheduling
+            await transition_meeting_status(db, meeting_id, MeetingStatus.APPROVED, MeetingStatus.PENDING, False)
+            await reopen_quorum(meeting_id)
+            raise
+        await close_approval(meeting_id)
+
+    return MeetingApprovalResponse(
+        meeting_id=meeting_id,
+        status=MeetingStatus.APPROVED if outcome != ApprovalOutcome.RECORDED else MeetingStatus.PENDING,
+        approved_count=approved,
+        required_count=required,
+        scheduled=scheduled
+    )
 
 
-def handle_pending_meetings(db:Session, meeting_id:int, qualified_participants:List[str]):
+async def expire_pending_approvals() -> int:
+    """
+    Cancel pending meetings whose approval deadline has passed, APPROVAL_EXPIRY_BATCH_SIZE
+    at a time. Work is proportional to the number of overdue meetings. Returns how
+    many were cancelled.
+    """
+    cancelled = 0
+    async with AsyncSessionLocal() as db:
+        while True:
+            meeting_ids = await pop_expired(settings.APPROVAL_EXPIRY_BATCH_SIZE)
+            if not meeting_ids:
+                break
+            try:
+                cancelled += len(await cancel_pending_meetings(db, meeting_ids))
+            except Exception:
+                await db.rollback()
+                await requeue_expired(meeting_ids)
+                raise
+            await discard_expired(meeting_ids)
+            if len(meeting_ids) < settings.APPROVAL_EXPIRY_BATCH_SIZE:
+                break
+    return cancelled
+
+
+async def run_approval_expiry_worker():
+    """Background loop started from the app lifespan when APPROVAL_EXPIRY_ENABLED is set."""
+    while True:
+        try:
+            cancelled = await expire_pending_approvals()
+            if cancelled:
+                logger.info(f"Cancelled {cancelled} meetings whose approval expired")
+        except Exception:
+            logger.exception("Approval expiry run failed")
+        await asyncio.sleep(settings.APPROVAL_EXPIRY_INTERVAL_SECONDS)
+
+
+async def handle_pending_meetings(db: AsyncSession, meeting_id:int, qualified_participants:List[str]):
     
-    meeting = get_meeting_by_id(db, meeting_id)
+    meeting = await get_meeting_by_id(db, meeting_id)
     if not meeting:
         raise ValueError("Meeting not found")
     
@@ -225,20 +371,35 @@ def handle_pending_meetings(db:Session, meeting_id:int, qualified_participants:L
     if not participants:
         raise ValueError("Meeting has no participants")
     
-    organizer = get_user_by_id(db, meeting.created_by)
+    organizer = await get_user_by_id(db, meeting.created_by)
     if not organizer:
         raise ValueError("Organizer not found")
-    
-    if organizer in qualified_participants:
-        qualified_participants.remove(organizer)
-
-    redis_client.set(
-        f"user_id:{meeting_id}",
-        json.dumps({
-              "qualified_participants" :  qualified_participants,
-              "approved_count" : 0
-            })
-    )
+
+    # the organizer's own approval is implied by creating the meeting
+    qualified_participants = [email for email in qualified_participants if email != organizer.email]
+
+    if not qualified_participants:
+        # only the organizer had to approve: nothing to wait for
+        if not await transition_meeting_status(db, meeting_id, MeetingStatus.PENDING, MeetingStatus.APPROVED, True):
+            raise ValueError("Meeting is no longer pending approval")
+        await schedule_meeting(db=db, meeting_id=meeting_id)
+        return {"message": "Meeting needs no further approval and was scheduled"}
+
+    # approvals close at the timeout, or when the meeting would start if that is sooner
+    deadline = time.time() + settings.MEETING_APPROVAL_TIMEOUT_SECONDS
+    if meeting.start_time:
+        start = meeting.start_time if meeting.start_time.tzinfo else meeting.start_time.replace(tzinfo=timezone.utc)
+        deadline = min(deadline, start.timestamp())
+
+    try:
+        opened = await open_approval(meeting_id, qualified_participants, deadline)
+    except Exception:
+        logger.exception(f"Failed to open the approval of meeting {meeting_id}")
+        opened = False
+    if not opened:
+        # without approval state it could never be approved or expire - don't keep it (or its room)
+        await cancel_pending_meetings(db, [meeting_id])
+        raise ValueError("Could not start the approval of this meeting; it was not booked")
 
     pass #---> وسه همه افراد مورد تایید باید یک پیامی ارسال شه
 
@@ -250,17 +411,38 @@ def handle_pending_meetings(db:Session, meeting_id:int, qualified_participants:L
 
 
 
-def create_new_meeting(db: Session, meeting_request: MeetingCreateRequest, current_user_id: int):
+async def _create_meeting_with_room(db: AsyncSession, meeting_data: Dict[str, Any], participants: List[Any],
+                                    meeting_request: MeetingCreateRequest):
+
+    room_id = None
+    if meeting_request.meeting_room:
+        room = await get_room_by_name(db, meeting_request.meeting_room)
+        if not room or not room.is_active:
+            raise ValueError(f"Room {meeting_request.meeting_room} not found")
+        room_id = room.id
+
+    try:
+        meeting = await create_meeting(db, meeting_data, participants=participants, room_id=room_id)
+    except IntegrityError:
+        # ex_room_bookings_no_overlap: somebody booked the room since the search
+        await db.rollback()
+        raise ValueError(f"Room {meeting_request.meeting_room} is no longer free at that time")
+
+    # cached searches of these days may still offer the slot just taken
+    await slot_cache.invalidate(meeting.start_time, meeting.end_time or meeting.start_time)
+    return meeting
+
+
+async def create_new_meeting(db: AsyncSession, meeting_request: MeetingCreateRequest, current_user_id: int):
 
     participants_data: List[Dict[str, Any]] = []
-    participants_emails: List[str] = []
-    
-    for email in meeting_request.participants:
-        user = get_user_by_email(db, email)
-        if not user:
-            raise ValueError(f"User with email {email} not found")
-        participants_emails.append(email)
+    participants_emails: List[str] = list(meeting_request.participants)
 
+    resolver = ParticipantResolver(db)
+    users = await resolver.resolve(participants_emails)
+
+    for email in participants_emails:
+        user = users[email]
         participants_data.append({
             "user_email": user.email,
             "org_level": user.org_level,
@@ -270,9 +452,14 @@ def create_new_meeting(db: Session, meeting_request: MeetingCreateRequest, curre
 
     approvers = select_meeting_approvers(participants_data)
 
-    current_user = get_user_by_id(db=db, id=current_user_id)
+    current_user = await resolver.get_by_id(current_user_id)
+
+    # the organizer's own approval is implied by creating the meeting
+    approvers_email = list(dict.fromkeys(
+        approver["user_email"] for approver in approvers if approver["user_email"] != current_user.email
+    ))
 
-    if approvers == [] or (len(approvers) == 1 and approvers[0]["user_email"] == current_user.email):
+    if not approvers_email:
         has_permission = True
         meeting_status = MeetingStatus.APPROVED
 
@@ -281,7 +468,6 @@ def create_new_meeting(db: Session, meeting_request: MeetingCreateRequest, curre
         "meeting_location": meeting_request.meeting_location,
         "title": meeting_request.title,
         "description": meeting_request.description,
-        "participants": participants_emails,
         "meeting_length": meeting_request.meeting_length,
         "meeting_date": meeting_request.meeting_date,
         "meeting_room": meeting_request.meeting_room,
@@ -292,8 +478,8 @@ def create_new_meeting(db: Session, meeting_request: MeetingCreateRequest, curre
         "created_by": current_user_id
         }
 
-        meeting = create_meeting(db, meeting_data)
-        result = schedule_meeting(db=db, meeting_id=meeting.id, )
+        meeting = await _create_meeting_with_room(db, meeting_data, list(users.values()), meeting_request)
+        result = await schedule_meeting(db=db, meeting_id=meeting.id, resolver=resolver)
 
         return result
 
@@ -309,7 +495,6 @@ def create_new_meeting(db: Session, meeting_request: MeetingCreateRequest, curre
             "meeting_location": meeting_request.meeting_location,
             "title": meeting_request.title,
             "description": meeting_request.description,
-            "participants": participants_emails,
             "meeting_length": meeting_request.meeting_length,
             "meeting_date": meeting_request.meeting_date,
             "meeting_room": meeting_request.meeting_room,
@@ -320,17 +505,21 @@ def create_new_meeting(db: Session, meeting_request: MeetingCreateRequest, curre
             "created_by": current_user_id
         }
 
-        meeting = create_meeting(db, meeting_data)
-        approvers_email = [user["user_email"] for user in approvers]
-        result = handle_pending_meetings(db=db, meeting_id=meeting.id, qualified_participants=approvers_email)
+        meeting = await _create_meeting_with_room(db, meeting_data, list(users.values()), meeting_request)
+        result = await handle_pending_meetings(db=db, meeting_id=meeting.id, qualified_participants=approvers_email)
 
-        return meeting
+        return MeetingScheduleResponse(
+            success=True,
+            message=result["message"],
+            meeting=await get_meeting_details(db=db, meeting_id=meeting.id),
+            google_calendar_link=None
+        )
 
 
 
-def get_meeting_details(db: Session, meeting_id: int):
+async def get_meeting_details(db: AsyncSession, meeting_id: int):
 
-    meeting = get_meeting_by_id(db, meeting_id)
+    meeting = await get_meeting_by_id(db, meeting_id)
     if not meeting:
         raise ValueError("Meeting not found")
 
@@ -355,3 +544,43 @@ def get_meeting_details(db: Session, meeting_id: int):
         created_at=meeting.created_at,
         scheduled_at=meeting.scheduled_at
     )
+
+
+
+def _encode_cursor(start_time: datetime, meeting_id: int) -> str:
+    raw = f"{start_time.isoformat()}|{meeting_id}".encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        start, meeting_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(start), int(meeting_id)
+    except Exception:
+        raise ValueError("Invalid cursor")
+
+
+async def list_user_meetings(db: AsyncSession, user_id: int, limit: int,
+                             status: Optional[MeetingStatus] = None,
+                             start_from: Optional[datetime] = None,
+                             start_to: Optional[datetime] = None,
+                             cursor: Optional[str] = None) -> MeetingListResponse:
+
+    rows = await get_user_meetings_page(
+        db,
+        user_id,
+        limit + 1,  # one extra row tells whether another page exists
+        statuses=[status] if status else None,
+        start_from=start_from,
+        start_to=start_to,
+        after=_decode_cursor(cursor) if cursor else None
+    )
+
+    items = [MeetingListItem.model_validate(row) for row in rows[:limit]]
+    next_cursor = None
+    if len(rows) > limit:
+        last = rows[limit - 1]
+        next_cursor = _encode_cursor(last.start_time, last.id)
+
+    return MeetingListResponse(items=items, next_cursor=next_cursor)
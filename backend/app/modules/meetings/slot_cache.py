@@ -0,0 +1,173 @@
+"""
+Short-lived cache of whole slot searches, shared by identical requests.
+
+A search is identified by a hash of its normalized inputs: the participant set
+(order ignored), the window, the meeting length, the working hours,
+the candidate rooms and the slot engine. The hash also covers a per-UTC-day
+generation counter that is bumped whenever a meeting is booked here, so a
+booking makes cached searches of its days unreachable instead of serving
+slots that are no longer free.
+
+Concurrent identical searches are coalesced: inside a process they await one
+future, across processes a Redis lock elects the worker that computes while the
+others poll for its result.
+"""
+import asyncio
+import copy
+import hashlib
+import logging
+import time
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+import orjson
+
+from app.core.config.settings import settings
+from app.core.metrics import metrics
+from app.core.redis_client import async_redis
+from app.modules.meetings.intervals import Slot
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "slot_search"
+# Bump when the stored slot layout changes so old entries are never read
+SLOT_FORMAT_VERSION = 2
+LOCK_PREFIX = "slot_search_lock"
+GENERATION_PREFIX = "slot_search_gen"
+WAIT_POLL_SECONDS = 0.05
+
+metrics.register_ratio("slot_search_cache.hit_ratio", "slot_search_cache.hit", "slot_search_cache.miss")
+
+# Searches being computed by this process, keyed like the cache; identical
+# requests await the same future instead of starting another search
+_inflight: Dict[str, asyncio.Future] = {}
+
+
+def _utc_days(start: datetime, end: datetime) -> List[date]:
+    first = start.astimezone(timezone.utc).date()
+    last = max(end, start).astimezone(timezone.utc).date()
+    return [first + timedelta(days=i) for i in range((last - first).days + 1)]
+
+
+def _generation_key(day: date) -> str:
+    return f"{GENERATION_PREFIX}:{day.isoformat()}"
+
+
+async def search_key(participants: Iterable[str], time_min: datetime, time_max: datetime, meeting_length: int,
+                     work_start_hour: int, work_end_hour: int, room_ids: Optional[Iterable[int]] = None,
+                     extra: Any = None) -> str:
+    """``extra`` is any further JSON-able input that changes the result (e.g. the days searched)."""
+    generations = await async_redis.get_many_raw([_generation_key(day) for day in _utc_days(time_min, time_max)])
+    normalized = orjson.dumps([
+        sorted(set(participants)),
+        time_min.astimezone(timezone.utc).isoformat(),
+        time_max.astimezone(timezone.utc).isoformat(),
+        meeting_length,
+        work_start_hour,
+        work_end_hour,
+        settings.TIMEZONE,
+        None if room_ids is None else sorted(room_ids),
+        settings.SLOT_ENGINE,
+        SLOT_FORMAT_VERSION,
+        [generation or "0" for generation in generations],
+        extra,
+    ])
+    return f"{KEY_PREFIX}:{hashlib.sha256(normalized).hexdigest()}"
+
+
+async def invalidate(start: datetime, end: datetime):
+    """Make every cached search touching the UTC days of ``[start, end]`` unreachable."""
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    pipe = async_redis.pipeline(transaction=False)
+    if pipe is None:
+        return
+    try:
+        async with pipe:
+            for day in _utc_days(start, end):
+                pipe.incr(_generation_key(day))
+                # outlives any entry computed under the old generation
+                pipe.expire(_generation_key(day), settings.SLOT_SEARCH_CACHE_TTL_SECONDS + 86400)
+            await pipe.execute()
+    except Exception:
+        logger.warning("Failed to invalidate slot search cache", exc_info=True)
+
+
+def _encode(slots: List[Slot]) -> bytes:
+    return orjson.dumps([[slot.start_minute, slot.end_minute, slot.rooms, slot.missing] for slot in slots])
+
+
+def _decode(raw: Optional[str]) -> Optional[List[Slot]]:
+    if raw is None:
+        return None
+    try:
+        return [Slot(start, end, rooms, missing) for start, end, rooms, missing in orjson.loads(raw)]
+    except (orjson.JSONDecodeError, TypeError, ValueError):
+        return None
+
+
+async def _compute_across_workers(key: str, compute: Callable[[], Awaitable[List[Slot]]]):
+    lock_key = f"{LOCK_PREFIX}:{key[len(KEY_PREFIX) + 1:]}"
+    if not await async_redis.set_if_absent(lock_key, "1", ttl=settings.SLOT_SEARCH_CACHE_LOCK_SECONDS):
+        # Another worker is running this search - wait for its result
+        deadline = time.monotonic() + settings.SLOT_SEARCH_CACHE_LOCK_SECONDS
+        while time.monotonic() < deadline and await async_redis.exists(lock_key):
+            await asyncio.sleep(WAIT_POLL_SECONDS)
+            cached = _decode(await async_redis.get_raw(key))
+            if cached is not None:
+                metrics.increment("slot_search_cache.coalesced")
+                return cached
+        return await compute()
+
+    try:
+        slots = await compute()
+        await async_redis.set_raw(key, _encode(slots), ttl=settings.SLOT_SEARCH_CACHE_TTL_SECONDS)
+        return slots
+    finally:
+        await async_redis.delete(lock_key)
+
+
+async def cached_search(key: str, compute: Callable[[], Awaitable[List[Slot]]]) -> List[Slot]:
+    """
+    The slots cached under ``key``, else the result of ``compute()`` (stored for
+    SLOT_SEARCH_CACHE_TTL_SECONDS). Identical concurrent calls share one
+    ``compute()``; its errors propagate to every waiter. If the call running it
+    is cancelled, its waiters look again and one of them takes over.
+    """
+    while True:
+        cached = _decode(await async_redis.get_raw(key))
+        if cached is not None:
+            metrics.increment("slot_search_cache.hit")
+            return cached
+
+        future = _inflight.get(key)
+        if future is None:
+            break
+        metrics.increment("slot_search_cache.coalesced")
+        try:
+            return [copy.copy(slot) for slot in await asyncio.shield(future)]
+        except asyncio.CancelledError:
+            if not future.cancelled():
+                raise  # this call itself was cancelled
+            # the call leading the search went away: look again, or take it over
+
+    metrics.increment("slot_search_cache.miss")
+    future = _inflight[key] = asyncio.get_running_loop().create_future()
+    try:
+        if async_redis.available:
+            slots = await _compute_across_workers(key, compute)
+        else:
+            slots = await compute()
+        future.set_result(slots)
+        return slots
+    except BaseException as e:
+        if isinstance(e, asyncio.CancelledError):
+            future.cancel()
+        else:
+            future.set_exception(e)
+            future.exception()  # mark retrieved; waiters (if any) re-raise it
+        raise
+    finally:
+        _inflight.pop(key, None)
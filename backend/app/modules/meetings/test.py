@@ -0,0 +1,134 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.config.settings import settings
+from app.integrations.google import calendar, freebusy_cache
+from app.modules.meetings import slot_cache
+from app.modules.meetings.intervals import Slot
+
+
+class FakeRedis:
+    """The part of ``SimpleRedis`` the FreeBusy cache uses, kept in a dict."""
+
+    def __init__(self):
+        self.values = {}
+
+    def get(self, key):
+        return self.values.get(key)
+
+    def get_many(self, keys):
+        return [self.values.get(key) for key in keys]
+
+    def set(self, key, value, ttl=None):
+        # round-trip like the JSON the real client stores
+        self.values[key] = [list(item) for item in value] if isinstance(value, list) else value
+        return True
+
+    def set_if_absent(self, key, value, ttl):
+        if key in self.values:
+            return False
+        self.values[key] = value
+        return True
+
+    def delete(self, key):
+        self.values.pop(key, None)
+        return True
+
+    def delete_many(self, keys):
+        for key in keys:
+            self.values.pop(key, None)
+        return True
+
+    def exists(self, key):
+        return key in self.values
+
+
+class FakeFreeBusy:
+    """Stands in for ``calendar_collection('freebusy')``: everyone is busy 10:00-11:00 UTC every day."""
+
+    def __init__(self):
+        self.windows = []
+
+    def query(self, body):
+        self.windows.append((body["timeMin"], body["timeMax"]))
+        start = datetime.fromisoformat(body["timeMin"])
+        end = datetime.fromisoformat(body["timeMax"])
+        busy = []
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day < end:
+            busy.append({
+                "start": (day + timedelta(hours=10)).isoformat(),
+                "end": (day + timedelta(hours=11)).isoformat(),
+            })
+            day += timedelta(days=1)
+        calendars = {item["id"]: {"busy": busy} for item in body["items"]}
+        return type("Request", (), {"execute": lambda self, http=None: {"calendars": calendars}})()
+
+
+@pytest.fixture
+def freebusy(monkeypatch):
+    fake = FakeFreeBusy()
+    monkeypatch.setattr(settings, "FREEBUSY_CACHE_ENABLED", True)
+    monkeypatch.setattr(freebusy_cache, "redis_client", FakeRedis())
+    monkeypatch.setattr(calendar, "calendar_collection", lambda name: fake)
+    return fake
+
+
+def _search_window(days: int):
+    # whole UTC days, as find_available_meeting_slots queries them
+    time_min = datetime(2026, 3, 2, tzinfo=timezone.utc)
+    time_max = datetime.combine((time_min + timedelta(days=days - 1)).date(), datetime.max.time(), tzinfo=timezone.utc)
+    return time_min, time_max
+
+
+def test_multi_day_search_is_served_from_a_warm_freebusy_cache(freebusy):
+    time_min, time_max = _search_window(3)
+
+    first = calendar.get_user_freebusy("token", "a@x", time_min, time_max)
+    batched, errors = calendar.get_users_freebusy("token", ["a@x", "b@x"], time_min, time_max)
+    assert len(freebusy.windows) == 2  # a@x alone, then only b@x
+    assert len(first) == 3 and not errors
+
+    freebusy.windows.clear()
+    assert calendar.get_user_freebusy("token", "a@x", time_min, time_max) == first
+    assert calendar.get_users_freebusy("token", ["a@x", "b@x"], time_min, time_max) == (batched, {})
+    assert freebusy.windows == []
+
+
+def test_only_the_days_missing_from_the_freebusy_cache_are_fetched(freebusy):
+    time_min, time_max = _search_window(3)
+    middle_start = time_min + timedelta(days=1)
+    calendar.get_user_freebusy("token", "a@x", middle_start, middle_start + timedelta(days=1))
+
+    freebusy.windows.clear()
+    busy = calendar.get_user_freebusy("token", "a@x", time_min, time_max)
+
+    assert [start[:10] for start, _ in freebusy.windows] == ["2026-03-02", "2026-03-04"]
+    assert len(busy) == 3
+
+
+def test_cancelled_search_leader_does_not_cancel_its_waiters(monkeypatch):
+    monkeypatch.setattr(slot_cache.async_redis, "client", None)
+    leader_started = asyncio.Event()
+
+    async def stuck_compute():
+        leader_started.set()
+        await asyncio.Event().wait()
+
+    async def compute():
+        return [Slot(60, 90)]
+
+    async def run():
+        leader = asyncio.create_task(slot_cache.cached_search("slot_search:test", stuck_compute))
+        await leader_started.wait()
+        waiter = asyncio.create_task(slot_cache.cached_search("slot_search:test", compute))
+        await asyncio.sleep(0)  # let the waiter join the leader's search
+
+        leader.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await leader
+        return await waiter
+
+    assert asyncio.run(run()) == [Slot(60, 90)]
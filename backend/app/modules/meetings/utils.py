@@ -1,44 +1,188 @@
-from typing import List, Dict, Any, Tuple
+from typing import Callable, Iterator, List, Dict, Any, Optional, Tuple
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 from dateutil import tz as dateutil_tz
 import pytz
-from datetime import datetime, timezone, timedelta
-from sqlalchemy.orm import Session
-from app.modules.users.repositories import get_user_by_email, update_user_google_tokens
-from app.integrations.google.calendar import get_user_freebusy
-from app.integrations.google.oauth import refresh_google_access_token, is_google_token_expired
+from datetime import date, datetime, timezone, timedelta
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.modules.users.repositories import update_user_google_tokens
+from app.modules.meetings.participants import ParticipantResolver
+from app.modules.meetings import slot_cache
+from app.modules.meetings.intervals import BusyInterval, Slot, busy_intervals_from_naive_utc, to_epoch_second
+from app.modules.meetings.models import MeetingStatus
+from app.modules.meetings.repositories import get_booked_intervals_for_users
+from app.modules.rooms.repositories import get_room_bookings_between
+from app.integrations.google.calendar import get_user_freebusy, get_users_freebusy
+from app.integrations.google.oauth import is_google_token_expired
+from app.integrations.google.token_refresh import refresh_access_token_once
+from app.modules.calendar_sync.services import get_mirrored_busy_events
+from app.core.config.settings import settings
+from app.core.metrics import metrics
 from functools import reduce
+from array import array
+import bisect
+import heapq
+import itertools
+import math
+import numpy as np
+import asyncio
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Local working hours searched for slots
+WORK_START_HOUR = 8
+WORK_END_HOUR = 21
 
-def get_valid_access_token(db: Session, user):
-    """Get a valid Google access token for the user, refreshing if needed."""
-    if not user.google_access_token:
-        raise ValueError(f"User {user.email} has no access token")
-    
-    if not user.google_token_expires_at:
-        raise ValueError(f"User {user.email} has no token expiry info")
-    
-    if not user.google_refresh_token:
-        raise ValueError(f"User {user.email} has no refresh token")
-    
-    if is_google_token_expired(user.google_token_expires_at):
+
+async def _fresh_access_token(email: str, access_token: Optional[str], refresh_token: Optional[str],
+                        expires_at: Optional[datetime]) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """
+    Return ``(access_token, refresh_result)`` for a token snapshot. ``refresh_result``
+    is the refresh response when this call refreshed the token and it still needs
+    persisting, otherwise ``None`` (also when a concurrent refresh was reused).
+    Does not touch the database.
+    """
+    if not access_token:
+        raise ValueError(f"User {email} has no access token")
+
+    if not expires_at:
+        raise ValueError(f"User {email} has no token expiry info")
+
+    if not refresh_token:
+        raise ValueError(f"User {email} has no refresh token")
+
+    if is_google_token_expired(expires_at):
         try:
-            result = refresh_google_access_token(user.google_refresh_token)
-            update_user_google_tokens(
-                db=db,
-                user=user,
-                access_token=result['access_token'],
-                expires_at=result['expiry']
-            )
-            return result['access_token']
+            result, refreshed_here = await refresh_access_token_once(email, refresh_token)
+            if not refreshed_here:
+                return result['access_token'], None
+            metrics.increment("google_token.refresh.inline")
+            return result['access_token'], result
         except Exception as e:
-            logger.error(f"Failed to refresh token for {user.email}: {str(e)}")
-            raise ValueError(f"Failed to refresh Google token for {user.email}")
-    
-    return user.google_access_token
+            logger.error(f"Failed to refresh token for {email}: {str(e)}")
+            raise ValueError(f"Failed to refresh Google token for {email}")
+
+    return access_token, None
+
+
+async def get_valid_access_token(db: AsyncSession, user):
+    """Get a valid Google access token for the user, refreshing if needed."""
+    access_token, refreshed = await _fresh_access_token(
+        user.email, user.google_access_token, user.google_refresh_token, user.google_token_expires_at
+    )
+
+    if refreshed:
+        await update_user_google_tokens(
+            db=db,
+            user=user,
+            access_token=refreshed['access_token'],
+            expires_at=refreshed['expiry']
+        )
+
+    return access_token
+
+
+async def _fetch_participant_freebusy(email: str, access_token: Optional[str], refresh_token: Optional[str],
+                                      expires_at: Optional[datetime], time_min: datetime,
+                                      time_max: datetime) -> Tuple[List[BusyInterval], Optional[Dict[str, Any]]]:
+    access_token, refreshed = await _fresh_access_token(email, access_token, refresh_token, expires_at)
+    logger.debug(f"Fetching freebusy for {email}")
+    # googleapiclient is blocking; each call gets a worker thread
+    busy_events = await asyncio.to_thread(
+        get_user_freebusy, access_token=access_token, email=email, time_min=time_min, time_max=time_max
+    )
+    logger.debug(f"{email}: {len(busy_events)} busy events")
+    return busy_events, refreshed
+
+
+async def fetch_participants_freebusy(db: AsyncSession, users: List[Any], time_min: datetime, time_max: datetime,
+                                      max_workers: Optional[int] = None,
+                                      deadline_seconds: Optional[float] = None,
+                                      on_busy: Optional[Callable[[str, List[BusyInterval]], bool]] = None
+                                      ) -> Dict[str, List[BusyInterval]]:
+    """
+    Fetch every user's free/busy with their own token, concurrently.
+
+    At most ``max_workers`` (``FREEBUSY_MAX_CONCURRENCY``) token refresh +
+    FreeBusy calls run at once (started in ``users`` order), and the whole stage
+    gives up after ``deadline_seconds`` (``FREEBUSY_DEADLINE_SECONDS``). Failures
+    are collected per participant and raised together as one ``ValueError``.
+    Refreshed tokens are persisted one by one as calls finish; an
+    ``AsyncSession`` can't be shared between concurrent tasks.
+
+    ``on_busy(email, busy_events)`` sees each result as it arrives. When it
+    returns False the fetches still running are cancelled and the results so far
+    are returned without raising.
+    """
+    if not users:
+        return {}
+
+    max_workers = max_workers or settings.FREEBUSY_MAX_CONCURRENCY
+    deadline_seconds = deadline_seconds or settings.FREEBUSY_DEADLINE_SECONDS
+    semaphore = asyncio.Semaphore(max_workers)
+
+    async def fetch(user):
+        async with semaphore:
+            return await _fetch_participant_freebusy(
+                user.email,
+                user.google_access_token,
+                user.google_refresh_token,
+                user.google_token_expires_at,
+                time_min,
+                time_max,
+            )
+
+    tasks = {asyncio.create_task(fetch(user)): user for user in users}
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + deadline_seconds
+
+    busy_by_email: Dict[str, List[BusyInterval]] = {}
+    errors: Dict[str, str] = {}
+    stopped = False
+
+    not_done = set(tasks)
+    while not_done and not stopped:
+        done, not_done = await asyncio.wait(
+            not_done, timeout=max(deadline - loop.time(), 0), return_when=asyncio.FIRST_COMPLETED
+        )
+        if not done:
+            break  # deadline
+
+        for task in done:
+            user = tasks[task]
+            try:
+                busy_events, refreshed = task.result()
+            except Exception as e:
+                errors[user.email] = str(e)
+                continue
+
+            if refreshed:
+                await update_user_google_tokens(
+                    db=db,
+                    user=user,
+                    access_token=refreshed['access_token'],
+                    expires_at=refreshed['expiry']
+                )
+            busy_by_email[user.email] = busy_events
+            if on_busy is not None and not stopped and not on_busy(user.email, busy_events):
+                stopped = True
+
+    for task in not_done:
+        task.cancel()
+    if stopped:
+        logger.debug(f"Stopped fetching free/busy early, {len(not_done)} calls cancelled")
+        return busy_by_email
+
+    for task in not_done:
+        errors[tasks[task].email] = f"timed out after {deadline_seconds}s"
+
+    if errors:
+        for email, error in errors.items():
+            logger.error(f"Failed to fetch calendar data for {email}: {error}")
+        details = "; ".join(f"{email}: {error}" for email, error in sorted(errors.items()))
+        raise ValueError(f"Failed to fetch calendar data for {details}")
+
+    return busy_by_email
 
 
 # Core algorithm for common free slots
@@ -49,50 +193,57 @@ except Exception:
     ZoneInfo = None
 
 
-def compute_common_meeting_slots(
-    people_events: List[List[Dict[str, Any]]],
-    duration_minutes: int,
-    target_date: datetime,
-    work_start_hour: int = 8,
-    work_end_hour: int = 21,
-    step_minutes: int | None = None,
-    target_tz_name: str = "Asia/Tehran",
-) -> List[Dict[str, str]]:
+def _resolve_tz(name: str):
+    if ZoneInfo:
+        try:
+            return ZoneInfo(name)
+        except Exception:
+            pass
+    tz = dateutil_tz.gettz(name)
+    if tz:
+        return tz
+    try:
+        return pytz.timezone(name)
+    except Exception:
+        return timezone.utc
 
-    if duration_minutes <= 0:
-        return []
 
-    if step_minutes is None or step_minutes <= 0:
-        step_minutes = duration_minutes
+def _parse_iso_to_utc(dt_str: str) -> datetime:
+    if dt_str.endswith("Z"):
+        dt = datetime.fromisoformat(dt_str[:-1] + "+00:00")
+    else:
+        dt = datetime.fromisoformat(dt_str)
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
 
-    meeting_delta = timedelta(minutes=duration_minutes)
-    step_delta = timedelta(minutes=step_minutes)
 
-    # -------- timezone resolver --------
-    def _resolve_tz(name: str):
-        if ZoneInfo:
-            try:
-                return ZoneInfo(name)
-            except Exception:
-                pass
-        tz = dateutil_tz.gettz(name)
-        if tz:
-            return tz
-        try:
-            return pytz.timezone(name)
-        except Exception:
-            return timezone.utc
+def _epoch_bounds(ev: Any) -> Tuple[float, float]:
+    """
+    ``(start, end)`` epoch seconds of a busy interval. The pipeline passes
+    ``(start, end)`` epoch-second pairs; FreeBusy-style dicts of ISO strings are
+    still accepted (and parsed here).
+    """
+    if isinstance(ev, dict):
+        return _parse_iso_to_utc(ev["start"]).timestamp(), _parse_iso_to_utc(ev["end"]).timestamp()
+    start, end = ev
+    return start, end
 
-    target_tz = _resolve_tz(target_tz_name)
 
-    # -------- normalize target date --------
+def _busy_bounds(ev: Any) -> Tuple[datetime, datetime]:
+    """Like ``_epoch_bounds``, as UTC datetimes."""
+    if isinstance(ev, dict):
+        return _parse_iso_to_utc(ev["start"]), _parse_iso_to_utc(ev["end"])
+    return datetime.fromtimestamp(ev[0], timezone.utc), datetime.fromtimestamp(ev[1], timezone.utc)
+
+
+def _working_window_utc(target_date: datetime, work_start_hour: int, work_end_hour: int, target_tz) -> Tuple[datetime, datetime]:
+    """Return the (start, end) of the local working day of ``target_date`` in UTC."""
     if target_date.tzinfo is None:
         target_date = target_date.replace(tzinfo=timezone.utc)
 
-    target_local = target_date.astimezone(target_tz)
-    target_day = target_local.date()
+    target_day = target_date.astimezone(target_tz).date()
 
-    # -------- working hours (LOCAL -> UTC) --------
     def _make_local_dt(hour: int):
         naive = datetime(
             target_day.year,
@@ -104,26 +255,23 @@ def compute_common_meeting_slots(
             return target_tz.localize(naive)
         return naive.replace(tzinfo=target_tz)
 
-    work_start_utc = _make_local_dt(work_start_hour).astimezone(timezone.utc)
-    work_end_utc = _make_local_dt(work_end_hour).astimezone(timezone.utc)
+    return (
+        _make_local_dt(work_start_hour).astimezone(timezone.utc),
+        _make_local_dt(work_end_hour).astimezone(timezone.utc),
+    )
 
-    # -------- parse input events --------
-    def _parse_iso_to_utc(dt_str: str) -> datetime:
-        if dt_str.endswith("Z"):
-            dt = datetime.fromisoformat(dt_str[:-1] + "+00:00")
-        else:
-            dt = datetime.fromisoformat(dt_str)
-        if dt.tzinfo is None:
-            dt = dt.replace(tzinfo=timezone.utc)
-        return dt.astimezone(timezone.utc)
 
+def _clipped_busy_intervals(
+    people_events: List[List[Dict[str, Any]]],
+    work_start_utc: datetime,
+    work_end_utc: datetime,
+) -> List[Tuple[datetime, datetime]]:
     busy_intervals: List[Tuple[datetime, datetime]] = []
 
     for events in people_events:
         for ev in (events or []):
             try:
-                start = _parse_iso_to_utc(ev["start"])
-                end = _parse_iso_to_utc(ev["end"])
+                start, end = _busy_bounds(ev)
             except Exception:
                 continue
 
@@ -136,35 +284,121 @@ def compute_common_meeting_slots(
             if end > start:
                 busy_intervals.append((start, end))
 
-    # -------- merge busy intervals --------
+    return busy_intervals
+
+
+def _free_windows(busy_intervals: List[Tuple[datetime, datetime]], work_start_utc: datetime,
+                  work_end_utc: datetime) -> List[Tuple[datetime, datetime]]:
+    """Gaps between the merged ``busy_intervals`` inside the working window."""
     if not busy_intervals:
-        free_windows = [(work_start_utc, work_end_utc)]
-    else:
-        busy_intervals.sort(key=lambda x: x[0])
-        merged = [busy_intervals[0]]
+        return [(work_start_utc, work_end_utc)]
 
-        for s, e in busy_intervals[1:]:
-            last_s, last_e = merged[-1]
-            if s <= last_e:
-                merged[-1] = (last_s, max(last_e, e))
-            else:
-                merged.append((s, e))
+    busy_intervals = sorted(busy_intervals, key=lambda x: x[0])
+    merged = [busy_intervals[0]]
+
+    for s, e in busy_intervals[1:]:
+        last_s, last_e = merged[-1]
+        if s <= last_e:
+            merged[-1] = (last_s, max(last_e, e))
+        else:
+            merged.append((s, e))
+
+    free_windows = []
+    prev_end = work_start_utc
+
+    for s, e in merged:
+        if s > prev_end:
+            free_windows.append((prev_end, s))
+        prev_end = max(prev_end, e)
 
-        free_windows = []
-        prev_end = work_start_utc
+    if prev_end < work_end_utc:
+        free_windows.append((prev_end, work_end_utc))
 
-        for s, e in merged:
-            if s > prev_end:
-                free_windows.append((prev_end, s))
-            prev_end = max(prev_end, e)
+    return free_windows
 
-        if prev_end < work_end_utc:
-            free_windows.append((prev_end, work_end_utc))
 
-    # -------- build slots (UTC → Tehran) --------
-    slots: List[Dict[str, str]] = []
+def _room_constrained_starts(
+    busy_intervals: List[Tuple[datetime, datetime]],
+    room_events: List[List[Dict[str, Any]]],
+    duration_minutes: int,
+    step_minutes: int,
+    work_start_utc: datetime,
+    work_end_utc: datetime,
+) -> List[int]:
+    """
+    Start minutes (from ``work_start_utc``) of the slots where everybody is free
+    and at least one room is free for the whole slot.
+
+    Each room's free windows (people + that room busy) give a run of valid start
+    minutes; the runs of all rooms are merged and slots step from the beginning
+    of every merged run, exactly like the bitmap engine does.
+    """
+    runs: List[Tuple[int, int]] = []
+    for events in room_events:
+        room_busy = busy_intervals + _clipped_busy_intervals([events], work_start_utc, work_end_utc)
+        for start_win, end_win in _free_windows(room_busy, work_start_utc, work_end_utc):
+            first = math.ceil((start_win - work_start_utc).total_seconds() / 60)
+            last = math.floor((end_win - work_start_utc).total_seconds() / 60) - duration_minutes
+            if last >= first:
+                runs.append((first, last))
+
+    runs.sort()
+    merged: List[List[int]] = []
+    for first, last in runs:
+        if merged and first <= merged[-1][1] + 1:
+            merged[-1][1] = max(merged[-1][1], last)
+        else:
+            merged.append([first, last])
+
+    return [minute for first, last in merged for minute in range(first, last + 1, step_minutes)]
+
+
+def iter_common_meeting_slots(
+    people_events: List[List[Dict[str, Any]]],
+    duration_minutes: int,
+    target_date: datetime,
+    work_start_hour: int = 8,
+    work_end_hour: int = 21,
+    step_minutes: int | None = None,
+    target_tz_name: str = "Asia/Tehran",
+    room_events: Optional[List[List[Dict[str, Any]]]] = None,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Every slot of ``duration_minutes`` on the local working day of ``target_date``
+    when nobody in ``people_events`` is busy, as ``(start, end)`` UTC datetimes in
+    time order. Slots step by ``step_minutes`` (default: the duration) from the
+    first whole minute of every free window.
+
+    With ``room_events`` (each entry is one room's bookings) a slot also needs at
+    least one of those rooms free for its whole length.
+    """
+    if duration_minutes <= 0:
+        return
+
+    if step_minutes is None or step_minutes <= 0:
+        step_minutes = duration_minutes
 
-    for start_win, end_win in free_windows:
+    meeting_delta = timedelta(minutes=duration_minutes)
+    step_delta = timedelta(minutes=step_minutes)
+
+    target_tz = _resolve_tz(target_tz_name)
+
+    # -------- working hours (LOCAL -> UTC) --------
+    work_start_utc, work_end_utc = _working_window_utc(target_date, work_start_hour, work_end_hour, target_tz)
+
+    # -------- parse input events --------
+    busy_intervals = _clipped_busy_intervals(people_events, work_start_utc, work_end_utc)
+
+    if room_events is not None:
+        for minute in _room_constrained_starts(
+            busy_intervals, room_events, duration_minutes, step_minutes, work_start_utc, work_end_utc
+        ):
+            current = work_start_utc + timedelta(minutes=minute)
+            yield current, current + meeting_delta
+        return
+
+    # -------- merge busy intervals --------
+    for start_win, end_win in _free_windows(busy_intervals, work_start_utc, work_end_utc):
         current = start_win
 
         # round up to next minute
@@ -172,73 +406,890 @@ def compute_common_meeting_slots(
             current = current.replace(second=0, microsecond=0) + timedelta(minutes=1)
 
         while current + meeting_delta <= end_win:
-            start_local = current.astimezone(target_tz)
-            end_local = (current + meeting_delta).astimezone(target_tz)
+            yield current, current + meeting_delta
+            current += step_delta
 
-            slots.append({
-                "start": start_local.isoformat(),
-                "end": end_local.isoformat(),
-            })
 
-            current += step_delta
+def _iso_to_epoch_seconds(value: Any) -> float:
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return _parse_iso_to_utc(value).timestamp()
+    except Exception:
+        return float("nan")
 
-    return slots
 
+def _utc_offset_seconds(suffix: str) -> int:
+    if len(suffix) != 6 or suffix[0] not in "+-" or suffix[3] != ":":
+        raise ValueError(f"Not a UTC offset: {suffix!r}")
+    seconds = int(suffix[1:3]) * 3600 + int(suffix[4:6]) * 60
+    return -seconds if suffix[0] == "-" else seconds
 
 
-def find_available_meeting_slots(db: Session, participants: List[str], meeting_date: datetime, meeting_length: int):
+def _iso_strings_to_epoch_seconds(values: List[Any]) -> "np.ndarray":
+    """
+    Parse ISO datetimes to epoch seconds (NaN for unparseable values). Values
+    that already are epoch seconds are taken as they are.
 
-    logger.info(f"Finding available slots for {len(participants)} people on {meeting_date.date()}")
-    logger.info(f"Meeting length: {meeting_length} minutes")
+    Values shaped like ``YYYY-MM-DDTHH:MM:SS+HH:MM`` are parsed in bulk by
+    numpy; anything else goes through ``datetime.fromisoformat`` one by one.
+    """
+    if not values:
+        return np.empty(0, dtype=np.float64)
 
-    if meeting_date.tzinfo is None:
-        meeting_date = meeting_date.replace(tzinfo=timezone.utc)
+    try:
+        arr = np.array(values)
+        if arr.dtype.kind in "iuf":
+            return arr.astype(np.float64)
+        if arr.dtype != np.dtype("<U25") or not (np.strings.str_len(arr) == 25).all():
+            raise ValueError("mixed ISO formats")
+        parts = arr.view([("wall", "<U19"), ("offset", "<U6")])
+        wall = parts["wall"].astype("datetime64[s]").astype(np.int64)
+        suffixes, inverse = np.unique(parts["offset"], return_inverse=True)
+        offsets = np.array([_utc_offset_seconds(str(sfx)) for sfx in suffixes], dtype=np.int64)
+        return (wall - offsets[inverse.reshape(-1)]).astype(np.float64)
+    except (ValueError, TypeError):
+        return np.array([_iso_to_epoch_seconds(v) for v in values], dtype=np.float64)
 
-    time_min = meeting_date.replace(hour=0, minute=0, second=0, microsecond=0)
-    time_max = meeting_date.replace(hour=23, minute=59, second=59, microsecond=999999)
 
-    people_events: List[List[Dict]] = []
+def _paint_busy_minutes(rows: List[List[Dict[str, Any]]], origin: float, day_minutes: int,
+                        combine: bool = False) -> "np.ndarray":
+    """
+    ``(len(rows), day_minutes)`` booleans; minute ``m`` of row ``r`` is busy if
+    any event of ``rows[r]`` covers part of it (difference array -> cumsum).
+    With ``combine`` all rows are painted onto a single row.
+    """
+    bounds: List[Any] = []
+    row_ids: List[int] = []
+    for row, events in enumerate(rows):
+        for ev in (events or []):
+            try:
+                start, end = (ev["start"], ev["end"]) if isinstance(ev, dict) else ev
+            except Exception:
+                continue
+            bounds.append(start)
+            bounds.append(end)
+            row_ids.append(0 if combine else row)
 
-    for email in participants:
-        user = get_user_by_email(db, email)
-        if not user:
-            raise ValueError(f"User with email {email} not found")
-        if not user.google_calendar_connected:
-            raise ValueError(f"User {email} has not connected Google Calendar")
+    occupancy = np.zeros((1 if combine else len(rows), day_minutes + 1), dtype=np.int32)
+    if bounds:
+        offsets = (_iso_strings_to_epoch_seconds(bounds).reshape(-1, 2) - origin) / 60.0
+        row_ids = np.array(row_ids, dtype=np.int64)
+        keep = offsets[:, 1] > offsets[:, 0]  # also drops NaN (unparseable) rows
+        offsets, row_ids = np.clip(offsets[keep], 0, day_minutes), row_ids[keep]
+        keep = offsets[:, 1] > offsets[:, 0]
+        offsets, row_ids = offsets[keep], row_ids[keep]
+        np.add.at(occupancy, (row_ids, np.floor(offsets[:, 0]).astype(np.int64)), 1)
+        np.add.at(occupancy, (row_ids, np.ceil(offsets[:, 1]).astype(np.int64)), -1)
+    return np.cumsum(occupancy[:, :-1], axis=1) > 0
 
-        access_token = get_valid_access_token(db, user)
-        try:
-            logger.debug(f"Fetching freebusy for {email}")
-            busy_events = get_user_freebusy(access_token=access_token, email=email, time_min=time_min, time_max=time_max)
-            logger.debug(f"{email}: {len(busy_events)} busy events")
-            people_events.append(busy_events)
-        except Exception as e:
-            logger.error(f"Failed to fetch calendar data for {email}: {str(e)}")
-            raise ValueError(f"Failed to fetch calendar data for {email}: {str(e)}")
 
+def _valid_start_minutes(busy: "np.ndarray", duration_minutes: int) -> "np.ndarray":
+    """Along the last axis: True where ``[m, m + duration)`` holds no busy minute."""
+    zeros = np.zeros(busy.shape[:-1] + (1,), dtype=np.int32)
+    busy_prefix = np.concatenate((zeros, np.cumsum(busy, axis=-1, dtype=np.int32)), axis=-1)
+    return (busy_prefix[..., duration_minutes:] - busy_prefix[..., :-duration_minutes]) == 0
+
+
+def _bitmap_slot_starts(
+    people_events: List[List[Dict[str, Any]]],
+    duration_minutes: int,
+    target_date: datetime,
+    work_start_hour: int,
+    work_end_hour: int,
+    step_minutes: int | None,
+    target_tz,
+    room_events: Optional[List[List[Dict[str, Any]]]],
+):
+    """``(start minutes, work_start_utc, work_end_utc)`` of the bitmap engine's slots, or None if there are none."""
+    if duration_minutes <= 0:
+        return None
+
+    if step_minutes is None or step_minutes <= 0:
+        step_minutes = duration_minutes
+
+    work_start_utc, work_end_utc = _working_window_utc(target_date, work_start_hour, work_end_hour, target_tz)
+
+    day_minutes = int((work_end_utc - work_start_utc).total_seconds() // 60)
+    if day_minutes < duration_minutes:
+        return None
+
+    origin = work_start_utc.timestamp()
+    busy = _paint_busy_minutes(people_events, origin, day_minutes, combine=True)[0]
+
+    if room_events is None:
+        valid = _valid_start_minutes(busy, duration_minutes)
+    else:
+        # one row per room: people busy OR that room busy; a start is valid if any room works
+        room_busy = _paint_busy_minutes(room_events, origin, day_minutes) | busy
+        valid = _valid_start_minutes(room_busy, duration_minutes).any(axis=0)
+
+    if not valid.any():
+        return None
+
+    # Slots step from the start of each free window, so keep the starts whose
+    # distance to the beginning of their run of valid starts is a multiple of step.
+    idx = np.arange(valid.size)
+    run_begins = valid & ~np.concatenate(([False], valid[:-1]))
+    run_start = np.maximum.accumulate(np.where(run_begins, idx, 0))
+    return idx[valid & ((idx - run_start) % step_minutes == 0)], work_start_utc, work_end_utc
 
-    available_slots = compute_common_meeting_slots(
-        people_events=people_events,
-        duration_minutes=meeting_length,
-        target_date=meeting_date,
-        work_start_hour=8,
-        work_end_hour=21
+
+def iter_common_meeting_slots_bitmap(
+    people_events: List[List[Dict[str, Any]]],
+    duration_minutes: int,
+    target_date: datetime,
+    work_start_hour: int = 8,
+    work_end_hour: int = 21,
+    step_minutes: int | None = None,
+    target_tz_name: str = "Asia/Tehran",
+    room_events: Optional[List[List[Dict[str, Any]]]] = None,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Same contract and output as ``iter_common_meeting_slots``.
+
+    Every busy interval is painted onto a minute-resolution occupancy bitmap of
+    the working day (a minute is busy if any part of it is busy), and all valid
+    slot starts are found with a single cumulative-sum pass over that bitmap.
+    """
+    found = _bitmap_slot_starts(
+        people_events, duration_minutes, target_date, work_start_hour, work_end_hour, step_minutes,
+        _resolve_tz(target_tz_name), room_events
     )
+    if found is None:
+        return
+    starts, work_start_utc, _ = found
+    meeting_delta = timedelta(minutes=duration_minutes)
+    for minute in starts.tolist():
+        current = work_start_utc + timedelta(minutes=minute)
+        yield current, current + meeting_delta
 
 
-    result = []
-    for slot in available_slots:
-        try:
-            start_dt = datetime.fromisoformat(slot['start'])
-            end_dt = datetime.fromisoformat(slot['end'])
-            result.append({'start': start_dt, 'end': end_dt})
-        except Exception:
-            logger.debug("Skipping malformed slot: %r", slot)
+# Slot engines selectable with settings.SLOT_ENGINE
+SLOT_GENERATORS = {
+    "interval": iter_common_meeting_slots,
+    "bitmap": iter_common_meeting_slots_bitmap,
+}
+
+
+def local_day_anchor(day: date, target_tz) -> datetime:
+    """Noon of ``day`` in ``target_tz``; lands on that local day whatever the UTC offset."""
+    naive = datetime(day.year, day.month, day.day, 12)
+    if hasattr(target_tz, "localize"):  # pytz
+        return target_tz.localize(naive)
+    return naive.replace(tzinfo=target_tz)
 
 
+def search_days(first: date, last: Optional[date] = None) -> List[date]:
+    """The days searched for ``first..last``: just ``first`` alone, else the range without WEEKEND_DAYS."""
+    if last is None or last <= first:
+        return [first]
+    days = (first + timedelta(days=i) for i in range((last - first).days + 1))
+    return [day for day in days if day.weekday() not in settings.WEEKEND_DAYS]
+
+
+class _BusySlicer:
+    """
+    One person's (or room's) busy events for a whole search range, parsed and
+    sorted once, handing each day the events that overlap its working window.
+    Days must be asked for in ascending order.
+    """
+
+    def __init__(self, events: List[Any]):
+        parsed = []
+        for event in events:
+            try:
+                parsed.append((*_epoch_bounds(event), event))
+            except Exception:
+                continue
+        parsed.sort(key=lambda item: item[0])
+        self._events = parsed
+        self._starts = [start for start, _, _ in parsed]
+        self._first = 0
+
+    def slice(self, window_start: datetime, window_end: datetime) -> List[Any]:
+        window_start, window_end = window_start.timestamp(), window_end.timestamp()
+        # leading events over before this window are over before every later one too
+        while self._first < len(self._events) and self._events[self._first][1] <= window_start:
+            self._first += 1
+        stop = bisect.bisect_left(self._starts, window_end, lo=self._first)
+        return [event for _, end, event in self._events[self._first:stop] if end > window_start]
+
+
+def iter_slots_for_days(
+    people_events: List[List[Any]],
+    duration_minutes: int,
+    days: List[date],
+    work_start_hour: int,
+    work_end_hour: int,
+    target_tz_name: str,
+    room_events: Optional[List[List[Any]]] = None,
+    generator=None,
+) -> Iterator[Tuple[datetime, datetime]]:
+    """
+    Run a ``SLOT_GENERATORS`` engine over several days from busy data fetched once
+    for the whole range: every day gets only the events overlapping its working
+    window. Yields UTC ``(start, end)`` slots in time order, formatting nothing.
+    """
+    iter_slots = generator or get_slot_generator()
+    target_tz = _resolve_tz(target_tz_name)
+    people = [_BusySlicer(events) for events in people_events]
+    rooms = None if room_events is None else [_BusySlicer(events) for events in room_events]
+
+    for day in days:
+        anchor = local_day_anchor(day, target_tz)
+        window_start, window_end = _working_window_utc(anchor, work_start_hour, work_end_hour, target_tz)
+        generator_kwargs = {}
+        if rooms is not None:
+            generator_kwargs["room_events"] = [room.slice(window_start, window_end) for room in rooms]
+
+        yield from iter_slots(
+            people_events=[person.slice(window_start, window_end) for person in people],
+            duration_minutes=duration_minutes,
+            target_date=anchor,
+            work_start_hour=work_start_hour,
+            work_end_hour=work_end_hour,
+            target_tz_name=target_tz_name,
+            **generator_kwargs
+        )
+
+
+class FreeSet:
+    """
+    The time still free for everybody intersected in so far, as two parallel
+    sorted ``array('q')`` of epoch seconds (window starts and ends).
+
+    It starts as the working windows searched and is narrowed one participant
+    at a time: ``intersect`` is a linear merge of the free windows with that
+    participant's sorted busy intervals, dropping windows shorter than
+    ``min_seconds`` on the way. The set only shrinks, so once it is empty no
+    slot is possible and the calendars not yet seen need not be fetched.
+    Intersecting the busiest participants first empties it soonest.
+    """
+
+    __slots__ = ("min_seconds", "_starts", "_ends")
+
+    def __init__(self, windows: List[Tuple[datetime, datetime]], min_seconds: int = 0):
+        """``windows``: non-overlapping UTC ``(start, end)`` pairs."""
+        self.min_seconds = max(min_seconds, 1)
+        self._starts = array("q")
+        self._ends = array("q")
+        for start, end in sorted(windows):
+            start_second, end_second = math.ceil(start.timestamp()), math.floor(end.timestamp())
+            if end_second - start_second >= self.min_seconds:
+                self._starts.append(start_second)
+                self._ends.append(end_second)
+
+    @classmethod
+    def for_days(cls, days: List[date], work_start_hour: int, work_end_hour: int, target_tz_name: str,
+                 min_seconds: int = 0) -> "FreeSet":
+        """The working windows of ``days`` (local ``work_start_hour..work_end_hour``)."""
+        target_tz = _resolve_tz(target_tz_name)
+        return cls([
+            _working_window_utc(local_day_anchor(day, target_tz), work_start_hour, work_end_hour, target_tz)
+            for day in days
+        ], min_seconds)
+
+    @staticmethod
+    def busy_intervals(events: List[Any]) -> List[BusyInterval]:
+        """One person's busy intervals, sorted and merged."""
+        parsed: List[BusyInterval] = []
+        for ev in (events or []):
+            try:
+                start, end = _epoch_bounds(ev)
+            except Exception:
+                continue
+            if end > start:
+                # widen to whole seconds; slots start and end on whole minutes anyway
+                parsed.append((math.floor(start), math.ceil(end)))
+        parsed.sort()
+
+        merged: List[Tuple[int, int]] = []
+        for start, end in parsed:
+            if merged and start <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+            else:
+                merged.append((start, end))
+        return merged
+
+    def intersect(self, busy: List[BusyInterval]) -> bool:
+        """Remove ``busy`` (as from ``busy_intervals``) from the free time; False once nothing is left."""
+        starts, ends = array("q"), array("q")
+        min_seconds = self.min_seconds
+        first = 0
+        for start, end in zip(self._starts, self._ends):
+            while first < len(busy) and busy[first][1] <= start:
+                first += 1
+            cursor = start
+            index = first
+            while index < len(busy) and busy[index][0] < end:
+                busy_start, busy_end = busy[index]
+                if busy_start - cursor >= min_seconds:
+                    starts.append(cursor)
+                    ends.append(busy_start)
+                cursor = max(cursor, busy_end)
+                if busy_end >= end:
+                    break  # this interval may reach into the next window too
+                index += 1
+            if end - cursor >= min_seconds:
+                starts.append(cursor)
+                ends.append(end)
+            first = index
+        self._starts, self._ends = starts, ends
+        return bool(starts)
+
+    def __bool__(self) -> bool:
+        return bool(self._starts)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def windows(self) -> List[Tuple[datetime, datetime]]:
+        return [
+            (datetime.fromtimestamp(start, timezone.utc), datetime.fromtimestamp(end, timezone.utc))
+            for start, end in zip(self._starts, self._ends)
+        ]
+
+    def iter_slots(self, duration_minutes: int, step_minutes: int | None = None) -> Iterator[Tuple[int, int]]:
+        """``(start, end)`` epoch seconds of the slots stepped from the first whole minute of every window, like the interval engine."""
+        if duration_minutes <= 0:
+            return
+        if step_minutes is None or step_minutes <= 0:
+            step_minutes = duration_minutes
+        duration, step = duration_minutes * 60, step_minutes * 60
+        for start, end in zip(self._starts, self._ends):
+            current = -(-start // 60) * 60
+            while current + duration <= end:
+                yield current, current + duration
+                current += step
+
+
+def _merged_busy(events: List[Dict[str, Any]], work_start_utc: datetime, work_end_utc: datetime) -> List[Tuple[datetime, datetime]]:
+    """One person's busy time inside the working window as sorted, non-overlapping intervals."""
+    merged: List[Tuple[datetime, datetime]] = []
+    for start, end in sorted(_clipped_busy_intervals([events], work_start_utc, work_end_utc)):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def _quorum_segments(
+    people_events: List[List[Dict[str, Any]]],
+    work_start_utc: datetime,
+    work_end_utc: datetime,
+) -> List[Tuple[datetime, datetime, frozenset]]:
+    """
+    Sweep line over everybody's busy endpoints: the working window cut into
+    segments ``(start, end, busy)`` over which the set of busy people is constant.
+    """
+    endpoints: List[Tuple[datetime, int, int]] = []
+    for person, events in enumerate(people_events):
+        for start, end in _merged_busy(events, work_start_utc, work_end_utc):
+            endpoints.append((start, 1, person))
+            endpoints.append((end, -1, person))
+    endpoints.sort(key=lambda point: point[0])
+
+    segments: List[Tuple[datetime, datetime, frozenset]] = []
+    busy: set = set()
+    cursor = work_start_utc
+    i = 0
+    while i < len(endpoints):
+        moment = endpoints[i][0]
+        if moment > cursor:
+            segments.append((cursor, moment, frozenset(busy)))
+            cursor = moment
+        # apply every change at this instant before opening the next segment
+        while i < len(endpoints) and endpoints[i][0] == moment:
+            _, change, person = endpoints[i]
+            if change > 0:
+                busy.add(person)
+            else:
+                busy.discard(person)
+            i += 1
+    if cursor < work_end_utc:
+        segments.append((cursor, work_end_utc, frozenset(busy)))
+    return segments
+
+
+def compute_quorum_windows(
+    people_events: List[List[Dict[str, Any]]],
+    required_count: int,
+    min_free: int,
+    work_start_utc: datetime,
+    work_end_utc: datetime,
+    room_events: Optional[List[List[Dict[str, Any]]]] = None,
+) -> List[Tuple[datetime, datetime, frozenset]]:
+    """
+    Every maximal window where the first ``required_count`` people and at least
+    ``min_free`` people overall are free, with the (constant) set of people busy in it.
+    One sweep over the sorted endpoints - no subsets of people are ever tried.
+
+    With ``room_events`` the rooms join the sweep as indexes after the people,
+    a window also needs one of them free, and its set holds the busy rooms too.
+    """
+    total = len(people_events)
+    room_count = None if room_events is None else len(room_events)
+    windows: List[Tuple[datetime, datetime, frozenset]] = []
+    for start, end, busy in _quorum_segments(people_events + (room_events or []), work_start_utc, work_end_utc):
+        busy_people = sum(1 for index in busy if index < total)
+        if total - busy_people < min_free or any(index < required_count for index in busy):
+            continue
+        if room_count is not None and len(busy) - busy_people >= room_count:
+            continue
+        if windows and windows[-1][1] == start and windows[-1][2] == busy:
+            windows[-1] = (windows[-1][0], end, busy)
+        else:
+            windows.append((start, end, busy))
+    return windows
+
+
+def iter_quorum_slots(
+    people_events: List[List[Dict[str, Any]]],
+    required_count: int,
+    min_free: int,
+    duration_minutes: int,
+    target_date: datetime,
+    work_start_hour: int = 8,
+    work_end_hour: int = 21,
+    step_minutes: int | None = None,
+    target_tz_name: str = "Asia/Tehran",
+    room_events: Optional[List[List[Dict[str, Any]]]] = None,
+) -> Iterator[Tuple[datetime, datetime, frozenset]]:
+    """
+    Quorum mode of the slot engine. ``people_events`` lists the required people
+    first (``required_count`` of them), then the optional ones. Yields UTC
+    ``(start, end, missing)`` for every slot where all required people and at
+    least ``min_free`` people in total are free throughout; ``missing`` holds the
+    indexes of the people who are not.
+
+    With ``room_events`` (each entry is one room's bookings) a slot also needs
+    at least one of those rooms free for its whole length, like in the all-free
+    engines; the rooms busy during it are in ``missing`` as
+    ``len(people_events) + room_index``.
+
+    Slots step from the start of every run of qualifying windows, as in the
+    all-free engines.
+    """
+    if duration_minutes <= 0:
+        return
+    if step_minutes is None or step_minutes <= 0:
+        step_minutes = duration_minutes
+
+    meeting_delta = timedelta(minutes=duration_minutes)
+    step_delta = timedelta(minutes=step_minutes)
+    target_tz = _resolve_tz(target_tz_name)
+    work_start_utc, work_end_utc = _working_window_utc(target_date, work_start_hour, work_end_hour, target_tz)
+
+    total = len(people_events)
+    room_count = None if room_events is None else len(room_events)
+    windows = compute_quorum_windows(people_events, required_count, min_free, work_start_utc, work_end_utc, room_events)
+
+    # runs of touching windows; a slot may span several windows of one run
+    runs: List[List[Tuple[datetime, datetime, frozenset]]] = []
+    for window in windows:
+        if runs and runs[-1][-1][1] == window[0]:
+            runs[-1].append(window)
+        else:
+            runs.append([window])
+
+    for run in runs:
+        current = run[0][0]
+        if current.second or current.microsecond:
+            current = current.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        first = 0
+        while current + meeting_delta <= run[-1][1]:
+            end = current + meeting_delta
+            while run[first][1] <= current:
+                first += 1
+            missing = set()
+            index = first
+            while index < len(run) and run[index][0] < end:
+                missing |= run[index][2]
+                index += 1
+            busy_people = sum(1 for index in missing if index < total)
+            if total - busy_people >= min_free and (room_count is None or len(missing) - busy_people < room_count):
+                yield current, end, frozenset(missing)
+            current += step_delta
+
+
+class _DayContext:
+    """What slot scorers may look at for one day: the merged busy time and local noon, in UTC."""
+
+    def __init__(self, busy_intervals: List[Tuple[datetime, datetime]], noon_utc: datetime):
+        self.busy_ends = sorted(end for _, end in busy_intervals)
+        self.busy_starts = sorted(start for start, _ in busy_intervals)
+        self.noon_utc = noon_utc
+
+
+# Adjacent means another meeting ends or starts within this gap of the slot
+ADJACENT_GAP = timedelta(minutes=15)
+
+
+def _score_earliest(start: datetime, end: datetime, day: _DayContext) -> float:
+    return start.timestamp()
+
+
+def _score_midday(start: datetime, end: datetime, day: _DayContext) -> float:
+    middle = start + (end - start) / 2
+    return abs((middle - day.noon_utc).total_seconds())
+
+
+def _score_fewest_adjacent(start: datetime, end: datetime, day: _DayContext) -> float:
+    ending_before = (
+        bisect.bisect_right(day.busy_ends, start) - bisect.bisect_left(day.busy_ends, start - ADJACENT_GAP)
+    )
+    starting_after = (
+        bisect.bisect_right(day.busy_starts, end + ADJACENT_GAP) - bisect.bisect_left(day.busy_starts, end)
+    )
+    return ending_before + starting_after
+
+
+# Lower is better; ties go to the earlier slot
+SLOT_SCORERS: Dict[str, Callable[[datetime, datetime, _DayContext], float]] = {
+    "earliest": _score_earliest,
+    "midday": _score_midday,
+    "fewest_adjacent": _score_fewest_adjacent,
+}
+
+
+def top_k_slots(
+    people_events: List[List[Dict[str, Any]]],
+    duration_minutes: int,
+    days: List[date],
+    work_start_hour: int,
+    work_end_hour: int,
+    target_tz_name: str,
+    k: int,
+    score: str = "earliest",
+    room_events: Optional[List[List[Dict[str, Any]]]] = None,
+    generator=None,
+) -> List[Tuple[datetime, datetime]]:
+    """
+    The ``k`` best slots over ``days`` by ``SLOT_SCORERS[score]``, as UTC
+    ``(start, end)`` pairs in time order. Slots come lazily from the engine's
+    generator and only a ``k``-sized heap is kept; "earliest" stops after ``k``.
+    """
+    try:
+        scorer = SLOT_SCORERS[score]
+    except KeyError:
+        raise ValueError(f"Unknown slot score {score!r}. Available: {', '.join(SLOT_SCORERS)}")
+    if k <= 0:
+        return []
+
+    iterate = generator or get_slot_generator()
+    target_tz = _resolve_tz(target_tz_name)
+    people = [_BusySlicer(events) for events in people_events]
+    rooms = None if room_events is None else [_BusySlicer(events) for events in room_events]
+
+    def candidates():
+        for day in days:
+            anchor = local_day_anchor(day, target_tz)
+            window_start, window_end = _working_window_utc(anchor, work_start_hour, work_end_hour, target_tz)
+            day_events = [person.slice(window_start, window_end) for person in people]
+            context = _DayContext(
+                _clipped_busy_intervals(day_events, window_start, window_end), anchor.astimezone(timezone.utc)
+            )
+            engine_kwargs = {}
+            if rooms is not None:
+                engine_kwargs["room_events"] = [room.slice(window_start, window_end) for room in rooms]
+            for start, end in iterate(
+                people_events=day_events,
+                duration_minutes=duration_minutes,
+                target_date=anchor,
+                work_start_hour=work_start_hour,
+                work_end_hour=work_end_hour,
+                target_tz_name=target_tz_name,
+                **engine_kwargs
+            ):
+                yield start, end, context
+
+    if score == "earliest":
+        best = itertools.islice(candidates(), k)  # candidates already come in time order
+    else:
+        best = heapq.nsmallest(k, candidates(), key=lambda slot: (scorer(*slot), slot[0]))
+    return sorted((start, end) for start, end, _ in best)
+
+
+def get_slot_generator(name: str | None = None):
+    """Return the lazy slot generator registered under ``name`` (defaults to ``settings.SLOT_ENGINE``)."""
+    name = name or settings.SLOT_ENGINE
+    try:
+        return SLOT_GENERATORS[name]
+    except KeyError:
+        raise ValueError(f"Unknown slot engine {name!r}. Available: {', '.join(SLOT_GENERATORS)}")
+
+
+async def _fetch_organizer_batch(db: AsyncSession, resolver: ParticipantResolver, organizer_id, participants: List[str],
+                                time_min: datetime, time_max: datetime) -> Dict[str, List[BusyInterval]]:
+    """
+    Try to read every participant's free/busy with the organizer's token in as few
+    FreeBusy requests as possible. Calendars the organizer cannot see are left out
+    of the result so the caller can fall back to the participant's own token.
+    """
+    organizer = await resolver.get_by_id(organizer_id)
+    if not organizer or not organizer.google_calendar_connected:
+        return {}
+
+    try:
+        access_token = await get_valid_access_token(db, organizer)
+        busy_by_email, errors_by_email = await asyncio.to_thread(
+            get_users_freebusy, access_token=access_token, emails=participants, time_min=time_min, time_max=time_max
+        )
+    except Exception as e:
+        logger.warning(f"Batched FreeBusy with organizer token failed, falling back to per-user calls: {str(e)}")
+        return {}
+
+    if errors_by_email:
+        logger.debug(f"Organizer cannot read {len(errors_by_email)} calendars: {errors_by_email}")
+    return busy_by_email
+
+
+async def _local_booked_events(db: AsyncSession, users: List[Any], time_min: datetime,
+                               time_max: datetime) -> Dict[str, List[BusyInterval]]:
+    """PENDING/APPROVED meetings stored here for ``users``, as busy intervals."""
+    intervals = await get_booked_intervals_for_users(
+        db,
+        [user.id for user in users],
+        time_min.astimezone(timezone.utc).replace(tzinfo=None),
+        time_max.astimezone(timezone.utc).replace(tzinfo=None),
+        statuses=[MeetingStatus.PENDING, MeetingStatus.APPROVED],
+    )
+    by_id = {user.id: user for user in users}
+    return {by_id[user_id].email: busy_intervals_from_naive_utc(busy) for user_id, busy in intervals.items()}
+
+
+def _quorum_search(people_events: List[List[BusyInterval]], required_count: int, min_free: int, emails: List[str],
+                   meeting_length: int, days: List[date], rooms: Optional[List[Any]],
+                   room_events: Optional[List[List[BusyInterval]]], max_slots: Optional[int]) -> List[Slot]:
+    """Quorum-mode slots over ``days`` in time order, each naming who is missing (and, with rooms, the free rooms)."""
+    target_tz = _resolve_tz(settings.TIMEZONE)
+    people = [_BusySlicer(events) for events in people_events]
+    room_slicers = None if room_events is None else [_BusySlicer(events) for events in room_events]
+    total = len(people_events)
+    result: List[Slot] = []
+    for day in days:
+        anchor = local_day_anchor(day, target_tz)
+        window_start, window_end = _working_window_utc(anchor, WORK_START_HOUR, WORK_END_HOUR, target_tz)
+        # rooms are swept together with the people, so every slot yielded has one free
+        for start, end, missing in iter_quorum_slots(
+            people_events=[person.slice(window_start, window_end) for person in people],
+            required_count=required_count,
+            min_free=min_free,
+            duration_minutes=meeting_length,
+            target_date=anchor,
+            work_start_hour=WORK_START_HOUR,
+            work_end_hour=WORK_END_HOUR,
+            target_tz_name=settings.TIMEZONE,
+            room_events=None if room_slicers is None else [room.slice(window_start, window_end) for room in room_slicers]
+        ):
+            start, end = to_epoch_second(start), to_epoch_second(end)
+            slot = Slot(start // 60, end // 60, missing=[emails[index] for index in sorted(missing) if index < total])
+            if rooms is not None:
+                slot.rooms = [room.name for index, room in enumerate(rooms) if total + index not in missing]
+            result.append(slot)
+            if max_slots is not None and len(result) >= max_slots:
+                return result
     return result
 
 
+def _free_room_names(rooms: List[Any], room_busy: Dict[int, List[BusyInterval]], start: int, end: int) -> List[str]:
+    """Names of the ``rooms`` with no booking overlapping ``[start, end)`` (epoch seconds)."""
+    return [
+        room.name for room in rooms
+        if all(booked_end <= start or booked_start >= end for booked_start, booked_end in room_busy[room.id])
+    ]
+
+
+async def find_available_meeting_slots(db: AsyncSession, participants: List[str], meeting_date: date, meeting_length: int,
+                                       organizer_id: Optional[int] = None,
+                                       resolver: Optional[ParticipantResolver] = None,
+                                       rooms: Optional[List[Any]] = None,
+                                       date_to: Optional[date] = None,
+                                       max_slots: Optional[int] = None,
+                                       rank_by: Optional[str] = None,
+                                       optional_participants: Optional[List[str]] = None,
+                                       min_attendees: Optional[int] = None) -> List[Slot]:
+    """
+    Slots on ``meeting_date`` (or on the working days of ``meeting_date..date_to``)
+    when every participant is free, in time order, at most ``max_slots`` of them.
+    With ``rooms`` (candidate ``Room`` objects) a slot also needs one of them free
+    for its whole length; such slots carry the names of the free rooms in ``rooms``.
+
+    With ``rank_by`` (a ``SLOT_SCORERS`` name) only the ``max_slots`` (default
+    SLOT_TOP_K) best slots by that score are built, returned in time order.
+
+    Quorum mode (``optional_participants`` and/or ``min_attendees``): ``participants``
+    are required, and a slot needs at least ``min_attendees`` people free
+    (default: just the required ones). Slots list who cannot attend in ``missing``.
+
+    Busy data is fetched once for the whole range. Identical searches share one
+    result for SLOT_SEARCH_CACHE_TTL_SECONDS.
+    """
+    if isinstance(meeting_date, datetime):
+        meeting_date = meeting_date.date()
+    days = search_days(meeting_date, date_to)
+
+    logger.info(f"Finding available slots for {len(participants)} people on {len(days)} days from {days[0]}")
+    logger.info(f"Meeting length: {meeting_length} minutes")
+
+    # Whole UTC days around the local working windows (the shape the FreeBusy cache keeps)
+    target_tz = _resolve_tz(settings.TIMEZONE)
+    first_start, _ = _working_window_utc(local_day_anchor(days[0], target_tz), WORK_START_HOUR, WORK_END_HOUR, target_tz)
+    _, last_end = _working_window_utc(local_day_anchor(days[-1], target_tz), WORK_START_HOUR, WORK_END_HOUR, target_tz)
+    time_min = datetime.combine(first_start.date(), datetime.min.time(), tzinfo=timezone.utc)
+    time_max = datetime.combine(last_end.date(), datetime.max.time(), tzinfo=timezone.utc)
+
+    async def compute():
+        return await _search_available_slots(
+            db, participants, days, time_min, time_max, meeting_length, organizer_id, resolver, rooms, max_slots, rank_by,
+            optional_participants or [], min_attendees
+        )
+
+    if not settings.SLOT_SEARCH_CACHE_ENABLED:
+        return await compute()
+
+    key = await slot_cache.search_key(
+        participants, time_min, time_max, meeting_length, WORK_START_HOUR, WORK_END_HOUR,
+        room_ids=None if rooms is None else [room.id for room in rooms],
+        extra=[
+            [day.toordinal() for day in days], max_slots, rank_by,
+            sorted(set(optional_participants or [])), min_attendees
+        ]
+    )
+    return await slot_cache.cached_search(key, compute)
+
+
+async def _search_available_slots(db: AsyncSession, participants: List[str], days: List[date],
+                                  time_min: datetime, time_max: datetime, meeting_length: int,
+                                  organizer_id: Optional[int], resolver: Optional[ParticipantResolver],
+                                  rooms: Optional[List[Any]], max_slots: Optional[int], rank_by: Optional[str],
+                                  optional_participants: List[str], min_attendees: Optional[int]) -> List[Slot]:
+    required = list(dict.fromkeys(participants))
+    optional = [email for email in dict.fromkeys(optional_participants) if email not in required]
+    everyone = required + optional
+
+    # Unknown invitees and required ones without Google Calendar are reported together,
+    # before any calendar is fetched; an optional one without it counts as busy throughout
+    resolver = resolver or ParticipantResolver(db)
+    users = await resolver.resolve(everyone, require_connected=required)
+
+    # Meetings booked here may not have reached Google yet (or await approval)
+    booked = await _local_booked_events(db, list(users.values()), time_min, time_max)
+
+    # Time every required participant is free, narrowed as their calendars come in.
+    # Once it is empty nothing can be found, so the calendars not fetched yet are skipped.
+    free = FreeSet.for_days(days, WORK_START_HOUR, WORK_END_HOUR, settings.TIMEZONE, min_seconds=meeting_length * 60)
+    required_emails = set(required)
+
+    def narrow(busy: Dict[str, List[BusyInterval]]) -> bool:
+        intervals = [
+            FreeSet.busy_intervals(events + booked.get(email, []))
+            for email, events in busy.items() if email in required_emails
+        ]
+        # busiest first: the biggest cuts come first and empty the set soonest
+        intervals.sort(key=lambda person: sum(end - start for start, end in person), reverse=True)
+        return all(free.intersect(person) for person in intervals) and bool(free)
+
+    # Users with a fresh local mirror need no Google call at all
+    busy_by_email: Dict[str, List[BusyInterval]] = await get_mirrored_busy_events(db, list(users.values()), time_min, time_max)
+    if not narrow(busy_by_email):
+        metrics.increment("slot_search.early_exit")
+        return []
+
+    remaining = [email for email in everyone if email not in busy_by_email]
+    if remaining and settings.FREEBUSY_BATCH_ENABLED and organizer_id is not None:
+        batch = await _fetch_organizer_batch(db, resolver, organizer_id, remaining, time_min, time_max)
+        busy_by_email.update(batch)
+        if not narrow(batch):
+            metrics.increment("slot_search.early_exit")
+            return []
+
+    # Whoever is still missing is fetched with their own token
+    pending = [email for email in users if email not in busy_by_email]
+    pending_users = []
+    for email in pending:
+        if users[email].google_calendar_connected:
+            pending_users.append(users[email])
+        else:
+            busy_by_email[email] = [(to_epoch_second(time_min), to_epoch_second(time_max))]
+    # the most meetings booked here hints at the busiest calendars; fetch those first
+    pending_users.sort(key=lambda user: len(booked.get(user.email, [])), reverse=True)
+
+    busy_by_email.update(await fetch_participants_freebusy(
+        db, pending_users, time_min, time_max, on_busy=lambda email, events: narrow({email: events})
+    ))
+    if not free:
+        metrics.increment("slot_search.early_exit")
+        return []
+
+    for email, events in booked.items():
+        if events:
+            busy_by_email[email] = busy_by_email[email] + events
+
+    people_events: List[List[BusyInterval]] = [busy_by_email[email] for email in everyone]
+
+
+    room_events = None
+    room_busy: Dict[int, List[BusyInterval]] = {}
+    if rooms is not None:
+        room_bookings = await get_room_bookings_between(
+            db,
+            [room.id for room in rooms],
+            time_min.astimezone(timezone.utc).replace(tzinfo=None),
+            time_max.astimezone(timezone.utc).replace(tzinfo=None),
+        )
+        room_busy = {room.id: busy_intervals_from_naive_utc(room_bookings[room.id]) for room in rooms}
+        # people and rooms are solved together by the engine, not room by room afterwards
+        room_events = [room_busy[room.id] for room in rooms]
+
+    if optional or min_attendees is not None:
+        return _quorum_search(
+            people_events, len(required), min_attendees or len(required), everyone, meeting_length, days,
+            rooms, room_events, max_slots
+        )
+
+    def to_slot(start: int, end: int) -> Slot:
+        slot = Slot(start // 60, end // 60)
+        if rooms is not None:
+            slot.rooms = _free_room_names(rooms, room_busy, start, end)
+        return slot
+
+    if rank_by is not None:
+        return [
+            to_slot(to_epoch_second(start), to_epoch_second(end))
+            for start, end in top_k_slots(
+                people_events=people_events,
+                duration_minutes=meeting_length,
+                days=days,
+                work_start_hour=WORK_START_HOUR,
+                work_end_hour=WORK_END_HOUR,
+                target_tz_name=settings.TIMEZONE,
+                k=max_slots or settings.SLOT_TOP_K,
+                score=rank_by,
+                room_events=room_events
+            )
+        ]
+
+    if rooms is None and settings.SLOT_ENGINE == "interval":
+        # every participant is already intersected into ``free``; its windows hold exactly the interval engine's slots
+        return [to_slot(start, end) for start, end in itertools.islice(free.iter_slots(meeting_length), max_slots)]
+
+    return [
+        to_slot(to_epoch_second(start), to_epoch_second(end))
+        for start, end in itertools.islice(iter_slots_for_days(
+            people_events=people_events,
+            duration_minutes=meeting_length,
+            days=days,
+            work_start_hour=WORK_START_HOUR,
+            work_end_hour=WORK_END_HOUR,
+            target_tz_name=settings.TIMEZONE,
+            room_events=room_events
+        ), max_slots)
+    ]
+
+
 def create_google_meet_description(meeting_room: str = None):
     description_parts = ["This meeting was automatically scheduled by Meeting Management System."]
     if meeting_room:
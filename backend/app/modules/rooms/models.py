@@ -0,0 +1,45 @@
+from sqlalchemy import Boolean, Column, Computed, ForeignKey, Integer, JSON, String, text
+from sqlalchemy.dialects.postgresql import ExcludeConstraint, TSRANGE
+from datetime import datetime, timezone
+from app.db.session.session import Base
+from app.db.types import UTCDateTime
+
+
+class Room(Base):
+    __tablename__ = "rooms"
+
+    id = Column(Integer, primary_key=True, index=True)
+    name = Column(String, unique=True, nullable=False)
+    capacity = Column(Integer, nullable=False)
+    features = Column(JSON, nullable=False, default=list)  # e.g. ["projector", "video_conference"]
+    is_active = Column(Boolean, default=True)
+
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+
+
+class RoomBooking(Base):
+    """
+    A room held by a meeting. ``during`` is generated from start/end (naive UTC,
+    so ``tsrange``) and the GiST exclusion constraint rejects overlapping
+    bookings of the same room at the database level.
+    """
+    __tablename__ = "room_bookings"
+
+    id = Column(Integer, primary_key=True, index=True)
+    room_id = Column(Integer, ForeignKey("rooms.id"), nullable=False)
+    meeting_id = Column(Integer, ForeignKey("meetings.id", ondelete="CASCADE"), nullable=False, unique=True)
+
+    start_time = Column(UTCDateTime, nullable=False)
+    end_time = Column(UTCDateTime, nullable=False)
+    during = Column(TSRANGE, Computed(text("tsrange(start_time, end_time, '[)')"), persisted=True))
+
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        ExcludeConstraint(
+            ("room_id", "="),
+            ("during", "&&"),
+            name="ex_room_bookings_no_overlap",
+            using="gist",
+        ),
+    )
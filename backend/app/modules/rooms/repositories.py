@@ -0,0 +1,76 @@
+from sqlalchemy import delete, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Iterable, List, Optional, Tuple
+from datetime import datetime
+from app.modules.rooms.models import Room, RoomBooking
+
+
+async def get_room_by_id(db: AsyncSession, room_id: int) -> Optional[Room]:
+    result = await db.execute(select(Room).where(Room.id == room_id))
+    return result.scalars().first()
+
+
+async def get_room_by_name(db: AsyncSession, name: str) -> Optional[Room]:
+    result = await db.execute(select(Room).where(Room.name == name))
+    return result.scalars().first()
+
+
+async def list_rooms(db: AsyncSession, include_inactive: bool = False) -> List[Room]:
+    query = select(Room)
+    if not include_inactive:
+        query = query.where(Room.is_active.is_(True))
+    result = await db.execute(query.order_by(Room.name))
+    return list(result.scalars().all())
+
+
+async def create_room(db: AsyncSession, room_data: dict) -> Room:
+    room = Room(**room_data)
+    db.add(room)
+    await db.commit()
+    await db.refresh(room)
+    return room
+
+
+async def find_suitable_rooms(db: AsyncSession, min_capacity: int, features: Iterable[str] = (),
+                              name: Optional[str] = None) -> List[Room]:
+    """Active rooms seating ``min_capacity`` with every feature in ``features``, smallest first"""
+    query = select(Room).where(Room.is_active.is_(True), Room.capacity >= min_capacity)
+    if name:
+        query = query.where(Room.name == name)
+    result = await db.execute(query.order_by(Room.capacity, Room.name))
+
+    wanted = set(features)
+    return [room for room in result.scalars().all() if wanted.issubset(room.features or [])]
+
+
+async def get_room_bookings_between(db: AsyncSession, room_ids: List[int], start: datetime,
+                                    end: datetime) -> Dict[int, List[Tuple[datetime, datetime]]]:
+    """Bookings overlapping ``[start, end)`` for all ``room_ids``, via the GiST index behind the exclusion constraint."""
+    result: Dict[int, List[Tuple[datetime, datetime]]] = {room_id: [] for room_id in room_ids}
+    if not room_ids:
+        return result
+
+    rows = await db.execute(
+        select(RoomBooking.room_id, RoomBooking.start_time, RoomBooking.end_time)
+        .where(
+            RoomBooking.room_id.in_(room_ids),
+            RoomBooking.during.overlaps(func.tsrange(start, end, "[)")),
+        )
+        .order_by(RoomBooking.room_id, RoomBooking.start_time)
+    )
+    for row in rows:
+        result[row.room_id].append((row.start_time, row.end_time))
+    return result
+
+
+def add_room_booking(db: AsyncSession, room_id: int, meeting_id: int, start: datetime, end: datetime) -> RoomBooking:
+    """Stage a booking; the caller commits (an overlapping booking fails there with IntegrityError)"""
+    booking = RoomBooking(room_id=room_id, meeting_id=meeting_id, start_time=start, end_time=end)
+    db.add(booking)
+    return booking
+
+
+async def release_room_bookings(db: AsyncSession, meeting_ids: List[int]):
+    """Free the rooms held by ``meeting_ids``. Does not commit."""
+    if meeting_ids:
+        await db.execute(delete(RoomBooking).where(RoomBooking.meeting_id.in_(meeting_ids)))
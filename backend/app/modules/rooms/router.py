@@ -0,0 +1,50 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List
+from app.core.security.jwt import verify_token
+from app.db.session.session import get_db
+from app.modules.rooms.schemas import RoomCreateRequest, RoomResponse
+from app.modules.rooms.services import create_new_room, get_rooms
+
+router = APIRouter(prefix="/rooms", tags=["Rooms"])
+
+
+@router.get("", response_model=List[RoomResponse])
+async def list_rooms_endpoint(db: AsyncSession = Depends(get_db)):
+
+    try:
+        return await get_rooms(db=db)
+
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to list rooms: {str(e)}"
+        )
+
+
+@router.post("", response_model=RoomResponse, status_code=status.HTTP_201_CREATED)
+async def create_room_endpoint(request: Request, room_request: RoomCreateRequest, db: AsyncSession = Depends(get_db)):
+
+    try:
+
+        token = request.cookies.get("access_token")
+        if not token:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Not authenticated")
+
+        if verify_token(token) is None:
+            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid or expired token")
+
+        return await create_new_room(db=db, room_request=room_request)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Failed to create room: {str(e)}"
+        )
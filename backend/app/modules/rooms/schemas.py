@@ -0,0 +1,22 @@
+from pydantic import BaseModel, Field
+from typing import List
+from datetime import datetime
+
+
+class RoomCreateRequest(BaseModel):
+    name: str = Field(..., min_length=1, max_length=255)
+    capacity: int = Field(..., gt=0)
+    features: List[str] = Field(default_factory=list)
+
+
+class RoomResponse(BaseModel):
+    id: int
+    name: str
+    capacity: int
+    features: List[str]
+    is_active: bool
+    created_at: datetime
+
+    model_config = {
+        "from_attributes": True
+    }
@@ -0,0 +1,21 @@
+from typing import List
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.modules.rooms.repositories import create_room, get_room_by_name, list_rooms
+from app.modules.rooms.schemas import RoomCreateRequest, RoomResponse
+
+
+async def get_rooms(db: AsyncSession) -> List[RoomResponse]:
+    return [RoomResponse.model_validate(room) for room in await list_rooms(db)]
+
+
+async def create_new_room(db: AsyncSession, room_request: RoomCreateRequest) -> RoomResponse:
+
+    if await get_room_by_name(db, room_request.name):
+        raise ValueError(f"Room {room_request.name} already exists")
+
+    room = await create_room(db, {
+        "name": room_request.name,
+        "capacity": room_request.capacity,
+        "features": sorted(set(room_request.features)),
+    })
+    return RoomResponse.model_validate(room)
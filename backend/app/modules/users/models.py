@@ -1,6 +1,7 @@
-from sqlalchemy import Column, Integer, String, DateTime, Boolean, Text
+from sqlalchemy import Column, Integer, String, Boolean, Text
 from datetime import datetime, timezone
 from app.db.session.session import Base
+from app.db.types import UTCDateTime
 
 class User(Base):
     __tablename__ = "users"
@@ -12,7 +13,7 @@ class User(Base):
     first_name = Column(String, nullable=True)
     last_name = Column(String, nullable=True)
     org_level = Column(String, nullable=True, default=None)
-    hire_date = Column(DateTime, nullable=True, default=None)
+    hire_date = Column(UTCDateTime, nullable=True, default=None)
 
     
     # User status
@@ -23,7 +24,7 @@ class User(Base):
     google_id = Column(String, unique=True, nullable=True, index=True)
     google_access_token = Column(Text, nullable=True)
     google_refresh_token = Column(Text, nullable=True)
-    google_token_expires_at = Column(DateTime, nullable=True)
+    google_token_expires_at = Column(UTCDateTime, nullable=True)
     google_calendar_connected = Column(Boolean, default=False)
     
     # Profile info from Google
@@ -31,7 +32,7 @@ class User(Base):
     locale = Column(String, nullable=True) # fa or en
     
     # Timestamps
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
-    updated_at = Column(DateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
-    last_login_at = Column(DateTime, nullable=True)
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
+    updated_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    last_login_at = Column(UTCDateTime, nullable=True)
     
\ No newline at end of file
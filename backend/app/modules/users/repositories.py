@@ -1,47 +1,74 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional, List
 from datetime import datetime
 from app.modules.users.models import User
 
 
-def get_user_by_email(db: Session, email: str) -> Optional[User]:
+async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
     """Get user by email address"""
-    return db.query(User).filter(User.email == email).first()
+    result = await db.execute(select(User).where(User.email == email))
+    return result.scalars().first()
 
 
-def get_user_by_id(db: Session, id: int):
-    return db.query(User).filter(User.id == id).first()
+async def get_user_by_id(db: AsyncSession, id: int):
+    result = await db.execute(select(User).where(User.id == id))
+    return result.scalars().first()
 
-def get_user_by_google_id(db: Session, google_id: str) -> Optional[User]:
+async def get_user_by_google_id(db: AsyncSession, google_id: str) -> Optional[User]:
     """Get user by Google ID"""
-    return db.query(User).filter(User.google_id == google_id).first()
+    result = await db.execute(select(User).where(User.google_id == google_id))
+    return result.scalars().first()
 
 
-def get_users_by_emails(db: Session, emails: List[str]) -> List[User]:
+async def get_users_by_emails(db: AsyncSession, emails: List[str]) -> List[User]:
     """Get multiple users by their email addresses"""
-    return db.query(User).filter(User.email.in_(emails)).all()
+    result = await db.execute(select(User).where(User.email.in_(emails)))
+    return list(result.scalars().all())
 
 
-def create_user(db: Session, user_data: dict) -> User:
+async def get_users_with_tokens_expiring_before(
+    db: AsyncSession,
+    end: datetime,
+    limit: int,
+    exclude_ids: Optional[List[int]] = None
+) -> List[User]:
+    """
+    Get connected users whose Google access token expires by ``end``, soonest first.
+    Tokens already expired (or with no known expiry) are included: the refresh
+    token still works for them.
+    """
+    query = select(User).where(
+        User.google_calendar_connected.is_(True),
+        User.google_refresh_token.isnot(None),
+        or_(User.google_token_expires_at.is_(None), User.google_token_expires_at <= end),
+    )
+    if exclude_ids:
+        query = query.where(User.id.notin_(exclude_ids))
+    result = await db.execute(query.order_by(User.google_token_expires_at.nulls_first()).limit(limit))
+    return list(result.scalars().all())
+
+
+async def create_user(db: AsyncSession, user_data: dict) -> User:
     """Create a new user"""
     user = User(**user_data)
     db.add(user)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
-def update_user(db: Session, user: User, update_data: dict) -> User:
+async def update_user(db: AsyncSession, user: User, update_data: dict) -> User:
     """Update user information"""
     for key, value in update_data.items():
         setattr(user, key, value)
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
-def update_user_google_tokens(
-    db: Session, 
+async def update_user_google_tokens(
+    db: AsyncSession, 
     user: User, 
     access_token: str, 
     refresh_token: Optional[str] = None, 
@@ -55,32 +82,36 @@ def update_user_google_tokens(
     if expires_at:
         user.google_token_expires_at = expires_at
     user.google_calendar_connected = True
-    db.commit()
-    db.refresh(user)
+    await db.commit()
+    await db.refresh(user)
     return user
 
 
-def check_and_refresh_google_token(db: Session, user: User) -> User:
+async def check_and_refresh_google_token(db: AsyncSession, user: User) -> User:
     """
     Check if user's Google token is expired and refresh if needed
     Returns updated user object
     """
-    from app.integrations.google.oauth import is_google_token_expired, refresh_google_access_token
+    from app.integrations.google.oauth import is_google_token_expired
+    from app.integrations.google.token_refresh import refresh_access_token_once
     
     if not user.google_refresh_token:
         raise ValueError("User does not have a refresh token")
     
     # Check if token is expired
     if is_google_token_expired(user.google_token_expires_at):
-        # Refresh the token
-        new_tokens = refresh_google_access_token(user.google_refresh_token)
+        # Refresh the token (or reuse a refresh already in flight elsewhere)
+        new_tokens, refreshed_here = await refresh_access_token_once(user.email, user.google_refresh_token)
+        if not refreshed_here:
+            await db.refresh(user)
         
-        # Update user with new tokens
-        user = update_user_google_tokens(
-            db, 
-            user, 
-            new_tokens['access_token'],
-            expires_at=new_tokens['expiry']
-        )
+        # Update user with new tokens unless the other refresher already did
+        if refreshed_here or is_google_token_expired(user.google_token_expires_at):
+            user = await update_user_google_tokens(
+                db, 
+                user, 
+                new_tokens['access_token'],
+                expires_at=new_tokens['expiry']
+            )
     
-    return user
\ No newline at end of file
+    return user
@@ -0,0 +1,83 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from app.core.config.settings import settings
+from app.core.metrics import metrics
+from app.db.session.session import AsyncSessionLocal
+from app.integrations.google.token_refresh import refresh_access_token_once
+from app.modules.users.repositories import get_users_with_tokens_expiring_before, update_user_google_tokens
+
+logger = logging.getLogger(__name__)
+
+metrics.register_ratio("google_token.proactive_ratio", "google_token.refresh.proactive", "google_token.refresh.inline")
+
+
+async def _refresh(semaphore: asyncio.Semaphore, email: str, refresh_token: str):
+    async with semaphore:
+        try:
+            return await refresh_access_token_once(email, refresh_token), None
+        except Exception as e:
+            return None, e
+
+
+async def refresh_expiring_google_tokens() -> int:
+    """
+    Refresh every token expiring within TOKEN_REFRESH_AHEAD_SECONDS, or already
+    expired (after downtime or a failed attempt), in batches of
+    TOKEN_REFRESH_BATCH_SIZE with TOKEN_REFRESH_CONCURRENCY refreshes in flight.
+    Returns how many tokens were refreshed.
+    """
+    now = datetime.now(timezone.utc).replace(tzinfo=None)  # expiry is stored as naive UTC
+    horizon = now + timedelta(seconds=settings.TOKEN_REFRESH_AHEAD_SECONDS)
+    semaphore = asyncio.Semaphore(settings.TOKEN_REFRESH_CONCURRENCY)
+
+    refreshed = 0
+    seen_ids: List[int] = []
+    async with AsyncSessionLocal() as db:
+        while True:
+            users = await get_users_with_tokens_expiring_before(
+                db, horizon, settings.TOKEN_REFRESH_BATCH_SIZE, exclude_ids=seen_ids
+            )
+            if not users:
+                break
+
+            seen_ids.extend(user.id for user in users)
+
+            # Network calls run concurrently; the session is only used sequentially below
+            results = await asyncio.gather(*(
+                _refresh(semaphore, user.email, user.google_refresh_token) for user in users
+            ))
+            for user, (outcome, error) in zip(users, results):
+                if error is not None:
+                    logger.warning(f"Proactive token refresh failed for user {user.id}: {str(error)}")
+                    metrics.increment("google_token.refresh.failed")
+                    continue
+
+                result, refreshed_here = outcome
+                if not refreshed_here:
+                    continue  # another worker refreshed and stored it
+
+                await update_user_google_tokens(
+                    db=db,
+                    user=user,
+                    access_token=result['access_token'],
+                    expires_at=result['expiry']
+                )
+                refreshed += 1
+                metrics.increment("google_token.refresh.proactive")
+
+    return refreshed
+
+
+async def run_token_refresher():
+    """Background loop started from the app lifespan when TOKEN_REFRESHER_ENABLED is set."""
+    while True:
+        try:
+            refreshed = await refresh_expiring_google_tokens()
+            if refreshed:
+                logger.info(f"Proactively refreshed {refreshed} Google tokens")
+        except Exception:
+            logger.exception("Token refresher run failed")
+        await asyncio.sleep(settings.TOKEN_REFRESH_INTERVAL_SECONDS)
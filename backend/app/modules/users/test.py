@@ -0,0 +1,44 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+pytest.importorskip("aiosqlite")
+
+from app.modules.users import services
+from app.modules.users.models import User
+
+
+def test_refresher_picks_up_tokens_that_expired_before_the_scan(monkeypatch):
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    refreshed_tokens = []
+
+    async def fake_refresh(email, refresh_token):
+        refreshed_tokens.append(refresh_token)
+        return {"access_token": f"new-{refresh_token}", "expiry": now + timedelta(hours=1)}, True
+
+    async def run():
+        engine = create_async_engine("sqlite+aiosqlite://")
+        async with engine.begin() as conn:
+            await conn.run_sync(User.__table__.create)
+        sessions = async_sessionmaker(engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+        monkeypatch.setattr(services, "AsyncSessionLocal", sessions)
+        monkeypatch.setattr(services, "refresh_access_token_once", fake_refresh)
+
+        async with sessions() as db:
+            for name, expires_at in [
+                ("expired", now - timedelta(hours=3)),
+                ("expiring", now + timedelta(minutes=5)),
+                ("fresh", now + timedelta(hours=2)),
+            ]:
+                db.add(User(email=f"{name}@x", google_refresh_token=name, google_access_token="old",
+                            google_token_expires_at=expires_at, google_calendar_connected=True))
+            await db.commit()
+
+        count = await services.refresh_expiring_google_tokens()
+        await engine.dispose()
+        return count
+
+    assert asyncio.run(run()) == 2
+    assert refreshed_tokens == ["expired", "expiring"]
@@ -0,0 +1,65 @@
+"""
+Per-call overhead of preparing a Google Calendar request, without any network I/O.
+
+Run from the ``backend`` directory (the usual ``.env`` must be loadable):
+
+    python -m benchmarks.calendar_service --calls 200
+
+"build per call" is what the integration used to do for every FreeBusy,
+insert, update and delete: ``discovery.build('calendar', 'v3', ...)`` followed
+by building the request. "shared api" uses the process-wide API surface from
+``app.integrations.google.calendar`` plus a per-token authorized http.
+"""
+import argparse
+import time
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from app.integrations.google.calendar import authorized_http, calendar_collection
+
+BODY = {
+    "timeMin": "2026-03-02T00:00:00+00:00",
+    "timeMax": "2026-03-02T23:59:59+00:00",
+    "timeZone": "Asia/Tehran",
+    "items": [{"id": "someone@example.com"}],
+}
+
+
+def build_per_call(token: str):
+    service = build('calendar', 'v3', credentials=Credentials(token=token))
+    service.freebusy().query(body=BODY)
+    service.events().insert(calendarId='primary', body={}, sendUpdates='all')
+
+
+def shared_api(token: str):
+    http = authorized_http(token)
+    calendar_collection('freebusy').query(body=BODY)
+    calendar_collection('events').insert(calendarId='primary', body={}, sendUpdates='all')
+    return http
+
+
+def measure(fn, calls: int) -> float:
+    started = time.perf_counter()
+    for i in range(calls):
+        fn(f"token-{i}")
+    return (time.perf_counter() - started) / calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    shared_api("warm-up")  # first call loads the discovery document
+
+    before = measure(build_per_call, args.calls)
+    after = measure(shared_api, args.calls)
+
+    print(f"{'build per call':<16} {before * 1000:>9.3f} ms/call")
+    print(f"{'shared api':<16} {after * 1000:>9.3f} ms/call")
+    print(f"{'speedup':<16} {before / after:>9.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,128 @@
+"""
+Compare the ways a slot search can find one day's slots: ``FreeSet`` (what the
+search uses by default) and the engines registered in
+``app.modules.meetings.utils.SLOT_GENERATORS``.
+
+Run from the ``backend`` directory (the usual ``.env`` must be loadable):
+
+    python -m benchmarks.slot_engines
+    python -m benchmarks.slot_engines --participants 40 100 200 --events 4 12 --repeat 20
+
+For every (participant count, events per participant) pair a random set of
+busy calendars is generated as the epoch-second pairs the search passes around,
+every engine is timed on it and the results are checked to be identical.
+"""
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+from app.modules.meetings.intervals import BusyInterval
+from app.modules.meetings.utils import SLOT_GENERATORS, FreeSet, local_day_anchor, search_days
+
+TARGET_DATE = datetime(2026, 3, 2, tzinfo=timezone.utc)
+TEHRAN_OFFSET = timezone(timedelta(hours=3, minutes=30))
+
+
+def make_people_events(participants: int, events_per_person: int, seed: int) -> List[List[BusyInterval]]:
+    """
+    Build correlated calendars: everybody draws their events from a shared pool
+    of team meetings (plus the odd off-grid one), the way real org calendars look.
+    """
+    rng = random.Random(seed)
+    day_start = datetime(2026, 3, 2, 8, 0, tzinfo=TEHRAN_OFFSET)
+
+    pool = []
+    for _ in range(max(events_per_person * 2, 1)):
+        start = day_start + timedelta(minutes=rng.randrange(0, 12 * 60, 30))
+        pool.append((start, start + timedelta(minutes=rng.choice((30, 30, 60)))))
+
+    people_events = []
+    for _ in range(participants):
+        events = []
+        for _ in range(events_per_person):
+            if rng.random() < 0.9:
+                start, end = rng.choice(pool)
+            else:
+                start = day_start + timedelta(minutes=rng.randrange(0, 12 * 60, 5), seconds=rng.choice((0, 30)))
+                end = start + timedelta(minutes=rng.choice((15, 30, 45)))
+            events.append((int(start.timestamp()), int(end.timestamp())))
+        people_events.append(events)
+    return people_events
+
+
+def free_set_slots(people_events, duration_minutes: int, target_date: datetime, step_minutes: int, target_tz_name: str = "Asia/Tehran"):
+    free = FreeSet.for_days(search_days(target_date.date()), 8, 21, target_tz_name, min_seconds=duration_minutes * 60)
+    for events in people_events:
+        if not free.intersect(FreeSet.busy_intervals(events)):
+            break
+    return list(free.iter_slots(duration_minutes, step_minutes))
+
+
+def generator_slots(generator):
+    def run(people_events, duration_minutes: int, target_date: datetime, step_minutes: int):
+        return [
+            (int(start.timestamp()), int(end.timestamp()))
+            for start, end in generator(
+                people_events=people_events, duration_minutes=duration_minutes,
+                target_date=local_day_anchor(target_date.date(), TEHRAN_OFFSET), step_minutes=step_minutes
+            )
+        ]
+    return run
+
+
+ENGINES = {
+    "freeset": free_set_slots,
+    **{name: generator_slots(generator) for name, generator in SLOT_GENERATORS.items()},
+}
+
+
+def time_engine(engine, people_events, duration: int, step: int, repeat: int):
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = engine(people_events=people_events, duration_minutes=duration, target_date=TARGET_DATE, step_minutes=step)
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--participants", type=int, nargs="+", default=[5, 15, 40, 100, 200])
+    parser.add_argument("--events", type=int, nargs="+", default=[2, 6, 12])
+    parser.add_argument("--duration", type=int, default=30)
+    parser.add_argument("--step", type=int, default=5)
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    args = parser.parse_args()
+
+    names = list(ENGINES)
+    baseline = names[0]
+    header = f"{'people':>7} {'events':>7} {'slots':>6} " + " ".join(f"{n + ' ms':>12}" for n in names)
+    print(header + f" {'speedup':>9}")
+    print("-" * (len(header) + 10))
+
+    for participants in args.participants:
+        for events in args.events:
+            people_events = make_people_events(participants, events, args.seed)
+            timings = {}
+            results = {}
+            for name in names:
+                timings[name], results[name] = time_engine(
+                    ENGINES[name], people_events, args.duration, args.step, args.repeat
+                )
+
+            for name in names[1:]:
+                if results[name] != results[baseline]:
+                    raise SystemExit(f"{name} engine disagrees with {baseline} for {participants} people / {events} events")
+
+            speedup = timings[baseline] / timings[names[-1]] if timings[names[-1]] else float("inf")
+            row = f"{participants:>7} {events:>7} {len(results[baseline]):>6} "
+            row += " ".join(f"{timings[n] * 1000:>12.3f}" for n in names)
+            print(row + f" {speedup:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()